@@ -20,9 +20,12 @@ from django.views.generic import RedirectView
 from django.conf import settings
 from django.conf.urls.static import static
 
+from recruitment.instrumentation import metrics_view
+
 urlpatterns = [
     # path('admin/', admin.site.urls), # Admin is not needed for now, and path was causing issues
     path('', include('accounts.urls')),
     path('', include('recruitment.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
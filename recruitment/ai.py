@@ -0,0 +1,305 @@
+"""
+Gemini-backed AI features.
+
+The functions here make the slow upstream calls and are registered as
+background tasks, so views enqueue them instead of blocking a worker.
+
+Responses are cached by a hash of the model and prompt in the cache named by
+``AI_CACHE_ALIAS`` (TTL and size bound come from that cache's configuration),
+and concurrent identical prompts are coalesced so only one of them goes
+upstream: threads in a process share one call, and processes sharing a cache
+backend wait on a short-lived lock key instead of calling Gemini themselves.
+
+The ``a``-prefixed coroutines are used by the async views served under ASGI.
+They cap concurrent upstream requests per event loop with a semaphore and
+enforce deadlines, raising ``GeminiUnavailable`` so callers can fall back to
+local scoring instead of piling up slow calls.
+
+The client itself, with its retries and circuit breaker, lives in
+``recruitment.gemini``. ``gemini_enabled`` is what views check before
+choosing Gemini over the local fallbacks.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+import weakref
+
+from django.conf import settings
+from django.core.cache import caches
+
+from . import gemini, matching
+from .gemini import GeminiUnavailable, request_timeout
+from .models import Candidate
+from .resumes import read_resume_text
+from .tasks import task
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION_SEPARATOR = "||REQUIREMENTS||"
+
+GEMINI_MODEL = 'gemini-pro'
+
+# How long another process's in-flight call for the same prompt is waited for.
+INFLIGHT_LOCK_TIMEOUT = 60
+INFLIGHT_POLL_INTERVAL = 0.25
+
+
+def gemini_api_key():
+    return getattr(settings, 'GEMINI_API_KEY', os.environ.get('GEMINI_API_KEY'))
+
+
+def gemini_enabled():
+    """Whether to try Gemini at all: a key is set and the circuit breaker isn't open."""
+    return bool(gemini_api_key()) and gemini.breaker.state != gemini.breaker.OPEN
+
+
+def generate_content(prompt):
+    return gemini.generate(gemini_api_key(), GEMINI_MODEL, prompt)
+
+
+def response_cache():
+    return caches[getattr(settings, 'AI_CACHE_ALIAS', 'default')]
+
+
+def prompt_cache_key(prompt):
+    digest = hashlib.sha256(f"{GEMINI_MODEL}\n{prompt}".encode('utf-8')).hexdigest()
+    return f"ai:response:{digest}"
+
+
+def cached_response(prompt):
+    """Return the cached response text for ``prompt``, or None."""
+    return response_cache().get(prompt_cache_key(prompt))
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def _coalesced(key, func):
+    """Run ``func`` once for all threads asking for ``key`` at the same time."""
+    with _inflight_lock:
+        call = _inflight.get(key)
+        leader = call is None
+        if leader:
+            call = _inflight[key] = _Call()
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result
+    try:
+        call.result = func()
+        return call.result
+    except Exception as e:
+        call.error = e
+        raise
+    finally:
+        with _inflight_lock:
+            del _inflight[key]
+        call.done.set()
+
+
+def _fetch_and_store(prompt, key):
+    cache = response_cache()
+    lock_key = f"{key}:lock"
+    # Only the holder deletes the lock, and only while it is still its own (it may have expired)
+    token = uuid.uuid4().hex
+    locked = cache.add(lock_key, token, INFLIGHT_LOCK_TIMEOUT)
+    deadline = time.monotonic() + INFLIGHT_LOCK_TIMEOUT
+    while not locked and time.monotonic() < deadline:
+        # Another process is already asking Gemini the same thing; wait for its answer.
+        time.sleep(INFLIGHT_POLL_INTERVAL)
+        text = cache.get(key)
+        if text is not None:
+            return text
+        if cache.get(lock_key) is None:
+            # It failed or its lock expired without an answer; take the call over
+            locked = cache.add(lock_key, token, INFLIGHT_LOCK_TIMEOUT)
+    # Past the deadline the call is made anyway, leaving the other process's lock alone
+    try:
+        text = generate_content(prompt)
+        cache.set(key, text)
+        return text
+    finally:
+        if locked and cache.get(lock_key) == token:
+            cache.delete(lock_key)
+
+
+def generate_content_cached(prompt):
+    """``generate_content`` with response caching and in-flight request coalescing."""
+    key = prompt_cache_key(prompt)
+    text = response_cache().get(key)
+    if text is not None:
+        return text
+    return _coalesced(key, lambda: _fetch_and_store(prompt, key))
+
+
+def max_concurrency():
+    return getattr(settings, 'AI_MAX_CONCURRENCY', 50)
+
+
+def queue_timeout():
+    return getattr(settings, 'AI_QUEUE_TIMEOUT', 0.5)
+
+
+class _LoopState:
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(max_concurrency())
+        self.inflight = {}
+
+
+_loop_states = weakref.WeakKeyDictionary()
+
+
+def _loop_state():
+    loop = asyncio.get_running_loop()
+    state = _loop_states.get(loop)
+    if state is None:
+        state = _loop_states[loop] = _LoopState()
+    return state
+
+
+async def agenerate_content(prompt):
+    return await gemini.agenerate(gemini_api_key(), GEMINI_MODEL, prompt)
+
+
+async def agenerate_content_bounded(prompt):
+    """``agenerate_content`` behind the concurrency cap and request deadline."""
+    semaphore = _loop_state().semaphore
+    try:
+        await asyncio.wait_for(semaphore.acquire(), timeout=queue_timeout())
+    except asyncio.TimeoutError:
+        raise GeminiUnavailable("Too many concurrent Gemini requests") from None
+    try:
+        return await asyncio.wait_for(agenerate_content(prompt), timeout=request_timeout())
+    except asyncio.TimeoutError:
+        raise GeminiUnavailable("Gemini request timed out") from None
+    finally:
+        semaphore.release()
+
+
+async def _afetch_and_store(prompt, key):
+    text = await agenerate_content_bounded(prompt)
+    await response_cache().aset(key, text)
+    return text
+
+
+async def agenerate_content_cached(prompt):
+    """Async ``generate_content_cached``: identical in-flight prompts share one request."""
+    key = prompt_cache_key(prompt)
+    text = await response_cache().aget(key)
+    if text is not None:
+        return text
+    inflight = _loop_state().inflight
+    future = inflight.get(key)
+    if future is None:
+        future = inflight[key] = asyncio.ensure_future(_afetch_and_store(prompt, key))
+        future.add_done_callback(lambda f: inflight.pop(key, None))
+    return await asyncio.shield(future)
+
+
+def job_description_prompt(title, user_prompt):
+    context_prompt = f"Role Title: {title}\n"
+    if user_prompt:
+        context_prompt += f"Context/Details: {user_prompt}\n"
+    return (
+        f"{context_prompt}\nWrite a professional job description (just the body) and then a separate "
+        f"section for Requirements for this role. Use the provided context details to tailor the content. "
+        f"Separator: {DESCRIPTION_SEPARATOR}"
+    )
+
+
+def mock_job_description(title, user_prompt):
+    """Realistic placeholder used when no Gemini key is configured."""
+    mock_desc = f"We are seeking a talented {title} to join our dynamic team."
+    if user_prompt:
+        mock_desc += f" As per your requirements: {user_prompt}."
+    mock_desc += " The ideal candidate will be responsible for designing, developing, and deploying high-quality solutions. You will work closely with cross-functional teams to define, design, and ship new features. This is an exciting opportunity to work on cutting-edge technologies and grow your career in a fast-paced environment."
+
+    mock_reqs = "- Bachelor's degree in Computer Science or related field.\n- 3+ years of experience in a similar role.\n- Strong proficiency in modern technologies and best practices.\n- Excellent problem-solving and communication skills.\n- Ability to work independently and as part of a team."
+    if user_prompt:
+        mock_reqs = f"- {user_prompt} (Key Requirement)\n" + mock_reqs
+    return {'description': mock_desc, 'requirements': mock_reqs}
+
+
+def parse_job_description(text):
+    parts = text.split(DESCRIPTION_SEPARATOR)
+    desc = parts[0].strip()
+    reqs = parts[1].strip() if len(parts) > 1 else "Requirements not generated automatically."
+    return {'description': desc, 'requirements': reqs}
+
+
+@task
+def generate_job_description(title, user_prompt):
+    """Ask Gemini for a job description; returns ``{'description', 'requirements'}``."""
+    return parse_job_description(generate_content_cached(job_description_prompt(title, user_prompt)))
+
+
+def analysis_prompt(requirements, resume_text):
+    return f"""
+                You are a helpful ATS scanner.
+                Job Requirements: {requirements}
+                Candidate Resume: {resume_text}
+
+                Task:
+                1. Calculate a match percentage (0-100) based on how well the candidate fits the requirements.
+                2. Write a brief analysis/reasoning.
+
+                Output format:
+                SCORE: <number>
+                ANALYSIS: <text>
+                """
+
+
+def parse_analysis(text):
+    """Split a Gemini ``SCORE: / ANALYSIS:`` reply into ``(score, analysis)``."""
+    score_match = re.search(r'SCORE:\s*(\d+)', text)
+    if not score_match:
+        return 0.0, text
+    score = float(score_match.group(1))
+    analysis = text.replace(score_match.group(0), '').replace('ANALYSIS:', '').strip()
+    return score, analysis
+
+
+def candidate_analysis_prompt(candidate):
+    requirements = candidate.job.requirements or "General Job Requirements"
+    resume_text = read_resume_text(candidate) or "Resume content not available"
+    return analysis_prompt(requirements, resume_text)
+
+
+def local_analysis(candidate):
+    """Local TF-IDF scoring against the job's precomputed term index."""
+    # Resumes are vectorised at apply time; older candidates are indexed lazily.
+    if not candidate.resume_vector and candidate.resume_file:
+        matching.index_candidate(candidate)
+    return matching.score_candidate(candidate)
+
+
+@task
+def analyze_candidate(candidate_id):
+    """Score a candidate with Gemini, falling back to local matching, and save the result."""
+    candidate = Candidate.objects.select_related('job', 'resume_text').get(pk=candidate_id)
+
+    try:
+        score, analysis = parse_analysis(generate_content_cached(candidate_analysis_prompt(candidate)))
+    except Exception as e:
+        # If the API fails, fall back to local matching quietly
+        logger.warning("Gemini analysis of candidate %s failed: %s", candidate_id, e)
+        score, analysis = local_analysis(candidate)
+
+    candidate.match_score = score
+    candidate.ai_analysis = analysis
+    candidate.save(update_fields=['match_score', 'ai_analysis'])
+    return {'score': score}
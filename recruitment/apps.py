@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class RecruitmentConfig(AppConfig):
     name = 'recruitment'
+
+    def ready(self):
+        # Connect the dashboard counter, job board cache and query counter signal handlers
+        from . import board_cache, instrumentation, stats  # noqa: F401
@@ -0,0 +1,110 @@
+"""
+Native async versions of the AI endpoints, used when ``AI_ASYNC_VIEWS`` is on
+and the project is served under ASGI (``config.asgi``, e.g. uvicorn/daphne).
+
+Instead of queueing Gemini calls for a worker they await them directly, so one
+process can hold hundreds of slow outbound requests without a thread each.
+When the concurrency cap or the deadline is hit they fall back to the local
+scorer (or the template description) rather than waiting.
+
+``notification_stream`` pushes candidates' notifications as server-sent
+events; an idle stream costs a cache read per interval, not a thread.
+"""
+import asyncio
+import json
+import logging
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, render
+
+from . import ai, notifications
+from .models import Candidate
+
+logger = logging.getLogger(__name__)
+
+
+@login_required
+async def analyze_candidate_cv(request, candidate_id):
+    candidate = await aget_object_or_404(
+        Candidate.objects.select_related('job', 'resume_text'), id=candidate_id,
+    )
+
+    try:
+        if ai.gemini_enabled():
+            prompt = await sync_to_async(ai.candidate_analysis_prompt)(candidate)
+            try:
+                score, analysis = ai.parse_analysis(await ai.agenerate_content_cached(prompt))
+            except Exception as e:
+                logger.warning("Gemini unavailable for candidate %s, using local scorer: %s", candidate.id, e)
+                score, analysis = await sync_to_async(ai.local_analysis)(candidate)
+        else:
+            score, analysis = await sync_to_async(ai.local_analysis)(candidate)
+    except Exception as e:
+        logger.exception("Analysis of candidate %s failed", candidate.id)
+        analysis = f"Analysis Failed: {str(e)}"
+        score = 0.0
+
+    candidate.match_score = score
+    candidate.ai_analysis = analysis
+    await candidate.asave(update_fields=['match_score', 'ai_analysis'])
+
+    return render(request, 'recruitment/partials/ai_analysis_result.html', {'candidate': candidate})
+
+
+@login_required
+async def generate_job_description(request):
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid method'}, status=405)
+
+    title = request.POST.get('title')
+    user_prompt = request.POST.get('prompt', '').strip()
+
+    if not ai.gemini_enabled():
+        return JsonResponse(ai.mock_job_description(title, user_prompt))
+    try:
+        text = await ai.agenerate_content_cached(ai.job_description_prompt(title, user_prompt))
+    except ai.GeminiUnavailable as e:
+        logger.warning("Gemini unavailable, using template description: %s", e)
+        return JsonResponse(ai.mock_job_description(title, user_prompt))
+    except Exception as e:
+        return JsonResponse({'error': str(e)}, status=500)
+    return JsonResponse(ai.parse_job_description(text))
+
+
+async def _notification_events(user_id, cursor):
+    # Streams are recycled after a while; EventSource reconnects with Last-Event-ID.
+    deadline = time.monotonic() + settings.NOTIFICATION_STREAM_MAX_AGE
+    idle = 0.0
+    yield "retry: 3000\n\n"
+    while time.monotonic() < deadline:
+        latest = await notifications.alatest_id(user_id)
+        if latest > cursor:
+            batch, cursor = await sync_to_async(notifications.collect)(user_id, cursor, latest)
+            if batch:
+                idle = 0.0
+                yield f"id: {cursor}\nevent: notifications\ndata: {json.dumps(batch)}\n\n"
+        if idle >= settings.NOTIFICATION_KEEPALIVE:
+            idle = 0.0
+            yield ": keep-alive\n\n"
+        await asyncio.sleep(settings.NOTIFICATION_POLL_INTERVAL)
+        idle += settings.NOTIFICATION_POLL_INTERVAL
+
+
+@login_required
+async def notification_stream(request):
+    """Server-sent events carrying the user's new notifications; needs ASGI."""
+    if not isinstance(request, ASGIRequest):
+        # Under WSGI an open stream would hold a worker for its whole life; the page polls instead
+        raise Http404("Notification streaming needs ASGI.")
+    user = await request.auser()
+    cursor = notifications.parse_cursor(request.headers.get('Last-Event-ID') or request.GET.get('after'))
+    response = StreamingHttpResponse(_notification_events(user.id, cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
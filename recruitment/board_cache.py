@@ -0,0 +1,118 @@
+"""
+Caching for the public job board (``CandidateJobListView``).
+
+The board is by far the busiest page and only changes when a job does, so:
+
+* anonymous visitors get the whole rendered response from the cache, keyed
+  by the query parameters that shape it (search, role, location, sort,
+  cursor) and whether it is an HTMX request;
+* signed-in candidates get the job list fragment (filters and rows, which
+  are the same for everyone) from the cache, while their messages and
+  notification panel are rendered for them on every request.
+
+Both keys embed a board version number instead of being deleted one by one:
+saving or deleting a ``Job`` bumps the version (again once its transaction
+commits), which orphans every cached page and fragment at once, and the
+stale entries age out of the cache on their own.
+
+The version lives in the default cache, so the bump only reaches every
+process when that cache is shared (Redis, Memcached, the database). With the
+per-process ``LocMemCache`` the other workers keep serving their copies until
+these expire, so entries are then kept for at most
+``JOB_BOARD_LOCAL_CACHE_TIMEOUT`` seconds; that is how stale their board can be.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib import messages
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.http import urlencode
+from django.utils.safestring import mark_safe
+
+from .models import Job
+
+VERSION_KEY = 'board:version'
+# The query parameters the board's output depends on; anything else is ignored
+PARAMS = ('q', 'role', 'location', 'sort', 'cursor')
+
+
+def shared_cache():
+    """Whether all processes see the same default cache, and so the same board version."""
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def bounded_timeout(timeout):
+    """``timeout`` for an entry invalidated by the board version, capped when that can't reach other processes."""
+    if shared_cache():
+        return timeout
+    return min(timeout, getattr(settings, 'JOB_BOARD_LOCAL_CACHE_TIMEOUT', 30))
+
+
+def cache_timeout():
+    return bounded_timeout(getattr(settings, 'JOB_BOARD_CACHE_TIMEOUT', 600))
+
+
+def version():
+    current = cache.get(VERSION_KEY)
+    if current is None:
+        # Start from the clock so a version lost to eviction isn't reused
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        current = cache.get(VERSION_KEY)
+    return current
+
+
+def bump():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, time.time_ns(), None)
+
+
+def cache_key(kind, request):
+    params = urlencode(sorted((name, request.GET[name]) for name in PARAMS if request.GET.get(name)))
+    digest = hashlib.md5(params.encode('utf-8'), usedforsecurity=False).hexdigest()
+    htmx = int(bool(getattr(request, 'htmx', False)))
+    return f'board:{kind}:{version()}:{htmx}:{digest}'
+
+
+def cached_page(request, render):
+    """The cached board response for an anonymous ``request``, calling ``render()`` on a miss."""
+    # Flash messages (e.g. "logged out") are per visitor
+    if request.method != 'GET' or len(messages.get_messages(request)):
+        return render()
+    key = cache_key('page', request)
+    cached = cache.get(key)
+    if cached is not None:
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    response = render()
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code == 200 and not response.cookies:
+        cache.set(key, (response.content, response['Content-Type']), cache_timeout())
+    return response
+
+
+def cached_fragment(request, render):
+    """The board's job list HTML for ``request``, calling ``render()`` on a miss."""
+    key = cache_key('fragment', request)
+    html = cache.get(key)
+    if html is None:
+        html = str(render())
+        cache.set(key, html, cache_timeout())
+    return mark_safe(html)
+
+
+@receiver(post_save, sender=Job)
+@receiver(post_delete, sender=Job)
+def job_changed(sender, **kwargs):
+    bump()
+    # Once more after commit, in case a concurrent request cached the old rows under the new version
+    transaction.on_commit(bump)
@@ -0,0 +1,271 @@
+"""
+Process-wide Gemini client.
+
+``google.generativeai`` is slow to import and keeps its transport on a
+module-level client, so it is imported, configured and its model built once
+per process, on the first call, and reused after that. Workers that never
+talk to Gemini never import it.
+
+Every call goes through the same guards:
+
+* transient upstream errors (429, 5xx, timeouts) are retried up to
+  ``AI_RETRY_ATTEMPTS`` times with exponential backoff and full jitter;
+* a circuit breaker opens after ``AI_BREAKER_FAILURES`` calls in a row
+  failed with such a transient error (a bad request or a blocked prompt
+  says nothing about Gemini's health and doesn't count), and then every
+  call raises ``GeminiUnavailable`` at once for
+  ``AI_BREAKER_RESET`` seconds, so callers fall back to local scoring
+  instead of holding a worker for a dead upstream. After that one trial
+  call is let through and closes the breaker again if it succeeds;
+* latency, outcome and retry counts are recorded in ``metrics``.
+
+The breaker and metrics are per process.
+"""
+import asyncio
+import logging
+import random
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+
+from .instrumentation import timed
+
+logger = logging.getLogger(__name__)
+
+# Latency samples kept for the percentiles in ``metrics.snapshot``
+LATENCY_SAMPLES = 1000
+
+
+class GeminiUnavailable(Exception):
+    """Gemini can't be used right now: concurrency limit, deadline or open circuit breaker."""
+
+
+def retry_attempts():
+    return getattr(settings, 'AI_RETRY_ATTEMPTS', 2)
+
+
+def retry_backoff():
+    return getattr(settings, 'AI_RETRY_BACKOFF', 0.5)
+
+
+def retry_backoff_max():
+    return getattr(settings, 'AI_RETRY_BACKOFF_MAX', 4.0)
+
+
+def request_timeout():
+    return getattr(settings, 'AI_REQUEST_TIMEOUT', 20)
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff before retry number ``attempt`` (1-based)."""
+    return random.uniform(0, min(retry_backoff_max(), retry_backoff() * 2 ** (attempt - 1)))
+
+
+def is_transient(error):
+    """Whether ``error`` is worth retrying: rate limits, server errors and timeouts."""
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return True
+    try:
+        from google.api_core import exceptions
+    except ImportError:
+        return False
+    return isinstance(error, (
+        exceptions.TooManyRequests, exceptions.ResourceExhausted, exceptions.InternalServerError,
+        exceptions.ServiceUnavailable, exceptions.GatewayTimeout, exceptions.DeadlineExceeded,
+    ))
+
+
+class CircuitBreaker:
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+
+    def threshold(self):
+        return getattr(settings, 'AI_BREAKER_FAILURES', 5)
+
+    def reset_timeout(self):
+        return getattr(settings, 'AI_BREAKER_RESET', 30)
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at < self.reset_timeout():
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self):
+        """Whether a call may go upstream now; in half-open state only one trial call does."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.threshold():
+                if self.opened_at is None:
+                    logger.warning("Gemini circuit breaker opened after %s failures", self.failures)
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """End a call that neither succeeded nor counts as a failure, freeing the half-open trial."""
+        with self._lock:
+            self.trial_running = False
+
+    def reset(self):
+        self.record_success()
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = 0
+            self.failures = 0
+            self.retries = 0
+            self.rejected = 0
+            self.latencies = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.calls += 1
+            self.failures += not ok
+            self.latencies.append(seconds)
+
+    def count(self, field):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def snapshot(self):
+        """Counters plus p50/p99/max latency in seconds over the recent calls."""
+        with self._lock:
+            latencies = sorted(self.latencies)
+            data = {
+                'calls': self.calls, 'failures': self.failures, 'retries': self.retries,
+                'rejected': self.rejected, 'breaker': breaker.state,
+            }
+        for name, fraction in (('p50', 0.50), ('p99', 0.99)):
+            data[f'latency_{name}'] = latencies[min(int(fraction * len(latencies)), len(latencies) - 1)] if latencies else None
+        data['latency_max'] = latencies[-1] if latencies else None
+        return data
+
+
+breaker = CircuitBreaker()
+metrics = Metrics()
+
+_model = None
+_model_key = None
+_model_lock = threading.Lock()
+
+
+def get_model(api_key, model_name):
+    """The shared ``GenerativeModel``, built (and the library configured) on first use."""
+    global _model, _model_key
+    with _model_lock:
+        if _model is None or _model_key != (api_key, model_name):
+            import google.generativeai as genai
+
+            genai.configure(api_key=api_key)
+            _model = genai.GenerativeModel(model_name)
+            _model_key = (api_key, model_name)
+        return _model
+
+
+def _check_breaker():
+    if not breaker.allow():
+        metrics.count('rejected')
+        raise GeminiUnavailable("Gemini circuit breaker is open")
+
+
+def _finish(started, error=None):
+    elapsed = time.perf_counter() - started
+    metrics.record(elapsed, ok=error is None)
+    if error is None:
+        breaker.record_success()
+        logger.debug("Gemini call took %.3fs", elapsed)
+    else:
+        if is_transient(error):
+            breaker.record_failure()
+        else:
+            breaker.release()
+        logger.warning("Gemini call failed after %.3fs: %s", elapsed, error)
+
+
+@timed('gemini')
+def generate(api_key, model_name, prompt):
+    """Generate text for ``prompt`` with retries; raises ``GeminiUnavailable`` while the breaker is open."""
+    _check_breaker()
+    started = time.perf_counter()
+    try:
+        model = get_model(api_key, model_name)
+    except Exception as e:
+        _finish(started, e)
+        raise
+    attempt = 0
+    while True:
+        try:
+            text = model.generate_content(prompt, request_options={'timeout': request_timeout()}).text
+        except Exception as e:
+            attempt += 1
+            if attempt > retry_attempts() or not is_transient(e):
+                _finish(started, e)
+                raise
+            metrics.count('retries')
+            time.sleep(backoff_delay(attempt))
+        else:
+            _finish(started)
+            return text
+
+
+@timed('gemini')
+async def agenerate(api_key, model_name, prompt):
+    """Async ``generate``; the caller applies the overall deadline."""
+    _check_breaker()
+    started = time.perf_counter()
+    try:
+        model = get_model(api_key, model_name)
+    except Exception as e:
+        _finish(started, e)
+        raise
+    attempt = 0
+    try:
+        while True:
+            try:
+                response = await model.generate_content_async(prompt)
+                text = response.text
+            except Exception as e:
+                attempt += 1
+                if attempt > retry_attempts() or not is_transient(e):
+                    _finish(started, e)
+                    raise
+                metrics.count('retries')
+                await asyncio.sleep(backoff_delay(attempt))
+            else:
+                _finish(started)
+                return text
+    except asyncio.CancelledError:
+        # Cut off by the caller's deadline, during a request or a backoff
+        _finish(started, TimeoutError("Gemini request cancelled"))
+        raise
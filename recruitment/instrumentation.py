@@ -0,0 +1,306 @@
+"""
+Request and hot-path performance instrumentation.
+
+``InstrumentationMiddleware`` times every request and counts it per view,
+method and status. A sampled fraction of requests (``INSTRUMENTATION_SAMPLE_RATE``)
+also records its database queries (count and time, via an execute wrapper
+installed on every connection) and writes one JSON line to the
+``recruitment.perf`` logger with the breakdown. Unsampled requests only pay
+for two clock reads, a counter update and a context variable lookup per
+query. The middleware runs natively under both WSGI and ASGI.
+
+Slow inner steps are wrapped in ``timed(name)``, as a decorator (sync or
+async) or a context manager: PDF extraction, Gemini calls and template
+rendering (through ``InstrumentedDjangoTemplates``). Each is recorded in a
+histogram and, on sampled requests, in the log line.
+
+``metrics_view`` serves everything in the Prometheus text format at
+``/metrics``, along with the Gemini client's counters and breaker state. The
+numbers are per process; scrape each worker, or run one per container. Set
+``METRICS_TOKEN`` to require ``Authorization: Bearer <token>``.
+"""
+import contextlib
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import random
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseForbidden
+from django.template.backends.django import DjangoTemplates
+
+logger = logging.getLogger('recruitment.perf')
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Per-request breakdown of the current (sampled) request, or None
+_current = contextvars.ContextVar('instrumentation_request', default=None)
+
+
+def sample_rate():
+    return getattr(settings, 'INSTRUMENTATION_SAMPLE_RATE', 0.1)
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for n, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.counts[n] += 1
+
+
+class Registry:
+    """Counters and histograms keyed by ``(metric name, labels)``."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, seconds):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def render(self):
+        """The Prometheus text exposition of everything recorded so far."""
+        with self._lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(self.histograms.items(), key=lambda item: item[0])
+            lines = []
+            seen = set()
+            for (name, labels), value in counters:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} counter")
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+            for (name, labels), histogram in histograms:
+                if name not in seen:
+                    seen.add(name)
+                    lines.append(f"# TYPE {name} histogram")
+                for bound, count in zip(BUCKETS, histogram.counts):
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', str(bound)),))} {count}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.sum)}")
+                lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        return lines
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{key}="{value}"' for (key, _), value in zip(labels, escaped)) + '}'
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+registry = Registry()
+
+
+def record_timer(name, seconds):
+    registry.observe('recruitment_step_duration_seconds', {'step': name}, seconds)
+    breakdown = _current.get()
+    if breakdown is not None:
+        breakdown['timers'][name] = breakdown['timers'].get(name, 0.0) + seconds
+
+
+class timed(contextlib.ContextDecorator):
+    """Time a block or a (sync or async) function as the hot-path step ``name``."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        record_timer(self.name, time.perf_counter() - self._started)
+        return False
+
+    def __call__(self, func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    record_timer(self.name, time.perf_counter() - started)
+            return wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record_timer(self.name, time.perf_counter() - started)
+        return wrapper
+
+
+def _count_query(execute, sql, params, many, context):
+    breakdown = _current.get()
+    if breakdown is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        breakdown['db_queries'] += 1
+        breakdown['db_time'] += time.perf_counter() - started
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):
+    # Installed once per connection rather than around each request: under ASGI the queries of an
+    # async view run on another thread, with its own connection, and the context variable follows them
+    # there. First in the list, so wrappers pushed and popped around it by other code stay balanced.
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _count_query)
+
+
+@contextlib.contextmanager
+def _sampling():
+    """Collect the enclosed request's DB queries and step timers; yields the breakdown."""
+    breakdown = {'db_queries': 0, 'db_time': 0.0, 'timers': {}}
+    token = _current.set(breakdown)
+    try:
+        yield breakdown
+    finally:
+        _current.reset(token)
+
+
+class InstrumentationMiddleware:
+    """Per-view request counts and latency; a sampled breakdown with DB and step timings."""
+
+    # Runs natively on either stack, so it doesn't force async views under ASGI into a thread
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        if random.random() >= sample_rate():
+            response = self.get_response(request)
+            self.record(request, response, time.perf_counter() - started)
+            return response
+
+        with _sampling() as breakdown:
+            response = self.get_response(request)
+        self.log(request, response, time.perf_counter() - started, breakdown)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        if random.random() >= sample_rate():
+            response = await self.get_response(request)
+            self.record(request, response, time.perf_counter() - started)
+            return response
+
+        with _sampling() as breakdown:
+            response = await self.get_response(request)
+        self.log(request, response, time.perf_counter() - started, breakdown)
+        return response
+
+    def log(self, request, response, elapsed, breakdown):
+        view = self.record(request, response, elapsed)
+        registry.inc('recruitment_sampled_requests_total', {'view': view})
+        registry.inc('recruitment_db_queries_total', {'view': view}, breakdown['db_queries'])
+        registry.inc('recruitment_db_query_seconds_total', {'view': view}, breakdown['db_time'])
+        logger.info(json.dumps({
+            'view': view,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'db_queries': breakdown['db_queries'],
+            'db_ms': round(breakdown['db_time'] * 1000, 2),
+            'timers_ms': {name: round(seconds * 1000, 2) for name, seconds in breakdown['timers'].items()},
+        }))
+
+    def record(self, request, response, elapsed):
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry.inc('recruitment_http_requests_total', {
+            'view': view, 'method': request.method, 'status': response.status_code,
+        })
+        registry.observe('recruitment_http_request_duration_seconds', {'view': view}, elapsed)
+        return view
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        with timed('template'):
+            return self.template.render(context, request)
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """The Django template backend with each top-level render timed as the ``template`` step."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
+
+
+def _gemini_lines():
+    from . import gemini
+
+    snapshot = gemini.metrics.snapshot()
+    lines = []
+    for field in ('calls', 'failures', 'retries', 'rejected'):
+        lines.append(f"# TYPE recruitment_gemini_{field}_total counter")
+        lines.append(f"recruitment_gemini_{field}_total {snapshot[field]}")
+    lines.append("# TYPE recruitment_gemini_breaker_open gauge")
+    lines.append(f"recruitment_gemini_breaker_open {int(snapshot['breaker'] != gemini.breaker.CLOSED)}")
+    return lines
+
+
+def metrics_view(request):
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.headers.get('Authorization') != f"Bearer {token}":
+        return HttpResponseForbidden()
+    body = '\n'.join(registry.render() + _gemini_lines()) + '\n'
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,209 @@
+"""
+Load test of the main user journeys through the real URLs.
+
+Each simulated client is a Django test ``Client`` driving the full request
+stack (middleware, views, templates, database) in-process, on its own
+thread and database connection. Clients take turns at the registered
+journeys in a shuffled order:
+
+* ``board``: an anonymous visitor browsing the job board, sometimes filtered;
+* ``board_signed_in``: an applicant browsing it while signed in;
+* ``apply``: an applicant uploading a generated PDF resume to a job;
+* ``candidate_list``, ``analyze``, ``schedule`` and ``status``: the recruiter
+  listing candidates, scoring one, scheduling an interview and moving one
+  along the pipeline.
+
+Every request's latency, status and query count is recorded per journey;
+``summarize`` turns them into throughput, latency percentiles and query
+counts. ``manage.py benchmark_journeys`` seeds a scratch database with
+``recruitment.synthetic``, runs this and saves the report as JSON.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .scoring_benchmark import percentile
+from .synthetic import ROLE_TITLES, make_pdf, person_name, resume_text
+
+_journeys = {}
+
+
+def journey(name):
+    def register(func):
+        _journeys[name] = func
+        return func
+    return register
+
+
+def journey_names():
+    return list(_journeys)
+
+
+@dataclass
+class Sample:
+    journey: str
+    seconds: float
+    status: int
+    queries: int
+
+
+@dataclass
+class Session:
+    """One simulated client: a recruiter session, an applicant session and an anonymous one."""
+    number: int
+    dataset: object
+    rng: random.Random
+    anonymous: Client = field(default_factory=lambda: Client(raise_request_exception=False))
+    applicant: Client = field(default_factory=lambda: Client(raise_request_exception=False))
+    recruiter: Client = field(default_factory=lambda: Client(raise_request_exception=False))
+    applications: int = 0
+
+    def __post_init__(self):
+        applicants = self.dataset.applicants
+        self.applicant_user = User.objects.get(pk=applicants[self.number % len(applicants)])
+        self.applicant.force_login(self.applicant_user)
+        self.recruiter.force_login(self.dataset.recruiter)
+
+    def candidate_id(self):
+        return self.rng.choice(self.dataset.candidates)
+
+
+@journey('board')
+def browse_board(session):
+    params = {}
+    if session.rng.random() < 0.5:
+        params['role'] = session.rng.choice([title for titles in ROLE_TITLES.values() for title in titles])
+    return session.anonymous.get(reverse('candidate_job_list'), params)
+
+
+@journey('board_signed_in')
+def browse_board_signed_in(session):
+    return session.applicant.get(reverse('candidate_job_list'))
+
+
+@journey('apply')
+def apply(session):
+    jobs = session.dataset.jobs
+    # Walk the jobs from a different start per client so most applications are new ones
+    job_id = jobs[(session.number * 7 + session.applications) % len(jobs)]
+    session.applications += 1
+    name = person_name(session.rng)
+    text = resume_text(session.rng, session.rng.choice(sorted(ROLE_TITLES)), name)
+    return session.applicant.post(reverse('apply_job', args=[job_id]), {
+        'name': name,
+        'email': session.applicant_user.email,
+        'experience_years': session.rng.randint(0, 15),
+        'current_location': 'Remote',
+        'work_preference': 'REMOTE',
+        'resume': SimpleUploadedFile('resume.pdf', make_pdf(text), content_type='application/pdf'),
+    })
+
+
+@journey('candidate_list')
+def candidate_list(session):
+    return session.recruiter.get(reverse('candidate_list'))
+
+
+@journey('analyze')
+def analyze(session):
+    return session.recruiter.post(reverse('analyze_candidate', args=[session.candidate_id()]))
+
+
+@journey('schedule')
+def schedule(session):
+    date = (timezone.now() + timezone.timedelta(days=session.rng.randint(1, 30))).isoformat(timespec='minutes')
+    return session.recruiter.post(reverse('schedule_interview', args=[session.candidate_id()]), {
+        'interviewer_id': session.rng.choice(session.dataset.interviewers),
+        'date': date,
+        'notes': 'Benchmark interview',
+    })
+
+
+@journey('status')
+def update_status(session):
+    return session.recruiter.post(reverse('update_candidate_status', args=[session.candidate_id()]), {
+        'status': session.rng.choice(['SHORTLISTED', 'REJECTED', 'HIRED']),
+    })
+
+
+def drive(session, names, requests):
+    """Run each journey in ``names`` ``requests`` times, in shuffled order; returns the ``Sample``s."""
+    plan = [name for name in names for _ in range(requests)]
+    session.rng.shuffle(plan)
+    samples = []
+    queries = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        for name in plan:
+            queries = 0
+            started = time.perf_counter()
+            response = _journeys[name](session)
+            samples.append(Sample(name, time.perf_counter() - started, response.status_code, queries))
+    return samples
+
+
+def run(dataset, names=None, clients=4, requests=20, seed=0):
+    """
+    Drive ``clients`` concurrent sessions through the journeys and return
+    ``(samples, elapsed seconds)``. ``clients=1`` runs in the calling thread.
+    """
+    names = names or journey_names()
+    sessions = [Session(n, dataset, random.Random(seed * 1000 + n)) for n in range(clients)]
+    started = time.perf_counter()
+    if clients == 1:
+        samples = drive(sessions[0], names, requests)
+        return samples, time.perf_counter() - started
+
+    samples, lock = [], threading.Lock()
+
+    def worker(session):
+        try:
+            result = drive(session, names, requests)
+            with lock:
+                samples.extend(result)
+        finally:
+            # Each thread has its own connection
+            connection.close()
+
+    threads = [threading.Thread(target=worker, args=(session,)) for session in sessions]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - started
+
+
+def summarize(samples, elapsed):
+    """``{journey: stats}``: request and error counts, requests/s, latency percentiles and queries."""
+    by_journey = {}
+    for sample in samples:
+        by_journey.setdefault(sample.journey, []).append(sample)
+    report = {}
+    for name, group in by_journey.items():
+        latencies = [sample.seconds for sample in group]
+        queries = [sample.queries for sample in group]
+        report[name] = {
+            'requests': len(group),
+            'errors': sum(1 for sample in group if sample.status >= 400),
+            'throughput': len(group) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'max_ms': max(latencies) * 1000,
+            'queries_mean': sum(queries) / len(queries),
+            'queries_max': max(queries),
+        }
+    return report
@@ -0,0 +1,113 @@
+import json
+import platform
+import shutil
+import tempfile
+import time
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from recruitment import journeys, synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a scratch database with synthetic recruiters, jobs, candidates (with PDF resumes) and "
+        "interviews, drive the main user journeys through the real URLs with concurrent clients and "
+        "report requests/s, latency percentiles and queries per journey. The report is saved as JSON; "
+        "pass an earlier one as --baseline to see the change. Your own database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=3)
+        parser.add_argument('--jobs', type=int, default=50)
+        parser.add_argument('--candidates', type=int, default=2000)
+        parser.add_argument('--applicants', type=int, default=50)
+        parser.add_argument('--interview-rate', type=float, default=0.2,
+                            help="Fraction of applied candidates with an interview.")
+        parser.add_argument('--no-pdfs', action='store_true', help="Store resume text only, without PDF files.")
+        parser.add_argument('--clients', type=int, default=4, help="Concurrent clients (threads).")
+        parser.add_argument('--requests', type=int, default=20, help="Requests per journey per client.")
+        parser.add_argument('--journeys', nargs='+', choices=journeys.journey_names(),
+                            help="Journeys to run (default: all).")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', help="Where to save the JSON report (default: journeys-<timestamp>.json).")
+        parser.add_argument('--baseline', help="An earlier JSON report to compare with.")
+        parser.add_argument('--keepdb', action='store_true', help="Keep the scratch database afterwards.")
+
+    def handle(self, *args, **options):
+        if min(options['recruiters'], options['jobs'], options['applicants'], options['clients'], options['requests']) < 1:
+            raise CommandError("--recruiters, --jobs, --applicants, --clients and --requests must be at least 1.")
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        if connection.vendor == 'sqlite' and not connection.settings_dict['TEST']['NAME']:
+            # An on-disk file, so every client thread sees the same database
+            connection.settings_dict['TEST']['NAME'] = f"{tempfile.gettempdir()}/recruitment-benchmark.sqlite3"
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=options['keepdb'])
+        media_root = tempfile.mkdtemp(prefix='recruitment-benchmark-')
+        try:
+            # Local scoring only, no per-request perf log lines; tasks are queued as in production
+            with override_settings(MEDIA_ROOT=media_root, GEMINI_API_KEY='', INSTRUMENTATION_SAMPLE_RATE=0):
+                started = time.perf_counter()
+                dataset = synthetic.populate(
+                    recruiters=options['recruiters'], jobs=options['jobs'], candidates=options['candidates'],
+                    applicants=options['applicants'], interview_rate=options['interview_rate'],
+                    pdfs=not options['no_pdfs'], seed=options['seed'],
+                )
+                seeded = time.perf_counter() - started
+                samples, elapsed = journeys.run(
+                    dataset, options['journeys'], clients=options['clients'],
+                    requests=options['requests'], seed=options['seed'],
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options['keepdb'])
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        report = {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+            },
+            'options': {name: options[name] for name in (
+                'recruiters', 'jobs', 'candidates', 'applicants', 'interview_rate', 'no_pdfs',
+                'clients', 'requests', 'journeys', 'seed',
+            )},
+            'seed_seconds': seeded,
+            'elapsed_seconds': elapsed,
+            'journeys': journeys.summarize(samples, elapsed),
+        }
+        output = options['output'] or f"journeys-{time.strftime('%Y%m%d-%H%M%S')}.json"
+        with open(output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+        self.print_report(report, baseline)
+        self.stdout.write(self.style.SUCCESS(f"Saved {output}"))
+
+    def print_report(self, report, baseline):
+        self.stdout.write(
+            f"seeded in {report['seed_seconds']:.1f}s; {report['options']['clients']} clients for "
+            f"{report['elapsed_seconds']:.1f}s"
+        )
+        header = f"{'journey':>16} {'reqs':>5} {'errors':>6} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>7}"
+        if baseline:
+            header += f" {'p50 vs base':>11} {'p99 vs base':>11}"
+        self.stdout.write(header)
+        for name, row in report['journeys'].items():
+            line = (
+                f"{name:>16} {row['requests']:>5} {row['errors']:>6} {row['throughput']:>7.1f} "
+                f"{row['p50_ms']:>8.1f} {row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['queries_mean']:>7.1f}"
+            )
+            before = baseline and baseline['journeys'].get(name)
+            if before:
+                line += f" {self.change(row['p50_ms'], before['p50_ms']):>11} {self.change(row['p99_ms'], before['p99_ms']):>11}"
+            self.stdout.write(line)
+
+    def change(self, now, before):
+        return f"{(now - before) / before:+.0%}" if before else '-'
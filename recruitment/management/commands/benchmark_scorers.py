@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment import scoring_benchmark
+from recruitment.scorers import get_scorer, scorer_names
+
+
+class Command(BaseCommand):
+    help = (
+        "Run each resume scorer over a synthetic corpus and report throughput, latency, memory, "
+        "precision@k against the corpus labels and rank agreement with a reference scorer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scorers', nargs='+', choices=scorer_names(),
+                            help="Scorers to run (default: every available one except llm).")
+        parser.add_argument('--reference', default=scoring_benchmark.REFERENCE, choices=scorer_names(),
+                            help="Scorer the others' rankings are compared with.")
+        parser.add_argument('--resumes', type=int, default=1000)
+        parser.add_argument('--jobs', type=int, default=20)
+        parser.add_argument('--top-k', type=int, default=scoring_benchmark.TOP_K)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['resumes'] < 1 or options['jobs'] < 1 or options['top_k'] < 1:
+            raise CommandError("--resumes, --jobs and --top-k must be at least 1.")
+        # The LLM scorer makes one upstream request per resume and job, so it only runs when asked for
+        names = options['scorers'] or [name for name in scorer_names() if name != 'llm']
+        for name in {*names, options['reference']}:
+            if not get_scorer(name).available():
+                raise CommandError(f"Scorer {name} is not available here.")
+
+        corpus = scoring_benchmark.synthetic_corpus(options['resumes'], options['jobs'], options['seed'])
+        results = scoring_benchmark.run(names, corpus, reference=options['reference'], top_k=options['top_k'])
+
+        k = min(options['top_k'], options['resumes'])
+        self.stdout.write(
+            f"{len(corpus.resumes)} resumes x {len(corpus.jobs)} jobs, agreement with {options['reference']}"
+        )
+        self.stdout.write(
+            f"{'scorer':>8} {'resumes/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'peak KiB':>9} "
+            f"{f'P@{k}':>6} {'spearman':>8} {f'top{k}':>6}"
+        )
+        for r in results:
+            self.stdout.write(
+                f"{r.scorer:>8} {r.throughput:>10.0f} {r.p50_ms:>8.1f} {r.p99_ms:>8.1f} {r.peak_kib:>9.0f} "
+                f"{r.precision:>6.2f} {r.spearman:>8.3f} {r.overlap:>6.2f}"
+            )
@@ -0,0 +1,88 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from recruitment import notifications, transitions
+from recruitment.models import Candidate, Interview, Interviewer, Job
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rejecting N candidates one request at a time with the bulk status endpoint. "
+        "Works on throwaway rows inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 1000, 10000],
+                            help="Numbers of candidates to reject.")
+        parser.add_argument('--skip-per-row', action='store_true',
+                            help="Only time the bulk path (the per-row path is slow for large sizes).")
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"{'candidates':>10} {'path':>8} {'queries':>8} {'seconds':>8} {'ms/cand':>8}")
+        for size in options['sizes']:
+            if not options['skip_per_row']:
+                self.report(size, 'per-row', *self.measure(size, self.reject_one_by_one))
+            self.report(size, 'bulk', *self.measure(size, self.reject_in_bulk))
+
+    def report(self, size, path, queries, elapsed):
+        self.stdout.write(f"{size:>10} {path:>8} {queries:>8} {elapsed:>8.2f} {elapsed * 1000 / size:>8.2f}")
+
+    def measure(self, size, reject):
+        queries = 0
+
+        def count(execute, sql, params, many, context):
+            nonlocal queries
+            queries += 1
+            return execute(sql, params, many, context)
+
+        try:
+            with transaction.atomic():
+                recruiter, candidates = self.populate(size)
+                with connection.execute_wrapper(count):
+                    started = time.perf_counter()
+                    reject(recruiter, candidates)
+                    elapsed = time.perf_counter() - started
+                raise Rollback
+        except Rollback:
+            pass
+        return queries, elapsed
+
+    def populate(self, size):
+        recruiter = User.objects.create(username=f'benchmark-{time.monotonic_ns()}')
+        job = Job.objects.create(
+            recruiter=recruiter, title='Benchmark Engineer', description='d', requirements='r', location='Remote',
+        )
+        interviewer = Interviewer.objects.create(name='Benchmark Interviewer')
+        candidates = Candidate.objects.bulk_create(
+            Candidate(job=job, name=f'Candidate {n}', email=f'candidate{n}@example.com', status='SHORTLISTED')
+            for n in range(size)
+        )
+        # A tenth of them have an interview that the rejection cancels
+        Interview.objects.bulk_create(
+            Interview(candidate=candidate, interviewer=interviewer, date=timezone.now() + timezone.timedelta(days=1))
+            for candidate in candidates[::10]
+        )
+        return recruiter, [candidate.id for candidate in candidates]
+
+    def reject_one_by_one(self, recruiter, ids):
+        # What update_candidate_status does for each POST
+        for candidate_id in ids:
+            candidate = Candidate.objects.get(id=candidate_id)
+            candidate.status = 'REJECTED'
+            candidate.save()
+            if hasattr(candidate, 'interview'):
+                candidate.interview.delete()
+            notifications.notify_status_change([candidate], 'REJECTED', owner=recruiter)
+
+    def reject_in_bulk(self, recruiter, ids):
+        transitions.change_status(
+            Candidate.objects.filter(job__recruiter=recruiter, id__in=ids), 'REJECTED', owner=recruiter,
+        )
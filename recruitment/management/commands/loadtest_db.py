@@ -0,0 +1,93 @@
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+
+from recruitment.models import Candidate, Job
+from recruitment.scoring_benchmark import percentile
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate a job launch: concurrent clients each browse the job board and apply, and report "
+        "applications per second, latency and how many failed with a database error. Run it once per "
+        "database setup to compare them, e.g. SQLITE_TUNING=0 (plain SQLite), the default tuned SQLite "
+        "and DATABASE_URL=postgres://... . Works on a throwaway recruiter and job that are deleted afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=8, help="Concurrent clients (threads).")
+        parser.add_argument('--applications', type=int, default=50, help="Applications per client.")
+
+    def handle(self, *args, **options):
+        if options['clients'] < 1 or options['applications'] < 1:
+            raise CommandError("--clients and --applications must be at least 1.")
+
+        recruiter = User.objects.create(username=f'loadtest-{time.monotonic_ns()}')
+        job = Job.objects.create(
+            recruiter=recruiter, title='Load Test Engineer', description='d', requirements='r', location='Remote',
+        )
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def client(number):
+            try:
+                for n in range(options['applications']):
+                    started = time.perf_counter()
+                    try:
+                        self.apply(job, f'client{number}-{n}@example.com')
+                    except OperationalError as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    with lock:
+                        latencies.append(time.perf_counter() - started)
+            finally:
+                # Each thread has its own connection
+                connection.close()
+
+        threads = [threading.Thread(target=client, args=(n,)) for n in range(options['clients'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        recruiter.delete()
+        self.report(elapsed, latencies, errors)
+
+    def apply(self, job, email):
+        # What a candidate does: look at the board, then submit an application
+        list(Job.objects.order_by('-created_at', '-id')[:25])
+        with transaction.atomic():
+            Candidate.objects.create(job=job, name='Load Test', email=email)
+
+    def report(self, elapsed, latencies, errors):
+        settings_dict = connection.settings_dict
+        self.stdout.write(f"backend: {connection.vendor} {settings_dict['NAME']}")
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA journal_mode')
+                journal_mode = cursor.fetchone()[0]
+            options = settings_dict.get('OPTIONS', {})
+            self.stdout.write(
+                f"journal_mode={journal_mode} timeout={options.get('timeout', 5)}s "
+                f"transaction_mode={options.get('transaction_mode') or 'DEFERRED'}"
+            )
+        else:
+            self.stdout.write(f"CONN_MAX_AGE={settings_dict['CONN_MAX_AGE']} pool={'pool' in settings_dict.get('OPTIONS', {})}")
+
+        self.stdout.write(f"{'ok':>6} {'failed':>6} {'apps/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        if latencies:
+            self.stdout.write(
+                f"{len(latencies):>6} {len(errors):>6} {len(latencies) / elapsed:>8.1f} "
+                f"{percentile(latencies, 0.50) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f} "
+                f"{max(latencies) * 1000:>8.1f}"
+            )
+        else:
+            self.stdout.write(f"{0:>6} {len(errors):>6}")
+        for message in sorted(set(errors)):
+            self.stdout.write(f"  {errors.count(message)} x {message}")
@@ -0,0 +1,108 @@
+from collections import Counter
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.models import Count
+
+# Later statuses win when merging, except that a rejection or hire is never undone by an earlier stage
+STATUS_ORDER = ['APPLIED', 'SHORTLISTED', 'INTERVIEW_SCHEDULED', 'REJECTED', 'HIRED']
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge applications that share a (job, email) into the earliest one, so migration "
+        "0010_indexes can add its unique constraint. The kept application takes over a duplicate's "
+        "interview, resume, account link and score where it has none, and the furthest status; the "
+        "duplicates and their unused resume files are then deleted and the affected jobs' term "
+        "indexes and recruiters' dashboard counters refreshed. Works on the database as migrated so "
+        "far, so run it before migrating past 0009."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help="Only list the duplicates.")
+
+    def handle(self, *args, **options):
+        apps = self.migrated_apps()
+        Candidate = apps.get_model('recruitment', 'Candidate')
+        groups = list(
+            Candidate.objects.values('job_id', 'email').annotate(n=Count('id')).filter(n__gt=1)
+            .order_by('job_id', 'email')
+        )
+        if not groups:
+            self.stdout.write("No duplicate applications.")
+            return
+        for group in groups:
+            self.stdout.write(f"job {group['job_id']}, {group['email']}: {group['n']} applications")
+        if options['dry_run']:
+            return
+
+        with transaction.atomic():
+            removed, files = self.merge(apps, groups)
+        # Only once the rows are really gone
+        for name in files:
+            default_storage.delete(name)
+        self.stdout.write(self.style.SUCCESS(
+            f"Merged {removed} duplicate application(s) into {len(groups)}; deleted {len(files)} resume file(s)."
+        ))
+
+    def migrated_apps(self):
+        """Models as of the latest applied recruitment migration, which may be older than the code."""
+        loader = MigrationLoader(connection)
+        applied = [key for key in loader.applied_migrations if key[0] == 'recruitment']
+        if not applied:
+            raise CommandError("The recruitment tables don't exist yet; there is nothing to merge.")
+        return loader.project_state(max(applied)).apps
+
+    def merge(self, apps, groups):
+        Candidate = apps.get_model('recruitment', 'Candidate')
+        Interview = apps.get_model('recruitment', 'Interview')
+        fields = {field.name for field in Candidate._meta.get_fields()}
+        fill = [name for name in ('user', 'resume_file', 'resume_text') if name in fields]
+
+        duplicate_ids, files = [], set()
+        for group in groups:
+            keeper, *duplicates = Candidate.objects.filter(job_id=group['job_id'], email=group['email']).order_by('id')
+            has_interview = Interview.objects.filter(candidate=keeper).exists()
+            for duplicate in duplicates:
+                for name in fill:
+                    if not getattr(keeper, name) and getattr(duplicate, name):
+                        setattr(keeper, name, getattr(duplicate, name))
+                if 'ai_analysis' in fields and not keeper.ai_analysis and duplicate.ai_analysis:
+                    keeper.match_score, keeper.ai_analysis = duplicate.match_score, duplicate.ai_analysis
+                if STATUS_ORDER.index(duplicate.status) > STATUS_ORDER.index(keeper.status):
+                    keeper.status = duplicate.status
+                if not has_interview and Interview.objects.filter(candidate=duplicate).update(candidate=keeper):
+                    has_interview = True
+                if duplicate.resume_file and duplicate.resume_file != keeper.resume_file:
+                    files.add(duplicate.resume_file.name)
+                duplicate_ids.append(duplicate.pk)
+            keeper.save()
+
+        Candidate.objects.filter(pk__in=duplicate_ids).delete()
+        # A file another application still points at stays
+        files -= set(Candidate.objects.filter(resume_file__in=files).values_list('resume_file', flat=True))
+        self.refresh(apps, {group['job_id'] for group in groups})
+        return len(duplicate_ids), files
+
+    def refresh(self, apps, job_ids):
+        """Recount the affected jobs' resume document frequencies and drop their recruiters' counters."""
+        models = {model.__name__ for model in apps.get_models()}
+        Candidate = apps.get_model('recruitment', 'Candidate')
+        if 'JobTermIndex' in models:
+            JobTermIndex = apps.get_model('recruitment', 'JobTermIndex')
+            for job_id in job_ids:
+                frequencies, count = Counter(), 0
+                for vector in Candidate.objects.filter(job_id=job_id).values_list('resume_vector', flat=True):
+                    if vector:
+                        frequencies.update(vector.keys())
+                        count += 1
+                JobTermIndex.objects.filter(job_id=job_id).update(
+                    document_frequencies=dict(frequencies), document_count=count,
+                )
+        if 'RecruiterStats' in models:
+            # Rebuilt from the source tables on the next dashboard view
+            Job = apps.get_model('recruitment', 'Job')
+            recruiters = Job.objects.filter(id__in=job_ids).values_list('recruiter_id', flat=True)
+            apps.get_model('recruitment', 'RecruiterStats').objects.filter(recruiter_id__in=recruiters).delete()
@@ -0,0 +1,31 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from recruitment import stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalised dashboard counters of one or more recruiters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('usernames', nargs='*',
+                            help="Recruiters to rebuild (default: everyone with jobs or existing counters).")
+
+    def handle(self, *args, **options):
+        recruiters = User.objects.order_by('id')
+        if options['usernames']:
+            recruiters = recruiters.filter(username__in=options['usernames'])
+            missing = set(options['usernames']) - set(recruiters.values_list('username', flat=True))
+            if missing:
+                raise CommandError(f"Unknown user(s): {', '.join(sorted(missing))}")
+        else:
+            recruiters = recruiters.filter(Q(jobs__isnull=False) | Q(stats__isnull=False)).distinct()
+
+        for recruiter in recruiters:
+            recruiter_stats = stats.rebuild(recruiter.pk)
+            self.stdout.write(self.style.SUCCESS(
+                f"{recruiter.username}: {recruiter_stats.job_count} jobs, "
+                f"{recruiter_stats.active_candidate_count} active candidates, "
+                f"{recruiter_stats.upcoming_interview_count} upcoming interviews"
+            ))
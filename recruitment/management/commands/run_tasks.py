@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment import tasks
+
+
+class Command(BaseCommand):
+    help = "Run background tasks queued with the database task backend."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--burst', action='store_true',
+                            help="Exit once the queue is empty instead of waiting for new tasks.")
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help="Seconds to wait between polls of an empty queue.")
+
+    def handle(self, *args, **options):
+        backend = tasks.get_backend()
+        if not isinstance(backend, tasks.DatabaseBackend):
+            raise CommandError(f"{type(backend).__name__} does not queue tasks for workers.")
+
+        # Make sure every task module is imported so its tasks are registered.
+        import recruitment.ai  # noqa: F401
+
+        self.stdout.write("Waiting for tasks..." if not options['burst'] else "Draining task queue...")
+        try:
+            processed = backend.work(burst=options['burst'], sleep=options['sleep'])
+        except KeyboardInterrupt:
+            return
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} task(s)."))
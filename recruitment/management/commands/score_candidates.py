@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment import matching
+from recruitment.models import Job
+
+
+class Command(BaseCommand):
+    help = "Score every applicant of one or more jobs against the job requirements."
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int, help="Jobs to score (default: all jobs).")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Processes used for resume extraction (default: CPU count).")
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help="Rows per bulk_update batch.")
+        parser.add_argument('--reindex', action='store_true',
+                            help="Rebuild every resume vector from the cached text.")
+
+    def handle(self, *args, **options):
+        jobs = Job.objects.order_by('id')
+        if options['job_ids']:
+            jobs = jobs.filter(id__in=options['job_ids'])
+            missing = set(options['job_ids']) - set(jobs.values_list('id', flat=True))
+            if missing:
+                raise CommandError(f"Unknown job id(s): {', '.join(map(str, sorted(missing)))}")
+
+        for job in jobs:
+            started = time.perf_counter()
+            scored = matching.score_job(
+                job,
+                workers=options['workers'],
+                batch_size=options['batch_size'],
+                reindex=options['reindex'],
+            )
+            elapsed = time.perf_counter() - started
+            self.stdout.write(self.style.SUCCESS(
+                f"{job.title} (#{job.id}): scored {scored} candidates in {elapsed:.1f}s"
+            ))
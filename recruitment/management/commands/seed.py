@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from recruitment import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic recruiters, applicants, jobs, candidates, interviews and "
+        "notifications, reproducibly for a given --seed, in bulk batches. Scales to millions of rows "
+        "(e.g. --jobs 20000 --candidates 2000000 --notifications 1000000). Adds to what is already "
+        "there; use a fresh --seed to seed the same database again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=10)
+        parser.add_argument('--applicants', type=int, default=1000, help="Candidate user accounts.")
+        parser.add_argument('--jobs', type=int, default=1000)
+        parser.add_argument('--candidates', type=int, default=100_000)
+        parser.add_argument('--interview-rate', type=float, default=0.2,
+                            help="Fraction of applied candidates with an interview.")
+        parser.add_argument('--notifications', type=int, default=100_000)
+        parser.add_argument('--pdfs', type=int, default=0,
+                            help="How many candidates get a generated PDF resume file (written to MEDIA_ROOT).")
+        parser.add_argument('--resume-pool', type=int, default=5000, help="Distinct resume texts to draw from.")
+        parser.add_argument('--days', type=int, default=365, help="Spread creation dates over this many days.")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        if options['recruiters'] < 1 or options['batch_size'] < 1 or options['resume_pool'] < 1:
+            raise CommandError("--recruiters, --batch-size and --resume-pool must be at least 1.")
+        if min(options['applicants'], options['jobs'], options['candidates'], options['notifications'],
+               options['pdfs'], options['days']) < 0:
+            raise CommandError("Counts can't be negative.")
+        if User.objects.filter(username__in=[f"recruiter-{options['seed']}-1", f"applicant-{options['seed']}-0"]).exists():
+            raise CommandError(f"This database was already seeded with --seed {options['seed']}; pick another.")
+
+        started = time.perf_counter()
+        last = {}
+
+        def progress(name, count):
+            # One line per model every ~10% (and at the end), not per batch
+            total = {'User': options['applicants'], 'Job': options['jobs'], 'Candidate': options['candidates'],
+                     'Notification': options['notifications']}[name]
+            if count == total or count - last.get(name, 0) >= max(total // 10, 1):
+                last[name] = count
+                self.stdout.write(f"{name}: {count}/{total} ({time.perf_counter() - started:.0f}s)")
+
+        summary = synthetic.generate(
+            recruiters=options['recruiters'], jobs=options['jobs'], candidates=options['candidates'],
+            applicants=options['applicants'], interview_rate=options['interview_rate'],
+            notifications=options['notifications'], pdfs=options['pdfs'], resume_pool=options['resume_pool'],
+            days=options['days'], batch_size=options['batch_size'], seed=options['seed'], progress=progress,
+        )
+        elapsed = time.perf_counter() - started
+        rows = sum(summary.counts.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {rows} rows in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s): "
+            + ', '.join(f"{count} {name}" for name, count in summary.counts.items())
+        ))
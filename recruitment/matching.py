@@ -0,0 +1,394 @@
+"""
+TF-IDF matching of resumes against job requirements.
+
+Each job keeps a small term index (``JobTermIndex``) holding the document
+frequencies of its applicants' resumes and the term counts of its
+requirements. Resumes are vectorised once, when the candidate applies, into
+a sparse L2-normalised log-tf vector stored on ``Candidate.resume_vector``.
+Scoring then follows the classic lnc.ltc scheme: the requirements side is
+weighted by IDF at query time and the score is a sparse dot product over the
+requirement terms only, so it never re-reads or re-tokenises the resume.
+"""
+import io
+import math
+import os
+import re
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import tasks
+from .models import Candidate, Job, JobTermIndex, ResumeText, Task
+from .resumes import cached_resume, hash_file, safe_extract_pdf_text
+from .tasks import task
+
+TOKEN_RE = re.compile(r'\w+')
+
+STOPWORDS = frozenset({
+    'and', 'the', 'to', 'of', 'in', 'for', 'with', 'a', 'an', 'is', 'it', 'on', 'as', 'be', 'are',
+})
+
+# Resumes with fewer distinct terms than this are treated as unreadable.
+MIN_RESUME_TERMS = 5
+
+# A cosine of 0.3 is decent for resume vs job: map 0.0-0.4 onto 0-100% and
+# cap, so no keyword match alone reads as a perfect fit.
+SIMILARITY_SCALE = 250.0
+MAX_SCORE = 95.0
+
+# Default and largest number of candidates on a job's shortlist
+SHORTLIST_SIZE = 20
+SHORTLIST_MAX = 100
+
+
+def tokenize(text):
+    return [word for word in TOKEN_RE.findall(text.lower()) if word not in STOPWORDS]
+
+
+def term_counts(text):
+    return dict(Counter(tokenize(text or '')))
+
+
+def document_vector(text):
+    """Sparse L2-normalised ``1 + log(tf)`` vector for a resume."""
+    weights = {term: 1.0 + math.log(count) for term, count in Counter(tokenize(text or '')).items()}
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in weights.items()}
+
+
+def idf(document_frequency, document_count):
+    return math.log((1 + document_count) / (1 + document_frequency)) + 1.0
+
+
+def get_term_index(job):
+    """Return the job's term index, building the requirements side if it is missing."""
+    index, created = JobTermIndex.objects.get_or_create(
+        job=job,
+        defaults={'requirements_terms': term_counts(job.requirements)},
+    )
+    return index
+
+
+def update_requirements(job):
+    """Re-index a job's requirements after they were created or edited."""
+    JobTermIndex.objects.update_or_create(
+        job=job,
+        defaults={'requirements_terms': term_counts(job.requirements)},
+    )
+
+
+def _adjust_frequencies(job, removed=(), added=()):
+    """Move one resume's terms out of / into the job's document frequencies."""
+    removed, added = list(removed), list(added)
+    if not removed and not added:
+        return
+    with transaction.atomic():
+        get_term_index(job)
+        index = JobTermIndex.objects.select_for_update().get(job=job)
+        frequencies = index.document_frequencies
+        for terms, delta in ((removed, -1), (added, +1)):
+            for term in terms:
+                count = frequencies.get(term, 0) + delta
+                if count > 0:
+                    frequencies[term] = count
+                else:
+                    frequencies.pop(term, None)
+        index.document_count = max(index.document_count - bool(removed) + bool(added), 0)
+        index.save(update_fields=['document_frequencies', 'document_count', 'updated_at'])
+
+
+def index_candidate(candidate, text=None):
+    """
+    Vectorise a candidate's resume and add it to the job's document frequencies.
+
+    The vector comes from the resume text cache unless ``text`` is passed
+    explicitly.
+    """
+    if text is None:
+        entry = cached_resume(candidate)
+        vector = entry.vector if entry else {}
+    else:
+        vector = document_vector(text)
+    previous = candidate.resume_vector or {}
+    candidate.resume_vector = vector
+    candidate.save(update_fields=['resume_vector'])
+    _adjust_frequencies(candidate.job, removed=previous.keys(), added=candidate.resume_vector.keys())
+    return candidate.resume_vector
+
+
+@task
+def index_application(candidate_id, sha256=None):
+    """Extract and index a new application's resume; queued by ``apply_to_job``."""
+    candidate = Candidate.objects.select_related('job', 'resume_text').filter(pk=candidate_id).first()
+    if candidate is None:
+        # Withdrawn or deleted before the worker got to it
+        return None
+    if cached_resume(candidate, sha256=sha256) is None and candidate.resume_file:
+        # Missing or unreadable file: scored as an empty resume rather than queued again
+        candidate.resume_index_failed_at = timezone.now()
+        candidate.save(update_fields=['resume_index_failed_at'])
+    return {'terms': len(index_candidate(candidate))}
+
+
+def queue_indexing(candidate_ids):
+    """Queue ``index_application`` for each of ``candidate_ids`` that has no such task pending or running."""
+    candidate_ids = list(candidate_ids)
+    if not candidate_ids:
+        return 0
+    queued = set(Task.objects.filter(
+        name=index_application.task_name, status__in=[Task.PENDING, Task.RUNNING], args__0__in=candidate_ids,
+    ).values_list('args__0', flat=True))
+    missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in queued]
+    for candidate_id in missing:
+        tasks.enqueue(index_application, candidate_id)
+    return len(missing)
+
+
+def remove_candidate(candidate):
+    """Drop a candidate's resume from the job's document frequencies."""
+    _adjust_frequencies(candidate.job, removed=(candidate.resume_vector or {}).keys())
+
+
+def query_vector(index):
+    """IDF-weighted, L2-normalised ``1 + log(tf)`` vector of the requirements."""
+    frequencies = index.document_frequencies
+    weights = {
+        term: (1.0 + math.log(count)) * idf(frequencies.get(term, 0), index.document_count)
+        for term, count in index.requirements_terms.items()
+    }
+    norm = math.sqrt(sum(w * w for w in weights.values()))
+    if not norm:
+        return {}
+    return {term: w / norm for term, w in weights.items()}
+
+
+def cosine(query, document):
+    return sum(weight * document.get(term, 0.0) for term, weight in query.items())
+
+
+def similarity_to_score(similarity):
+    return round(min(similarity * SIMILARITY_SCALE, MAX_SCORE), 1)
+
+
+def score_vector(document, query):
+    """
+    Score a resume vector against a requirements query vector.
+
+    Returns ``(score, analysis)`` ready to be saved on the candidate.
+    """
+    if len(document) < MIN_RESUME_TERMS:
+        return 0.0, "Resume text could not be extracted or is too short."
+
+    score = similarity_to_score(cosine(query, document))
+
+    # Rank keywords by their IDF-weighted importance in the requirements.
+    ranked = sorted(query, key=lambda term: query[term], reverse=True)
+    matched = [term for term in ranked if term in document]
+    missing = [term for term in ranked if term not in document]
+
+    analysis = "**AI Semantic Analysis**\n\n"
+    if score > 75:
+        analysis += "✅ **Excellent Fit**: The candidate's profile strongly aligns with the job requirements.\n"
+    elif score > 50:
+        analysis += "⚠️ **Potential Match**: Good alignment found, though some specific skills may be implicit or missing.\n"
+    else:
+        analysis += "❌ **Low Compatibility**: The resume content diverges significantly from the target role.\n"
+
+    if matched:
+        analysis += f"\n**Matched Keywords**: {', '.join(matched[:8])}"
+    if missing:
+        analysis += f"\n**Missing/Unmatched Terms**: {', '.join(missing[:8])}"
+
+    return score, analysis
+
+
+def score_candidate(candidate, index=None):
+    """Score a candidate's stored resume vector against the job requirements."""
+    if index is None:
+        index = get_term_index(candidate.job)
+    return score_vector(candidate.resume_vector or {}, query_vector(index))
+
+
+def score_missing(job, batch_size=500):
+    """
+    Score the candidates of ``job`` that have no score yet, in one batch.
+
+    A candidate is unscored while ``ai_analysis`` is empty, since every scorer
+    writes both fields. Resumes that haven't been indexed yet are left for a
+    later call, with ``index_application`` queued for any that aren't already
+    waiting for it (e.g. uploaded before indexing was queued at upload).
+    A resume whose file couldn't be read when indexed is scored as empty.
+    Existing scores are kept as they are, unlike ``score_job``. Returns the
+    number of candidates scored.
+    """
+    unscored = job.candidates.filter(ai_analysis__isnull=True)
+    unindexed = Q(resume_text__isnull=True, resume_file__gt='', resume_index_failed_at__isnull=True)
+    queue_indexing(unscored.filter(unindexed).values_list('id', flat=True))
+    candidates = list(unscored.exclude(unindexed).only('id', 'job_id', 'resume_vector'))
+    if not candidates:
+        return 0
+    query = query_vector(get_term_index(job))
+    for candidate in candidates:
+        candidate.match_score, candidate.ai_analysis = score_vector(candidate.resume_vector or {}, query)
+    Candidate.objects.bulk_update(candidates, ['match_score', 'ai_analysis'], batch_size=batch_size)
+    return len(candidates)
+
+
+def shortlist(job, limit=SHORTLIST_SIZE, min_experience=None, work_preference=None, location=None):
+    """
+    The ``limit`` best-matching candidates of ``job``, best first.
+
+    Missing scores are filled in first. The ranking is read in order from
+    ``candidate_job_score_idx`` and stops after ``limit`` rows, so it costs
+    the same for five applicants as for five thousand. The filters are
+    checked against the rows as they are read.
+    """
+    score_missing(job)
+    queryset = job.candidates.only(
+        'id', 'job_id', 'name', 'email', 'experience_years', 'current_location',
+        'work_preference', 'status', 'match_score',
+    )
+    if min_experience:
+        queryset = queryset.filter(experience_years__gte=min_experience)
+    if work_preference:
+        queryset = queryset.filter(work_preference=work_preference)
+    if location:
+        queryset = queryset.filter(current_location__icontains=location)
+    return list(queryset.order_by('-match_score', 'id')[:limit])
+
+
+def _read_resume(candidate):
+    """Return ``(sha256, source)`` for a resume; source is a path when stored locally, else bytes."""
+    with candidate.resume_file.open('rb') as fileobj:
+        sha256 = hash_file(fileobj)
+        try:
+            return sha256, candidate.resume_file.path
+        except NotImplementedError:
+            return sha256, fileobj.read()
+
+
+def _extract_resume(source):
+    """Process-pool worker: extract a resume PDF and return its text and document vector."""
+    if isinstance(source, bytes):
+        text = safe_extract_pdf_text(io.BytesIO(source))
+    else:
+        with open(source, 'rb') as fileobj:
+            text = safe_extract_pdf_text(fileobj)
+    return text, document_vector(text)
+
+
+def _extract_missing(candidates, workers):
+    """
+    Link each candidate to its cached ``ResumeText``, extracting only the
+    resumes whose content hash has never been seen, in a process pool.
+    """
+    hashes = {}
+    sources = {}
+    for candidate in candidates:
+        try:
+            sha256, source = _read_resume(candidate)
+        except OSError:
+            continue
+        hashes[candidate.pk] = sha256
+        sources.setdefault(sha256, source)
+
+    cached = ResumeText.objects.in_bulk(list(sources))
+    missing = [sha256 for sha256 in sources if sha256 not in cached]
+    if missing:
+        workers = workers or os.cpu_count() or 1
+        missing_sources = [sources[sha256] for sha256 in missing]
+        if workers > 1 and len(missing) > 1:
+            chunksize = max(1, len(missing) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as executor:
+                results = list(executor.map(_extract_resume, missing_sources, chunksize=chunksize))
+        else:
+            results = [_extract_resume(source) for source in missing_sources]
+        ResumeText.objects.bulk_create(
+            [ResumeText(sha256=sha256, text=text, vector=vector)
+             for sha256, (text, vector) in zip(missing, results)],
+            ignore_conflicts=True,
+        )
+        cached.update(ResumeText.objects.in_bulk(missing))
+
+    for candidate in candidates:
+        entry = cached.get(hashes.get(candidate.pk))
+        if entry is not None:
+            candidate.resume_text = entry
+
+
+def rebuild_term_index(job, vectors):
+    """Recompute a job's document frequencies from scratch from its resume vectors."""
+    frequencies = Counter()
+    count = 0
+    for vector in vectors:
+        if vector:
+            frequencies.update(vector.keys())
+            count += 1
+    index, created = JobTermIndex.objects.update_or_create(
+        job=job,
+        defaults={
+            'requirements_terms': term_counts(job.requirements),
+            'document_frequencies': dict(frequencies),
+            'document_count': count,
+        },
+    )
+    return index
+
+
+def score_job(job, workers=None, batch_size=500, reindex=False):
+    """
+    Score every candidate of ``job`` in one run.
+
+    Resumes that are not in the text cache yet are extracted in a process
+    pool of ``workers`` processes; ``workers=1`` keeps everything
+    in-process. With ``reindex`` every vector is rebuilt from the cached
+    text instead of being reused. The job's term index is then
+    rebuilt once and scores are written back with ``bulk_update`` in batches
+    of ``batch_size``. Returns the number of candidates scored.
+    """
+    candidates = list(
+        job.candidates.select_related('resume_text')
+        .only('id', 'job_id', 'resume_file', 'resume_vector', 'resume_text')
+        .order_by('id')
+    )
+    _extract_missing([c for c in candidates if c.resume_file and not c.resume_text_id], workers)
+
+    for candidate in candidates:
+        entry = candidate.resume_text
+        if entry is None:
+            continue
+        if reindex:
+            entry.vector = document_vector(entry.text)
+        if reindex or not candidate.resume_vector:
+            candidate.resume_vector = entry.vector
+    if reindex:
+        ResumeText.objects.bulk_update(
+            {c.resume_text_id: c.resume_text for c in candidates if c.resume_text_id}.values(),
+            ['vector'], batch_size=batch_size,
+        )
+
+    index = rebuild_term_index(job, (c.resume_vector for c in candidates))
+    query = query_vector(index)
+    for candidate in candidates:
+        candidate.match_score, candidate.ai_analysis = score_vector(candidate.resume_vector or {}, query)
+
+    Candidate.objects.bulk_update(
+        candidates, ['resume_text', 'resume_vector', 'match_score', 'ai_analysis'], batch_size=batch_size,
+    )
+    return len(candidates)
+
+
+@task
+def score_applicants(job_id):
+    """``score_job`` for the job detail page's "Score all applicants" action, run by a task worker."""
+    job = Job.objects.filter(pk=job_id).first()
+    if job is None:
+        return None
+    return {'scored': score_job(job, workers=getattr(settings, 'RESUME_SCORING_WORKERS', None))}
@@ -0,0 +1,36 @@
+"""
+WhiteNoise static file serving that keeps the middleware chain async under ASGI.
+
+``whitenoise.middleware.WhiteNoiseMiddleware`` is sync-only, and a single
+sync-only middleware makes Django adapt the whole chain to sync. Every ASGI
+request, including the async AI views and the notification stream, would then
+hold a thread for its whole life. This subclass also runs natively on the
+event loop: a request that isn't for a static file is passed straight on, and
+only the file lookup (with autorefresh) and the file opening go to a thread.
+"""
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from whitenoise.middleware import WhiteNoiseMiddleware as BaseWhiteNoiseMiddleware
+
+
+class WhiteNoiseMiddleware(BaseWhiteNoiseMiddleware):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if self.autorefresh:
+            static_file = await sync_to_async(self.find_file)(request.path_info)
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(self.serve)(static_file, request)
+        return await self.get_response(request)
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def check_duplicate_applications(apps, schema_editor):
+    """Stop before adding the unique constraint if some (job, email) applied more than once."""
+    Candidate = apps.get_model('recruitment', 'Candidate')
+    duplicates = list(
+        Candidate.objects.values('job_id', 'email').annotate(n=models.Count('id')).filter(n__gt=1)
+        .order_by('job_id', 'email')
+    )
+    if duplicates:
+        listed = '\n'.join(f"  job {d['job_id']}, {d['email']}: {d['n']} applications" for d in duplicates[:20])
+        more = f"\n  ... and {len(duplicates) - 20} more" if len(duplicates) > 20 else ''
+        raise RuntimeError(
+            f"{len(duplicates)} (job, email) pair(s) have more than one application:\n{listed}{more}\n"
+            "Run `python manage.py merge_duplicate_applications` to merge them, then migrate again."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0009_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['job', 'status', 'created_at'], name='candidate_job_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidate',
+            index=models.Index(fields=['created_at', 'id'], name='candidate_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['date', 'id'], name='interview_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['title', 'created_at'], name='job_title_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_at', 'id'], name='job_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['recruiter', 'created_at'], name='job_recruiter_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', 'created_at'], name='notification_inbox_idx'),
+        ),
+        migrations.RunPython(check_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='candidate',
+            constraint=models.UniqueConstraint(fields=('job', 'email'), name='unique_application_per_job'),
+        ),
+    ]
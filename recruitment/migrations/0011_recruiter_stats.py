@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('recruitment', '0010_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecruiterStats',
+            fields=[
+                ('recruiter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('job_count', models.PositiveIntegerField(default=0)),
+                ('status_counts', models.JSONField(default=dict)),
+                ('next_interview_at', models.DateTimeField(blank=True, null=True)),
+                ('upcoming_interview_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,80 @@
+from django.db import migrations
+
+# The index as of this migration, frozen here rather than imported so that later changes to
+# recruitment.search don't change what this migration does. A later migration that makes Django
+# rebuild recruitment_job (which drops the triggers) has to create them again itself.
+INSTALL = {
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS recruitment_job_fts USING fts5(
+            title, description, requirements, location,
+            content='recruitment_job', content_rowid='id', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_job_fts_insert AFTER INSERT ON recruitment_job BEGIN
+            INSERT INTO recruitment_job_fts(rowid, title, description, requirements, location)
+            VALUES (new.id, new.title, new.description, new.requirements, new.location);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_job_fts_delete AFTER DELETE ON recruitment_job BEGIN
+            INSERT INTO recruitment_job_fts(recruitment_job_fts, rowid, title, description, requirements, location)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_job_fts_update AFTER UPDATE ON recruitment_job BEGIN
+            INSERT INTO recruitment_job_fts(recruitment_job_fts, rowid, title, description, requirements, location)
+            VALUES ('delete', old.id, old.title, old.description, old.requirements, old.location);
+            INSERT INTO recruitment_job_fts(rowid, title, description, requirements, location)
+            VALUES (new.id, new.title, new.description, new.requirements, new.location);
+        END
+        """,
+        "INSERT INTO recruitment_job_fts(recruitment_job_fts) VALUES ('rebuild')",
+    ],
+    'postgresql': [
+        """
+        ALTER TABLE recruitment_job ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(location, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(requirements, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS recruitment_job_search_idx ON recruitment_job USING GIN (search_vector)",
+    ],
+}
+
+UNINSTALL = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS recruitment_job_fts_insert",
+        "DROP TRIGGER IF EXISTS recruitment_job_fts_delete",
+        "DROP TRIGGER IF EXISTS recruitment_job_fts_update",
+        "DROP TABLE IF EXISTS recruitment_job_fts",
+    ],
+    'postgresql': [
+        "DROP INDEX IF EXISTS recruitment_job_search_idx",
+        "ALTER TABLE recruitment_job DROP COLUMN IF EXISTS search_vector",
+    ],
+}
+
+
+def run(statements):
+    # Other databases get no index; search falls back to icontains there
+    def execute(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements.get(schema_editor.connection.vendor, ()):
+                cursor.execute(sql)
+    return execute
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0011_recruiter_stats'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(INSTALL), run(UNINSTALL)),
+    ]
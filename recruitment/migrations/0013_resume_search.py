@@ -0,0 +1,84 @@
+from django.db import migrations
+
+# The index as of this migration, frozen here rather than imported so that later changes to
+# recruitment.search don't change what this migration does. A later migration that makes Django
+# rebuild recruitment_candidate (which drops the triggers) has to create them again itself.
+INSTALL = {
+    'sqlite': [
+        # Contentless: the text stays in recruitment_resumetext, the index is per candidate
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS recruitment_resume_fts USING fts5(
+            text, content='', tokenize='porter unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_resume_fts_insert
+        AFTER INSERT ON recruitment_candidate WHEN new.resume_text_id IS NOT NULL BEGIN
+            INSERT INTO recruitment_resume_fts(rowid, text)
+            SELECT new.id, text FROM recruitment_resumetext WHERE sha256 = new.resume_text_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_resume_fts_delete
+        AFTER DELETE ON recruitment_candidate WHEN old.resume_text_id IS NOT NULL BEGIN
+            INSERT INTO recruitment_resume_fts(recruitment_resume_fts, rowid, text)
+            SELECT 'delete', old.id, text FROM recruitment_resumetext WHERE sha256 = old.resume_text_id;
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS recruitment_resume_fts_update
+        AFTER UPDATE OF resume_text_id ON recruitment_candidate
+        WHEN old.resume_text_id IS NOT new.resume_text_id BEGIN
+            INSERT INTO recruitment_resume_fts(recruitment_resume_fts, rowid, text)
+            SELECT 'delete', old.id, text FROM recruitment_resumetext WHERE sha256 = old.resume_text_id;
+            INSERT INTO recruitment_resume_fts(rowid, text)
+            SELECT new.id, text FROM recruitment_resumetext WHERE sha256 = new.resume_text_id;
+        END
+        """,
+        """
+        INSERT INTO recruitment_resume_fts(rowid, text)
+        SELECT c.id, r.text FROM recruitment_candidate c
+        JOIN recruitment_resumetext r ON r.sha256 = c.resume_text_id
+        """,
+    ],
+    'postgresql': [
+        """
+        ALTER TABLE recruitment_resumetext ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', text)) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS recruitment_resumetext_search_idx ON recruitment_resumetext USING GIN (search_vector)",
+    ],
+}
+
+UNINSTALL = {
+    'sqlite': [
+        "DROP TRIGGER IF EXISTS recruitment_resume_fts_insert",
+        "DROP TRIGGER IF EXISTS recruitment_resume_fts_delete",
+        "DROP TRIGGER IF EXISTS recruitment_resume_fts_update",
+        "DROP TABLE IF EXISTS recruitment_resume_fts",
+    ],
+    'postgresql': [
+        "DROP INDEX IF EXISTS recruitment_resumetext_search_idx",
+        "ALTER TABLE recruitment_resumetext DROP COLUMN IF EXISTS search_vector",
+    ],
+}
+
+
+def run(statements):
+    # Other databases get no index; search falls back to icontains there
+    def execute(apps, schema_editor):
+        with schema_editor.connection.cursor() as cursor:
+            for sql in statements.get(schema_editor.connection.vendor, ()):
+                cursor.execute(sql)
+    return execute
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0012_job_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(run(INSTALL), run(UNINSTALL)),
+    ]
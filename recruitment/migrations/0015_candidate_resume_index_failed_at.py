@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0014_candidate_job_score_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidate',
+            name='resume_index_failed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
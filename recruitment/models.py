@@ -12,9 +12,29 @@ class Job(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Public board: filter by title, newest/oldest first (keyset on created_at, id)
+            models.Index(fields=['title', 'created_at'], name='job_title_created_idx'),
+            models.Index(fields=['created_at', 'id'], name='job_created_idx'),
+            # Recruiter's own job list
+            models.Index(fields=['recruiter', 'created_at'], name='job_recruiter_created_idx'),
+        ]
+
     def __str__(self):
         return self.title
 
+class ResumeText(models.Model):
+    """Text extracted from a resume file, shared by every upload with the same bytes."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    text = models.TextField(blank=True)
+    # Sparse normalised term vector of ``text``, see recruitment.matching
+    vector = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.sha256
+
 class Candidate(models.Model):
     STATUS_CHOICES = [
         ('APPLIED', 'Applied'),
@@ -29,6 +49,7 @@ class Candidate(models.Model):
     name = models.CharField(max_length=200)
     email = models.EmailField()
     resume_file = models.FileField(upload_to='resumes/', null=True, blank=True)
+    resume_text = models.ForeignKey(ResumeText, on_delete=models.SET_NULL, related_name='candidates', null=True, blank=True)
     experience_years = models.IntegerField(default=0)
     current_location = models.CharField(max_length=100, default='')
     work_preference = models.CharField(
@@ -42,10 +63,37 @@ class Candidate(models.Model):
     # AI Analysis Fields
     match_score = models.FloatField(default=0.0)
     ai_analysis = models.TextField(blank=True, null=True)
+    # Sparse normalised term vector of the resume, see recruitment.matching
+    resume_vector = models.JSONField(default=dict, blank=True)
+    # Set when the resume file couldn't be read for indexing, so it isn't queued again
+    resume_index_failed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'email'], name='unique_application_per_job'),
+        ]
+        indexes = [
+            # Recruiter candidate lists and dashboard counts by status, newest first
+            models.Index(fields=['job', 'status', 'created_at'], name='candidate_job_status_idx'),
+            models.Index(fields=['created_at', 'id'], name='candidate_created_idx'),
+            # Per-job shortlist: best match first, read straight off the index
+            models.Index(fields=['job', '-match_score', 'id'], name='candidate_job_score_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+class JobTermIndex(models.Model):
+    """Per-job TF-IDF statistics used to score applicants' resumes."""
+    job = models.OneToOneField(Job, on_delete=models.CASCADE, related_name='term_index')
+    document_count = models.PositiveIntegerField(default=0)
+    document_frequencies = models.JSONField(default=dict, blank=True)
+    requirements_terms = models.JSONField(default=dict, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Term index for {self.job.title}"
+
 class Interviewer(models.Model):
     name = models.CharField(max_length=200)
     specialization = models.CharField(max_length=200, default='General')
@@ -60,6 +108,12 @@ class Interview(models.Model):
     notes = models.TextField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Upcoming interviews (date__gte) and keyset pagination on (date, id)
+            models.Index(fields=['date', 'id'], name='interview_date_idx'),
+        ]
+
     def __str__(self):
         return f"Interview: {self.candidate.name} with {self.interviewer.name}"
 
@@ -69,5 +123,64 @@ class Notification(models.Model):
     is_read = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A user's notifications newest first; Django renders is_read=False as
+            # NOT is_read, which SQLite can't seek on, so it's filtered per row.
+            models.Index(fields=['recipient', 'created_at'], name='notification_inbox_idx'),
+        ]
+
     def __str__(self):
         return f"Notification for {self.recipient.username}"
+
+class RecruiterStats(models.Model):
+    """Denormalised dashboard counters for one recruiter, see recruitment.stats."""
+    recruiter = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    job_count = models.PositiveIntegerField(default=0)
+    # {status: number of candidates} across all of the recruiter's jobs
+    status_counts = models.JSONField(default=dict)
+    next_interview_at = models.DateTimeField(null=True, blank=True)
+    upcoming_interview_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    @property
+    def active_candidate_count(self):
+        return sum(n for status, n in self.status_counts.items() if status != 'REJECTED')
+
+    def __str__(self):
+        return f"Stats for {self.recruiter.username}"
+
+class Task(models.Model):
+    """A unit of background work, see recruitment.tasks."""
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tasks', null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'id'])]
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
@@ -0,0 +1,162 @@
+"""
+Candidate notifications.
+
+Views describe who should hear what and call ``send``, which queues one
+background task for the whole batch. The task works out the recipients
+(the candidate's account, or every account registered with the candidate's
+email) with a single query and writes all the rows with ``bulk_create``. A
+mass rejection therefore costs the request one ``Task`` insert, which is
+committed together with the status change.
+
+Candidates receive new notifications over SSE under ASGI, or by short
+polling otherwise, rather than by reloading the job board. Clients keep
+a "last seen id" cursor, and each user's newest notification id is kept in
+the default cache, so an idle connection checks a cache key rather than
+querying the database. Delivery refreshes that key. It also expires after
+``LATEST_ID_TIMEOUT`` so a cache that isn't shared between the worker and
+the web processes is only stale for that long.
+"""
+import logging
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Max
+
+from .models import Notification
+from .tasks import enqueue, task
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+LATEST_ID_TIMEOUT = 60
+# Most notifications handed to a client at once
+PUSH_LIMIT = 20
+
+STATUS_MESSAGES = {
+    'REJECTED': "Update on your application for {job}: Unfortunately, we have decided not to proceed at this time.",
+    'HIRED': "Congratulations! You have been selected for the {job} position!",
+    'SHORTLISTED': "You have been shortlisted for the {job} position.",
+}
+
+
+def status_message(status, job_title):
+    """The message for a candidate moved to ``status``, or None if it isn't announced."""
+    template = STATUS_MESSAGES.get(status)
+    return template.format(job=job_title) if template else None
+
+
+def interview_message(job_title, date):
+    return f"Great news! An interview has been scheduled for {job_title} on {date}. Check details."
+
+
+def send(items, owner=None):
+    """
+    Queue notifications for delivery and return the ``Task``, or None if there is nothing to send.
+
+    ``items`` are ``(candidate, message)`` pairs; candidates need ``user_id``
+    and ``email``.
+    """
+    payload = [[candidate.user_id, candidate.email, message] for candidate, message in items if message]
+    if not payload:
+        return None
+    return enqueue(deliver, payload, owner=owner)
+
+
+def notify_status_change(candidates, status, owner=None):
+    """Tell every candidate in ``candidates`` (with ``job`` loaded) about their new ``status``."""
+    if status not in STATUS_MESSAGES:
+        return None
+    return send(((c, status_message(status, c.job.title)) for c in candidates), owner=owner)
+
+
+@task
+def deliver(payload):
+    """Write the notifications for ``[user_id, email, message]`` rows in bulk."""
+    emails = {email for user_id, email, message in payload if user_id is None and email}
+    users_by_email = {}
+    for user_id, email in User.objects.filter(email__in=emails).values_list('id', 'email'):
+        users_by_email.setdefault(email, []).append(user_id)
+
+    rows = []
+    for user_id, email, message in payload:
+        # Without a linked account, notify every account registered with that email
+        recipients = [user_id] if user_id is not None else users_by_email.get(email, [])
+        if not recipients:
+            logger.info("No user found for notification email %s", email)
+        rows.extend(Notification(recipient_id=recipient, message=message) for recipient in recipients)
+    Notification.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    _publish(rows)
+    return {'delivered': len(rows)}
+
+
+def parse_cursor(value):
+    """A client-supplied cursor as a non-negative int; anything else starts from 0."""
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def latest_id_key(user_id):
+    return f"notifications:latest:{user_id}"
+
+
+def _publish(rows):
+    """Advance the recipients' latest-id keys so their open connections pick the rows up."""
+    latest = {}
+    for row in rows:
+        if row.pk is None:
+            # The backend didn't return primary keys; make readers look them up.
+            cache.delete_many([latest_id_key(r.recipient_id) for r in rows])
+            return
+        latest[row.recipient_id] = max(row.pk, latest.get(row.recipient_id, 0))
+    cache.set_many({latest_id_key(uid): pk for uid, pk in latest.items()}, LATEST_ID_TIMEOUT)
+
+
+def _load_latest_id(user_id):
+    latest = Notification.objects.filter(recipient_id=user_id).aggregate(latest=Max('id'))['latest'] or 0
+    cache.set(latest_id_key(user_id), latest, LATEST_ID_TIMEOUT)
+    return latest
+
+
+def latest_id(user_id):
+    """The id of ``user_id``'s newest notification, normally from the cache."""
+    latest = cache.get(latest_id_key(user_id))
+    return _load_latest_id(user_id) if latest is None else latest
+
+
+async def alatest_id(user_id):
+    latest = await cache.aget(latest_id_key(user_id))
+    return await sync_to_async(_load_latest_id)(user_id) if latest is None else latest
+
+
+def collect(user_id, after, latest):
+    """
+    Return ``(notifications, cursor)``: unread notifications newer than ``after``.
+
+    They are marked read, since handing them to the page is what shows them.
+    ``cursor`` is what the client sends as ``after`` next time.
+    """
+    unread = list(
+        Notification.objects.filter(recipient_id=user_id, is_read=False, id__gt=after)
+        .order_by('id').values('id', 'message', 'created_at')[:PUSH_LIMIT]
+    )
+    if unread:
+        Notification.objects.filter(id__in=[n['id'] for n in unread]).update(is_read=True)
+    if len(unread) == PUSH_LIMIT:
+        cursor = unread[-1]['id']
+    else:
+        cursor = max([latest, after] + [n['id'] for n in unread])
+    return [
+        {'id': n['id'], 'message': n['message'], 'created_at': n['created_at'].isoformat()} for n in unread
+    ], cursor
+
+
+def poll(user_id, after):
+    """``collect`` without touching the database when nothing new has arrived."""
+    latest = latest_id(user_id)
+    if latest <= after:
+        return [], after
+    return collect(user_id, after, latest)
@@ -0,0 +1,122 @@
+"""
+Keyset (cursor) pagination for list views.
+
+Rows are ordered by ``(keyset_field, id)`` and each page starts strictly
+after the last row of the previous one, so fetching page N costs the same
+index range scan as page 1, unlike OFFSET pagination. The cursor is an opaque
+URL-safe token holding the last row's key.
+
+Views render the whole page normally and, for HTMX requests carrying a
+cursor, only the rows partial so the list can grow by infinite scroll.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+CURSOR_PARAM = 'cursor'
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([value, pk]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token):
+    """Return ``(value, pk)`` for a cursor token, or None if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        value, pk = json.loads(raw)
+        return value, int(pk)
+    except (binascii.Error, ValueError, TypeError):
+        return None
+
+
+def key_field(queryset, field):
+    """The model field or annotation output field that ``field`` orders ``queryset`` by."""
+    annotation = queryset.query.annotations.get(field)
+    if annotation is not None:
+        return annotation.output_field
+    return queryset.model._meta.get_field(field)
+
+
+def paginate_keyset(queryset, field, cursor=None, page_size=25, descending=True):
+    """
+    Return ``(rows, next_cursor)`` for the page of ``queryset`` after ``cursor``.
+
+    ``next_cursor`` is None on the last page.
+    """
+    direction = '-' if descending else ''
+    queryset = queryset.order_by(f'{direction}{field}', f'{direction}id')
+
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        value, pk = position
+        lookup = 'lt' if descending else 'gt'
+        try:
+            value = key_field(queryset, field).to_python(value)
+            queryset = queryset.filter(
+                Q(**{f'{field}__{lookup}': value}) | Q(**{field: value, f'id__{lookup}': pk})
+            )
+        except (ValidationError, ValueError, TypeError):
+            # A well-formed token with a value that doesn't fit the key: start from the top
+            pass
+
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, field), last.pk)
+
+
+class KeysetPaginationMixin:
+    """
+    ``ListView`` mixin replacing the object list with one keyset page.
+
+    Subclasses set ``keyset_field`` and ``partial_template_name`` (the rows
+    plus the infinite-scroll trigger) and may override ``get_keyset_field``
+    and ``get_keyset_descending``, e.g. to page by a search rank annotation.
+    """
+    keyset_field = 'created_at'
+    keyset_descending = True
+    page_size = 25
+    partial_template_name = None
+
+    def get_keyset_field(self):
+        return self.keyset_field
+
+    def get_keyset_descending(self):
+        return self.keyset_descending
+
+    @property
+    def cursor(self):
+        return self.request.GET.get(CURSOR_PARAM)
+
+    def get_next_page_url(self, next_cursor):
+        params = self.request.GET.copy()
+        params[CURSOR_PARAM] = next_cursor
+        return f"{self.request.path}?{params.urlencode()}"
+
+    def get_context_data(self, **kwargs):
+        rows, next_cursor = paginate_keyset(
+            self.object_list,
+            self.get_keyset_field(),
+            cursor=self.cursor,
+            page_size=self.page_size,
+            descending=self.get_keyset_descending(),
+        )
+        context = super().get_context_data(object_list=rows, **kwargs)
+        context['next_page_url'] = self.get_next_page_url(next_cursor) if next_cursor else None
+        context['is_first_page'] = not self.cursor
+        return context
+
+    def get_template_names(self):
+        if self.cursor and getattr(self.request, 'htmx', False) and self.partial_template_name:
+            return [self.partial_template_name]
+        return super().get_template_names()
@@ -0,0 +1,97 @@
+"""
+Resume file helpers.
+
+Extracting text from a PDF is by far the most expensive step of resume
+matching, so extracted text is cached in ``ResumeText`` keyed by the SHA-256
+of the file bytes. A resume is parsed once, at upload time, and every later
+re-analysis, re-scoring or duplicate upload is served from the cache.
+"""
+import hashlib
+import logging
+
+from .instrumentation import timed
+from .models import ResumeText
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+@timed('pdf_extraction')
+def extract_pdf_text(fileobj):
+    """Extract the text of every page of a PDF file object."""
+    import pypdf
+
+    reader = pypdf.PdfReader(fileobj)
+    return "\n".join(page.extract_text() or '' for page in reader.pages)
+
+
+def safe_extract_pdf_text(fileobj):
+    """Like ``extract_pdf_text`` but returns '' for unreadable files."""
+    try:
+        return extract_pdf_text(fileobj)
+    except ImportError:
+        logger.error("pypdf not installed")
+    except Exception as e:
+        logger.warning("PDF read error: %s", e)
+    return ''
+
+
+def hash_file(fileobj):
+    """SHA-256 hex digest of a file object, read in chunks from the start."""
+    digest = hashlib.sha256()
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def store_resume_text(sha256, text):
+    """Cache extracted text (and its term vector) under the file hash."""
+    from .matching import document_vector
+
+    entry, created = ResumeText.objects.get_or_create(
+        sha256=sha256,
+        defaults={'text': text, 'vector': document_vector(text)},
+    )
+    return entry
+
+
+def cached_resume(candidate, sha256=None):
+    """
+    Return the ``ResumeText`` entry for a candidate's resume, extracting it on
+    a cache miss and linking it to the candidate. Returns None if the
+    candidate has no resume file.
+
+    ``sha256`` is the file's hash when already known, e.g. from the upload.
+    """
+    if candidate.resume_text_id:
+        return candidate.resume_text
+    if not candidate.resume_file:
+        return None
+
+    try:
+        with candidate.resume_file.open('rb') as fileobj:
+            sha256 = sha256 or hash_file(fileobj)
+            entry = ResumeText.objects.filter(sha256=sha256).first()
+            if entry is None:
+                entry = store_resume_text(sha256, safe_extract_pdf_text(fileobj))
+    except OSError as e:
+        logger.warning("Cannot open resume of candidate %s: %s", candidate.pk, e)
+        return None
+
+    candidate.resume_text = entry
+    candidate.save(update_fields=['resume_text'])
+    return entry
+
+
+def read_resume_text(candidate):
+    """
+    Return the plain text of a candidate's uploaded resume.
+
+    Returns an empty string when there is no resume or it cannot be parsed,
+    so callers can treat "no text" uniformly.
+    """
+    entry = cached_resume(candidate)
+    return entry.text if entry else ''
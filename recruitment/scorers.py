@@ -0,0 +1,143 @@
+"""
+Interchangeable resume scorers.
+
+A scorer rates a batch of resume texts against one job's requirements. The
+batch stands in for the job's applicant pool: scorers that need corpus
+statistics (IDF, average length) take them from it, as the per-job term
+index does in production. Scores run from 0 to 100, higher is better.
+
+Registered scorers, by name:
+
+* ``vsm``: cosine of raw word counts, the original inline fallback.
+* ``tfidf``: the lnc.ltc scheme ``recruitment.matching`` runs in production.
+* ``bm25``: Okapi BM25 over the requirement terms, scaled to the batch's best.
+* ``llm``: Gemini through the cached ``ai`` client, one request per resume.
+
+``manage.py benchmark_scorers`` compares them on a synthetic corpus (see
+``recruitment.scoring_benchmark``).
+"""
+import math
+from collections import Counter
+from typing import Protocol, Sequence
+
+from . import ai, matching
+from .models import JobTermIndex
+
+_registry = {}
+
+
+class Scorer(Protocol):
+    name: str
+
+    def available(self) -> bool:
+        """Whether the scorer can run here (e.g. has its API key)."""
+
+    def score(self, resumes: Sequence[str], requirements: str) -> list[float]:
+        """Score every resume text against ``requirements``."""
+
+
+def register(cls):
+    """Register an instance of the scorer class ``cls`` under ``cls.name``."""
+    _registry[cls.name] = cls()
+    return cls
+
+
+def get_scorer(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"{name} is not a registered scorer") from None
+
+
+def scorer_names():
+    return sorted(_registry)
+
+
+@register
+class VectorSpaceScorer:
+    name = 'vsm'
+
+    def available(self):
+        return True
+
+    def score(self, resumes, requirements):
+        query = Counter(matching.TOKEN_RE.findall(requirements.lower()))
+        query_norm = math.sqrt(sum(c * c for c in query.values()))
+        scores = []
+        for text in resumes:
+            document = Counter(matching.TOKEN_RE.findall(text.lower()))
+            norm = math.sqrt(sum(c * c for c in document.values())) * query_norm
+            if len(document) < matching.MIN_RESUME_TERMS or not norm:
+                scores.append(0.0)
+                continue
+            dot = sum(count * document[term] for term, count in query.items())
+            scores.append(matching.similarity_to_score(dot / norm))
+        return scores
+
+
+@register
+class TfidfScorer:
+    name = 'tfidf'
+
+    def available(self):
+        return True
+
+    def score(self, resumes, requirements):
+        vectors = [matching.document_vector(text) for text in resumes]
+        frequencies = Counter()
+        for vector in vectors:
+            frequencies.update(vector.keys())
+        # An unsaved index with the batch's statistics, as rebuild_term_index would store
+        index = JobTermIndex(
+            requirements_terms=matching.term_counts(requirements),
+            document_frequencies=frequencies,
+            document_count=sum(1 for vector in vectors if vector),
+        )
+        query = matching.query_vector(index)
+        return [matching.score_vector(vector, query)[0] for vector in vectors]
+
+
+@register
+class BM25Scorer:
+    name = 'bm25'
+    k1 = 1.2
+    b = 0.75
+
+    def available(self):
+        return True
+
+    def score(self, resumes, requirements):
+        query = matching.term_counts(requirements)
+        documents = [Counter(matching.tokenize(text)) for text in resumes]
+        lengths = [sum(document.values()) for document in documents]
+        average_length = (sum(lengths) / len(lengths)) if lengths else 0.0
+        frequencies = Counter(term for document in documents for term in query if term in document)
+        count = len(documents)
+        weights = {
+            term: math.log(1 + (count - frequencies[term] + 0.5) / (frequencies[term] + 0.5)) for term in query
+        }
+
+        raw = []
+        for document, length in zip(documents, lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / average_length) if average_length else self.k1
+            raw.append(sum(
+                weight * document[term] * (self.k1 + 1) / (document[term] + norm)
+                for term, weight in weights.items() if term in document
+            ))
+        # BM25 is unbounded; the batch's best match gets the top local score
+        best = max(raw, default=0.0)
+        return [round(matching.MAX_SCORE * value / best, 1) if best else 0.0 for value in raw]
+
+
+@register
+class GeminiScorer:
+    name = 'llm'
+
+    def available(self):
+        return bool(ai.gemini_api_key())
+
+    def score(self, resumes, requirements):
+        return [
+            ai.parse_analysis(ai.generate_content_cached(ai.analysis_prompt(requirements, text)))[0]
+            for text in resumes
+        ]
@@ -0,0 +1,167 @@
+"""
+Benchmark and accuracy harness for the scorers in ``recruitment.scorers``.
+
+``synthetic_corpus`` builds a reproducible set of jobs and resumes, each
+written for one of a handful of roles, so every (job, resume) pair has a
+known label: relevant when the roles agree. ``run`` scores every job's
+requirements against all the resumes with each scorer and reports:
+
+* throughput in resumes per second and p50/p99 latency per job batch;
+* peak Python memory while scoring one batch (``tracemalloc``);
+* precision@k against the role labels;
+* rank agreement with a reference scorer: the mean Spearman correlation of
+  the two rankings and the overlap of their top k.
+
+Nothing touches the database; ``manage.py benchmark_scorers`` prints the report.
+"""
+import math
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from .scorers import get_scorer
+
+ROLE_SKILLS = {
+    'backend': [
+        'python', 'django', 'postgresql', 'rest', 'api', 'redis', 'celery', 'sql', 'microservices',
+        'flask', 'orm', 'caching', 'queues', 'testing', 'linux',
+    ],
+    'frontend': [
+        'javascript', 'typescript', 'react', 'css', 'html', 'webpack', 'accessibility', 'redux',
+        'vue', 'responsive', 'browser', 'components', 'storybook', 'jest', 'tailwind',
+    ],
+    'data': [
+        'pandas', 'numpy', 'statistics', 'regression', 'sql', 'spark', 'airflow', 'dashboards',
+        'machine', 'learning', 'forecasting', 'python', 'etl', 'warehouse', 'experiments',
+    ],
+    'devops': [
+        'kubernetes', 'docker', 'terraform', 'aws', 'monitoring', 'prometheus', 'linux', 'ansible',
+        'ci', 'pipelines', 'networking', 'helm', 'incident', 'observability', 'bash',
+    ],
+    'design': [
+        'figma', 'photoshop', 'illustrator', 'branding', 'typography', 'wireframes', 'prototyping',
+        'research', 'usability', 'accessibility', 'layout', 'colour', 'sketch', 'portfolio', 'motion',
+    ],
+    'mobile': [
+        'swift', 'kotlin', 'android', 'ios', 'flutter', 'xcode', 'gradle', 'push', 'notifications',
+        'offline', 'store', 'react', 'native', 'animations', 'testing',
+    ],
+}
+
+FILLER = [
+    'team', 'projects', 'delivered', 'worked', 'company', 'customers', 'collaborated', 'years',
+    'experience', 'led', 'improved', 'built', 'responsible', 'stakeholders', 'product', 'quality',
+    'agile', 'communication', 'mentored', 'launched', 'growth', 'clients', 'remote', 'startup',
+]
+
+REFERENCE = 'tfidf'
+TOP_K = 10
+
+
+@dataclass
+class Corpus:
+    jobs: list        # [(role, requirements)]
+    resumes: list     # [(role, text)]
+
+
+@dataclass
+class Result:
+    scorer: str
+    throughput: float = 0.0
+    p50_ms: float = 0.0
+    p99_ms: float = 0.0
+    peak_kib: float = 0.0
+    precision: float = 0.0
+    spearman: float = 1.0
+    overlap: float = 1.0
+    rankings: list = field(default_factory=list, repr=False)
+
+
+def synthetic_corpus(resumes=1000, jobs=20, seed=0):
+    """Jobs and resumes for random roles; resumes mix in off-role skills and filler."""
+    rng = random.Random(seed)
+    roles = sorted(ROLE_SKILLS)
+    other_skills = {role: [s for r in roles if r != role for s in ROLE_SKILLS[r]] for role in roles}
+
+    job_rows = []
+    for n in range(jobs):
+        role = roles[n % len(roles)]
+        words = rng.sample(ROLE_SKILLS[role], 8) + rng.sample(FILLER, 3)
+        job_rows.append((role, ' '.join(words)))
+
+    resume_rows = []
+    for _ in range(resumes):
+        role = rng.choice(roles)
+        words = (
+            rng.choices(ROLE_SKILLS[role], k=rng.randint(1, 8))
+            + rng.choices(other_skills[role], k=rng.randint(0, 16))
+            + rng.choices(FILLER, k=rng.randint(30, 150))
+        )
+        rng.shuffle(words)
+        resume_rows.append((role, ' '.join(words)))
+    return Corpus(jobs=job_rows, resumes=resume_rows)
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+def ranking(scores):
+    """Resume indexes, best score first (ties by index)."""
+    return sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+
+
+def spearman(first, second):
+    """Spearman correlation of two rankings of the same items."""
+    count = len(first)
+    if count < 2:
+        return 1.0
+    position = {item: n for n, item in enumerate(second)}
+    squared = sum((n - position[item]) ** 2 for n, item in enumerate(first))
+    return 1 - 6 * squared / (count * (count * count - 1))
+
+
+def measure(name, corpus, top_k=TOP_K):
+    """Score the corpus with one scorer and fill in everything but the agreement columns."""
+    scorer = get_scorer(name)
+    top_k = min(top_k, len(corpus.resumes))
+    texts = [text for role, text in corpus.resumes]
+    result = Result(scorer=name)
+
+    latencies, hits = [], 0
+    for role, requirements in corpus.jobs:
+        started = time.perf_counter()
+        scores = scorer.score(texts, requirements)
+        latencies.append(time.perf_counter() - started)
+        order = ranking(scores)
+        result.rankings.append(order)
+        hits += sum(1 for i in order[:top_k] if corpus.resumes[i][0] == role)
+
+    tracemalloc.start()
+    try:
+        scorer.score(texts, corpus.jobs[0][1])
+        result.peak_kib = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+    total = sum(latencies)
+    result.throughput = len(texts) * len(corpus.jobs) / total if total else 0.0
+    result.p50_ms = percentile(latencies, 0.50) * 1000
+    result.p99_ms = percentile(latencies, 0.99) * 1000
+    result.precision = hits / (top_k * len(corpus.jobs))
+    return result
+
+
+def run(names, corpus, reference=REFERENCE, top_k=TOP_K):
+    """``Result``s for the scorers in ``names``, with rank agreement against ``reference``."""
+    top_k = min(top_k, len(corpus.resumes))
+    results = {name: measure(name, corpus, top_k) for name in dict.fromkeys([reference, *names])}
+    baseline = results[reference].rankings
+    for result in results.values():
+        pairs = list(zip(result.rankings, baseline))
+        result.spearman = sum(spearman(mine, theirs) for mine, theirs in pairs) / len(pairs)
+        result.overlap = sum(len(set(mine[:top_k]) & set(theirs[:top_k])) / top_k for mine, theirs in pairs) / len(pairs)
+    return [results[name] for name in names]
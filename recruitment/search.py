@@ -0,0 +1,218 @@
+"""
+Full-text search over jobs for the public board and over resumes for recruiters.
+
+Each index lives in the database and is kept in sync by the database itself,
+so every write path (views, admin, bulk updates) is covered:
+
+* SQLite: an FTS5 table ``recruitment_job_fts`` with external content on
+  ``recruitment_job``, maintained by triggers and ranked with BM25.
+* PostgreSQL: a stored generated ``tsvector`` column ``search_vector`` with a
+  GIN index, ranked with ``ts_rank``.
+* Anything else falls back to ``icontains`` matching without ranking.
+
+The job index is created by migration ``0012_job_search`` and the resume
+index by ``0013_resume_search``; each keeps its own copy of the SQL, so
+changing an index means a new migration. On SQLite, a later migration that
+makes Django rebuild ``recruitment_job`` or ``recruitment_candidate`` drops the
+triggers with the old table and must create them again itself.
+
+Resumes are indexed per application, so results come back as candidate IDs
+and scoping to one recruiter is a plain ``job__recruiter`` filter. On SQLite
+``recruitment_resume_fts`` is a contentless FTS5 table keyed by candidate id
+and filled by triggers on ``recruitment_candidate`` when an application is
+linked to its extracted ``ResumeText`` (the ``index_application`` task queued
+at upload). It relies on ``ResumeText.text`` never changing once stored. On
+PostgreSQL ``recruitment_resumetext`` gets its own ``search_vector``.
+
+For jobs, titles weigh most, then location and requirements, then the description.
+The title/location facet lists used by the board's filters are cached under
+the job board's version (see ``board_cache``), so a job change drops them. Like
+the board, they are only dropped in every process at once with a shared
+default cache; with the per-process one they are kept for at most
+``JOB_BOARD_LOCAL_CACHE_TIMEOUT`` seconds.
+"""
+import functools
+import operator
+import re
+
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import BooleanField, Count, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from . import board_cache
+from .models import Candidate, Job
+
+FTS_TABLE = 'recruitment_job_fts'
+RESUME_FTS_TABLE = 'recruitment_resume_fts'
+FACETS_CACHE_KEY = 'search:job-facets'
+FACETS_TIMEOUT = 60 * 60
+
+TOKEN_RE = re.compile(r'\w+')
+# A quoted phrase (optionally negated with a leading -) or a bare word
+QUERY_RE = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+
+# bm25() column weights, in FTS column order
+SQLITE_WEIGHTS = (10.0, 1.0, 3.0, 3.0)
+
+
+def fts_query(text):
+    """
+    Turn free text into an FTS5 job query: every word must match, as a prefix.
+
+    Quoting each token keeps user input from being parsed as FTS5 syntax.
+    Returns None when ``text`` has no words.
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    return ' '.join(f'"{token}"*' for token in tokens) or None
+
+
+def search_jobs(queryset, text):
+    """
+    Filter a ``Job`` queryset to matches for ``text`` and annotate ``search_rank``.
+
+    A higher ``search_rank`` is a better match; order by ``-search_rank``.
+    """
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        query = fts_query(text)
+        if query is None:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        weights = ', '.join(str(w) for w in SQLITE_WEIGHTS)
+        return queryset.filter(
+            id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (query,)),
+        ).annotate(search_rank=RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = recruitment_job.id",
+            (query,), output_field=FloatField(),
+        ))
+    if vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        return queryset.alias(search_match=RawSQL(
+            f"recruitment_job.search_vector @@ {tsquery}", (text,), output_field=BooleanField(),
+        )).filter(search_match=True).annotate(search_rank=RawSQL(
+            f"ts_rank(recruitment_job.search_vector, {tsquery})", (text,), output_field=FloatField(),
+        ))
+
+    for token in TOKEN_RE.findall(text):
+        queryset = queryset.filter(
+            Q(title__icontains=token) | Q(description__icontains=token)
+            | Q(requirements__icontains=token) | Q(location__icontains=token)
+        )
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def parse_resume_query(text):
+    """
+    Split a resume search into ``(groups, excluded)``.
+
+    Words and ``"quoted phrases"`` must all match (AND), ``OR`` between two of
+    them makes either do, and ``-word``/``NOT word`` excludes resumes that
+    contain it. A trailing ``*`` matches a prefix. ``groups`` is a list of
+    OR-ed alternatives, each a ``(tokens, prefix)`` phrase; ``excluded`` is a
+    list of phrases.
+    """
+    groups, excluded = [], []
+    either = negate = False
+    for match in QUERY_RE.finditer(text):
+        sign, quoted, word = match.groups()
+        if word in ('OR', 'AND', 'NOT'):
+            either, negate = word == 'OR' and bool(groups), word == 'NOT'
+            continue
+        if word is not None and word.startswith('-'):
+            sign, word = '-', word[1:]
+        source = quoted if quoted is not None else word
+        tokens = tuple(TOKEN_RE.findall(source.lower()))
+        if not tokens:
+            continue
+        phrase = (tokens, quoted is None and source.endswith('*'))
+        if sign or negate:
+            excluded.append(phrase)
+        elif either:
+            groups[-1].append(phrase)
+        else:
+            groups.append([phrase])
+        either = negate = False
+    return groups, excluded
+
+
+def _fts_phrase(phrase):
+    tokens, prefix = phrase
+    return '"' + ' '.join(tokens) + '"' + ('*' if prefix else '')
+
+
+def _fts_any(phrases):
+    return '(' + ' OR '.join(_fts_phrase(p) for p in phrases) + ')'
+
+
+def _fts_candidates(query):
+    return RawSQL(
+        f"SELECT rowid FROM {RESUME_FTS_TABLE} WHERE {RESUME_FTS_TABLE} MATCH %s", (query,),
+    )
+
+
+def search_candidates(queryset, text):
+    """
+    Filter a ``Candidate`` queryset to resumes matching ``text`` and annotate ``search_rank``.
+
+    Scope the queryset first (e.g. ``job__recruiter=user``); the index itself
+    covers every candidate. See ``parse_resume_query`` for the syntax. A
+    higher ``search_rank`` is a better match; order by ``-search_rank``.
+    """
+    vendor = connections[queryset.db].vendor
+    groups, excluded = parse_resume_query(text)
+    if not groups and not excluded:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    if vendor == 'postgresql':
+        # websearch_to_tsquery reads the same syntax: "phrases", OR and -word
+        tsquery = "websearch_to_tsquery('english', %s)"
+        return queryset.filter(resume_text_id__in=RawSQL(
+            f"SELECT sha256 FROM recruitment_resumetext WHERE search_vector @@ {tsquery}", (text,),
+        )).annotate(search_rank=RawSQL(
+            f"SELECT ts_rank(search_vector, {tsquery}) FROM recruitment_resumetext "
+            "WHERE sha256 = recruitment_candidate.resume_text_id",
+            (text,), output_field=FloatField(),
+        ))
+
+    if vendor == 'sqlite':
+        if excluded:
+            queryset = queryset.exclude(id__in=_fts_candidates(_fts_any(excluded)))
+        if not groups:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        query = ' AND '.join(_fts_any(group) for group in groups)
+        return queryset.filter(id__in=_fts_candidates(query)).annotate(search_rank=RawSQL(
+            f"SELECT -bm25({RESUME_FTS_TABLE}) FROM {RESUME_FTS_TABLE} "
+            f"WHERE {RESUME_FTS_TABLE} MATCH %s AND rowid = recruitment_candidate.id",
+            (query,), output_field=FloatField(),
+        ))
+
+    def contains(phrase):
+        return Q(resume_text__text__icontains=' '.join(phrase[0]))
+
+    for group in groups:
+        queryset = queryset.filter(functools.reduce(operator.or_, map(contains, group)))
+    for phrase in excluded:
+        queryset = queryset.exclude(contains(phrase))
+    return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def ranked_candidate_ids(recruiter, text, limit=None):
+    """IDs of ``recruiter``'s candidates whose resumes match ``text``, best match first."""
+    queryset = search_candidates(Candidate.objects.filter(job__recruiter=recruiter), text)
+    ids = queryset.order_by('-search_rank', '-id').values_list('id', flat=True)
+    return list(ids[:limit] if limit is not None else ids)
+
+
+def job_facets():
+    """``{'titles': [(title, count)], 'locations': [(location, count)]}`` for the board's filters."""
+    # Keyed by the board version, so a job change drops them along with the cached board pages
+    key = f'{FACETS_CACHE_KEY}:{board_cache.version()}'
+    facets = cache.get(key)
+    if facets is None:
+        facets = {
+            'titles': list(Job.objects.values_list('title').annotate(n=Count('id')).order_by('title')),
+            'locations': list(Job.objects.values_list('location').annotate(n=Count('id')).order_by('location')),
+        }
+        cache.set(key, facets, board_cache.bounded_timeout(FACETS_TIMEOUT))
+    return facets
@@ -0,0 +1,191 @@
+"""
+Many-to-many resume/job similarity.
+
+``matching`` scores one job's applicants against that job. This module scores
+a whole set of resumes against a whole set of jobs in one go, e.g. to suggest
+the other openings a candidate fits.
+
+Resumes use their stored ``resume_vector`` (L2-normalised ``1 + log(tf)``).
+Each job's requirements are weighted ``(1 + log(tf)) * idf``, with the IDF
+taken over the requirements of the jobs being compared, and L2-normalised.
+The similarity of resume ``i`` and job ``j`` is then the dot product of the
+two, i.e. row ``i``, column ``j`` of ``R @ Q.T``.
+
+With NumPy and SciPy installed, ``R`` and ``Q`` are CSR matrices and the
+whole matrix is one sparse product (10k resumes x 500 jobs in a few
+seconds). Without them the product is computed in pure Python through an
+inverted index of the job terms, which is fine for one candidate at a time.
+
+Suggestions on the candidate page score one resume against every job. The
+jobs' side (``board_matrix``, IDF taken over all jobs) is built once per
+process and kept until a job changes, so a page view only pays for one row.
+"""
+import heapq
+import math
+import time
+from collections import Counter
+
+from . import board_cache
+from .matching import idf, similarity_to_score, term_counts
+from .models import Candidate, Job, JobTermIndex
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = sparse = None
+
+SUGGESTION_LIMIT = 5
+# Seconds the suggestions' job matrix is reused for at most, if no job changes
+MATRIX_MAX_AGE = 600
+
+# (board version, built at, (job ids, JobMatrix)) for suggest_jobs
+_board_matrix = None
+
+
+def vectorized():
+    """Whether the NumPy/SciPy implementation is available."""
+    return sparse is not None
+
+
+def requirement_vectors(requirements):
+    """IDF-weighted, L2-normalised vectors for a list of requirement term counts."""
+    frequencies = Counter()
+    for counts in requirements:
+        frequencies.update(counts.keys())
+    vectors = []
+    for counts in requirements:
+        weights = {
+            term: (1.0 + math.log(count)) * idf(frequencies[term], len(requirements))
+            for term, count in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        vectors.append({term: w / norm for term, w in weights.items()} if norm else {})
+    return vectors
+
+
+def _csr(vectors, vocabulary):
+    """A float32 CSR matrix with one row per sparse vector; terms outside ``vocabulary`` are dropped."""
+    indptr, indices, data = [0], [], []
+    for vector in vectors:
+        for term, weight in vector.items():
+            column = vocabulary.get(term)
+            if column is not None:
+                indices.append(column)
+                data.append(weight)
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(vectors), len(vocabulary)),
+    )
+
+
+class JobMatrix:
+    """Job vectors laid out for scoring resumes against them: a CSR matrix, or an inverted index."""
+
+    def __init__(self, job_vectors):
+        self.size = len(job_vectors)
+        # Only terms some job asks for can contribute to a score
+        self.vocabulary = {}
+        for vector in job_vectors:
+            for term in vector:
+                self.vocabulary.setdefault(term, len(self.vocabulary))
+
+        if vectorized():
+            self.matrix = _csr(job_vectors, self.vocabulary)
+            return
+        self.matrix = None
+        self.postings = {}
+        for column, vector in enumerate(job_vectors):
+            for term, weight in vector.items():
+                self.postings.setdefault(term, []).append((column, weight))
+
+    def similarities(self, resume_vectors):
+        """``len(resume_vectors) x size`` cosine similarities, as a NumPy array (or a list of lists)."""
+        if self.matrix is not None:
+            return (_csr(resume_vectors, self.vocabulary) @ self.matrix.T).toarray()
+        matrix = []
+        for vector in resume_vectors:
+            row = [0.0] * self.size
+            for term, weight in vector.items():
+                for column, job_weight in self.postings.get(term, ()):
+                    row[column] += weight * job_weight
+            matrix.append(row)
+        return matrix
+
+
+def similarity_matrix(resume_vectors, job_vectors):
+    """
+    Cosine similarities of every resume with every job, as a dense
+    ``len(resume_vectors) x len(job_vectors)`` NumPy array (a list of lists
+    without NumPy).
+    """
+    return JobMatrix(job_vectors).similarities(resume_vectors)
+
+
+def top_matches(matrix, limit):
+    """For each row, up to ``limit`` ``(column, similarity)`` pairs with a positive similarity, best first."""
+    if limit <= 0:
+        return [[] for _ in matrix]
+    if vectorized() and isinstance(matrix, np.ndarray):
+        if not matrix.shape[1]:
+            return [[] for _ in matrix]
+        limit = min(limit, matrix.shape[1])
+        best = np.argpartition(-matrix, limit - 1, axis=1)[:, :limit]
+        results = []
+        for row, columns in zip(matrix, best):
+            columns = columns[np.argsort(-row[columns], kind='stable')]
+            results.append([(int(c), float(row[c])) for c in columns if row[c] > 0])
+        return results
+    return [
+        [(c, s) for c, s in heapq.nlargest(limit, enumerate(row), key=lambda pair: pair[1]) if s > 0]
+        for row in matrix
+    ]
+
+
+def job_requirement_terms(jobs):
+    """Requirement term counts for ``jobs``, from their term indexes where they exist."""
+    indexed = dict(
+        JobTermIndex.objects.filter(job__in=[job.pk for job in jobs]).values_list('job_id', 'requirements_terms')
+    )
+    return [indexed[job.pk] if job.pk in indexed else term_counts(job.requirements) for job in jobs]
+
+
+def board_matrix():
+    """
+    ``(job ids, JobMatrix)`` for every job, built once per process and reused
+    until the job board's version changes (or, with a per-process cache, the
+    board's bounded timeout passes).
+    """
+    global _board_matrix
+    key = board_cache.version()
+    cached = _board_matrix
+    if cached and cached[0] == key and time.monotonic() - cached[1] < board_cache.bounded_timeout(MATRIX_MAX_AGE):
+        return cached[2]
+    jobs = list(Job.objects.only('id', 'requirements').order_by('id'))
+    built = ([job.pk for job in jobs], JobMatrix(requirement_vectors(job_requirement_terms(jobs))))
+    _board_matrix = (key, time.monotonic(), built)
+    return built
+
+
+def suggest_jobs(candidate, limit=SUGGESTION_LIMIT):
+    """
+    Other jobs ``candidate``'s resume fits, best first, as ``(job, score)``
+    with ``score`` on the same 0-95 scale as ``match_score``. Jobs the
+    candidate's email has already applied to are left out.
+
+    The resume is scored against the shared ``board_matrix``, so a page view
+    costs one sparse row product and two small queries, not a pass over every job.
+    """
+    vector = candidate.resume_vector or {}
+    if not vector:
+        return []
+    job_ids, matrix = board_matrix()
+    if not job_ids:
+        return []
+    applied = set(Candidate.objects.filter(email=candidate.email).values_list('job_id', flat=True))
+    # Enough extra columns that the jobs applied to can be dropped afterwards
+    best = top_matches(matrix.similarities([vector]), limit + len(applied))[0]
+    best = [(job_ids[column], similarity) for column, similarity in best if job_ids[column] not in applied][:limit]
+    jobs = Job.objects.only('id', 'title', 'location', 'requirements').in_bulk([job_id for job_id, _ in best])
+    return [(jobs[job_id], similarity_to_score(similarity)) for job_id, similarity in best if job_id in jobs]
@@ -0,0 +1,188 @@
+"""
+Denormalised per-recruiter dashboard counters.
+
+The dashboard used to COUNT the recruiter's jobs and candidates on every hit.
+``RecruiterStats`` keeps those numbers in one row per recruiter so the landing
+page renders from a single primary-key lookup. The row is adjusted by the
+signal handlers below, under a row lock, in the same transaction as the change
+that moves the numbers.
+
+A recruiter's row is built from scratch when their first job is created or
+the dashboard finds it missing. Writes that bypass signals (queryset
+``update()``/``bulk_update``, raw SQL) leave it stale until
+``manage.py rebuild_stats`` is run.
+"""
+import contextlib
+import contextvars
+
+from django.db import transaction
+from django.db.models import Count, Min
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Candidate, Interview, Job, RecruiterStats
+
+# Jobs being deleted in this context; their cascaded candidates and interviews
+# are accounted for in one step when the job itself is gone.
+_deleting_jobs = contextvars.ContextVar('deleting_jobs', default=frozenset())
+# Set while a bulk operation adjusts the counters itself, see ``suspended``.
+_suspended = contextvars.ContextVar('stats_suspended', default=False)
+
+
+@contextlib.contextmanager
+def suspended():
+    """Skip the per-row handlers; the caller ``adjust``s the counters for the whole batch."""
+    token = _suspended.set(True)
+    try:
+        yield
+    finally:
+        _suspended.reset(token)
+
+
+def status_counts(recruiter_id, **filters):
+    rows = (
+        Candidate.objects.filter(job__recruiter_id=recruiter_id, **filters)
+        .values_list('status').annotate(n=Count('id')).order_by()
+    )
+    return {status: n for status, n in rows}
+
+
+def interview_summary(recruiter_id):
+    """Return ``(next_interview_at, upcoming_interview_count)`` as of now."""
+    summary = Interview.objects.filter(
+        candidate__job__recruiter_id=recruiter_id, date__gte=timezone.now(),
+    ).aggregate(next_at=Min('date'), upcoming=Count('id'))
+    return summary['next_at'], summary['upcoming']
+
+
+def rebuild(recruiter_id):
+    """Recompute a recruiter's counters from the source tables."""
+    next_at, upcoming = interview_summary(recruiter_id)
+    stats, _ = RecruiterStats.objects.update_or_create(
+        recruiter_id=recruiter_id,
+        defaults={
+            'job_count': Job.objects.filter(recruiter_id=recruiter_id).count(),
+            'status_counts': status_counts(recruiter_id),
+            'next_interview_at': next_at,
+            'upcoming_interview_count': upcoming,
+        },
+    )
+    return stats
+
+
+def for_recruiter(user):
+    """The dashboard counters for ``user``, normally one primary-key lookup."""
+    stats = RecruiterStats.objects.filter(pk=user.pk).first()
+    if stats is None:
+        return rebuild(user.pk)
+    if stats.next_interview_at and stats.next_interview_at < timezone.now():
+        # The next interview has happened; nothing else changed what's upcoming.
+        stats.next_interview_at, stats.upcoming_interview_count = interview_summary(user.pk)
+        stats.save(update_fields=['next_interview_at', 'upcoming_interview_count', 'updated_at'])
+    return stats
+
+
+def adjust(recruiter_id, job_delta=0, status_deltas=None, interviews=False):
+    """Apply deltas to a recruiter's stats row under a row lock; False if it has no row yet."""
+    if recruiter_id is None:
+        return False
+    with transaction.atomic():
+        stats = RecruiterStats.objects.select_for_update().filter(pk=recruiter_id).first()
+        if stats is None:
+            # Built from scratch the next time it's read.
+            return False
+        stats.job_count = max(stats.job_count + job_delta, 0)
+        for status, delta in (status_deltas or {}).items():
+            count = stats.status_counts.get(status, 0) + delta
+            if count > 0:
+                stats.status_counts[status] = count
+            else:
+                stats.status_counts.pop(status, None)
+        if interviews:
+            stats.next_interview_at, stats.upcoming_interview_count = interview_summary(recruiter_id)
+        stats.save()
+    return True
+
+
+def _candidate_recruiter_id(candidate):
+    if Candidate.job.is_cached(candidate):
+        return candidate.job.recruiter_id
+    return Job.objects.filter(pk=candidate.job_id).values_list('recruiter_id', flat=True).first()
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, **kwargs):
+    if _suspended.get() or not created:
+        return
+    if not adjust(instance.recruiter_id, job_delta=1):
+        rebuild(instance.recruiter_id)
+
+
+@receiver(pre_delete, sender=Job)
+def job_deleting(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    instance._stats_status_counts = status_counts(instance.recruiter_id, job=instance)
+    _deleting_jobs.set(_deleting_jobs.get() | {instance.pk})
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    _deleting_jobs.set(_deleting_jobs.get() - {instance.pk})
+    removed = {status: -n for status, n in getattr(instance, '_stats_status_counts', {}).items()}
+    adjust(instance.recruiter_id, job_delta=-1, status_deltas=removed, interviews=True)
+
+
+@receiver(pre_save, sender=Candidate)
+def candidate_saving(sender, instance, update_fields=None, **kwargs):
+    if _suspended.get():
+        return
+    if instance.pk is None or (update_fields is not None and 'status' not in update_fields):
+        instance._stats_previous_status = None
+        return
+    instance._stats_previous_status = (
+        Candidate.objects.filter(pk=instance.pk).values_list('status', flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Candidate)
+def candidate_saved(sender, instance, created, **kwargs):
+    if _suspended.get():
+        return
+    previous = getattr(instance, '_stats_previous_status', None)
+    if created:
+        adjust(_candidate_recruiter_id(instance), status_deltas={instance.status: 1})
+    elif previous is not None and previous != instance.status:
+        adjust(_candidate_recruiter_id(instance), status_deltas={previous: -1, instance.status: 1})
+
+
+@receiver(post_delete, sender=Candidate)
+def candidate_deleted(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    if instance.job_id in _deleting_jobs.get():
+        return
+    adjust(_candidate_recruiter_id(instance), status_deltas={instance.status: -1})
+
+
+def _interview_recruiter(interview):
+    """Return ``(job_id, recruiter_id)`` for an interview's candidate."""
+    if Interview.candidate.is_cached(interview):
+        candidate = interview.candidate
+        return candidate.job_id, _candidate_recruiter_id(candidate)
+    row = Candidate.objects.filter(pk=interview.candidate_id).values_list('job_id', 'job__recruiter_id').first()
+    return row or (None, None)
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def interview_changed(sender, instance, **kwargs):
+    if _suspended.get():
+        return
+    job_id, recruiter_id = _interview_recruiter(instance)
+    if job_id in _deleting_jobs.get():
+        return
+    adjust(recruiter_id, interviews=True)
@@ -0,0 +1,342 @@
+"""
+Synthetic recruitment data for benchmarks, load tests and query tuning.
+
+``generate`` writes recruiters, applicants, interviewers, jobs, candidates,
+interviews and notifications, reproducibly for a given seed, in batches of
+``bulk_create`` so millions of rows take minutes rather than hours:
+
+* resumes are drawn from a pool of ``resume_pool`` generated texts (stored
+  once each as ``ResumeText``, as identical uploads are), mostly for the
+  role of the job applied to; the first ``pdfs`` candidates also get a
+  generated PDF file;
+* a few jobs draw most applications, and rows are spread over the last
+  ``days`` days in id order, like real traffic;
+* ``bulk_create`` skips model signals, so the dashboard counters, the job
+  term indexes and the job board cache are brought up to date once at the
+  end.
+
+The first recruiter is the hard-coded recruiter account the dashboard
+recognises, so the recruiter pages work against the generated data.
+``populate`` is a small ``generate`` for the journey benchmarks and
+``manage.py seed`` the command line entry point.
+"""
+import bisect
+import contextlib
+import hashlib
+import io
+import itertools
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from . import board_cache, stats
+from .matching import document_vector, term_counts
+from .models import Candidate, Interview, Interviewer, Job, JobTermIndex, Notification, ResumeText
+from .notifications import STATUS_MESSAGES, status_message
+from .scoring_benchmark import FILLER, ROLE_SKILLS
+
+RECRUITER_USERNAME = 'Thiruverakan6'
+
+ROLE_TITLES = {
+    'backend': ['Backend Engineer', 'Python Developer', 'API Engineer'],
+    'frontend': ['Frontend Engineer', 'React Developer', 'UI Engineer'],
+    'data': ['Data Analyst', 'Data Scientist', 'Analytics Engineer'],
+    'devops': ['DevOps Engineer', 'Site Reliability Engineer', 'Platform Engineer'],
+    'design': ['Product Designer', 'UX Designer', 'Graphic Designer'],
+    'mobile': ['iOS Developer', 'Android Developer', 'Mobile Engineer'],
+}
+LOCATIONS = ['Remote', 'London', 'Berlin', 'New York', 'Colombo', 'Singapore', 'Toronto', 'Bangalore']
+FIRST_NAMES = ['Ava', 'Ben', 'Chen', 'Dilan', 'Eva', 'Farah', 'Gus', 'Hana', 'Ivan', 'Jaya', 'Kofi', 'Lena']
+LAST_NAMES = ['Silva', 'Smith', 'Khan', 'Perera', 'Novak', 'Garcia', 'Okafor', 'Tanaka', 'Muller', 'Rossi']
+STATUS_WEIGHTS = {'APPLIED': 50, 'SHORTLISTED': 20, 'REJECTED': 25, 'HIRED': 5}
+WORK_PREFERENCES = ['REMOTE', 'ONSITE', 'HYBRID']
+INTERVIEWERS = ['Alice Johnson', 'Bob Smith', 'Charlie Brown', 'Dana White', 'Eli Cohen']
+
+
+@dataclass
+class Dataset:
+    recruiter: User
+    jobs: list = field(default_factory=list)           # ids
+    recruiter_jobs: list = field(default_factory=list)  # ids of the main recruiter's jobs
+    applicants: list = field(default_factory=list)     # user ids
+    candidates: list = field(default_factory=list)     # ids of the main recruiter's candidates
+    interviewers: list = field(default_factory=list)   # ids
+
+
+def make_pdf(text):
+    """Build a minimal single-page PDF whose extracted text is ``text``."""
+    lines = text.splitlines() or ['']
+    escaped = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in lines]
+    content = "BT /F1 11 Tf 50 750 Td 14 TL " + " ".join("(%s) '" % line for line in escaped) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        "<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content),
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(("%d 0 obj\n%s\nendobj\n" % (number, obj)).encode('latin-1'))
+    xref = out.tell()
+    out.write(("xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)).encode())
+    for offset in offsets:
+        out.write(("%010d 00000 n \n" % offset).encode())
+    out.write(("trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+               % (len(objects) + 1, xref)).encode())
+    return out.getvalue()
+
+
+def person_name(rng):
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def requirements_text(rng, role):
+    return ' '.join(rng.sample(ROLE_SKILLS[role], 8))
+
+
+def resume_text(rng, role, name):
+    """A resume for ``role``: its skills, some other roles' and filler, a dozen words a line."""
+    others = [skill for other in ROLE_SKILLS if other != role for skill in ROLE_SKILLS[other]]
+    words = (
+        rng.choices(ROLE_SKILLS[role], k=rng.randint(3, 10))
+        + rng.choices(others, k=rng.randint(0, 8))
+        + rng.choices(FILLER, k=rng.randint(30, 90))
+    )
+    rng.shuffle(words)
+    lines = [name] + [' '.join(words[i:i + 12]) for i in range(0, len(words), 12)]
+    return '\n'.join(lines)
+
+
+@dataclass
+class Summary:
+    counts: dict                                        # rows written, by model name
+    job_ids: list = field(default_factory=list)
+    applicant_ids: list = field(default_factory=list)
+
+
+@contextlib.contextmanager
+def explicit_created_at(*models):
+    """Let ``created_at`` be set by the caller rather than ``auto_now_add``, to backdate rows."""
+    fields = [model._meta.get_field('created_at') for model in models]
+    for f in fields:
+        f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f in fields:
+            f.auto_now_add = True
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate(recruiters=10, jobs=1000, candidates=100_000, applicants=1000, interview_rate=0.2,
+             notifications=100_000, pdfs=0, resume_pool=5000, days=365, batch_size=5000, seed=0,
+             progress=None):
+    """
+    Write a reproducible dataset and return its ``Summary``. ``progress(model
+    name, rows written so far)`` is called after every batch.
+    """
+    rng = random.Random(seed)
+    roles = sorted(ROLE_SKILLS)
+    password = make_password(None)
+    now = timezone.now()
+    start = now - timezone.timedelta(days=days)
+    span = (now - start).total_seconds()
+    report = progress or (lambda name, count: None)
+
+    def moment(n, total):
+        """The creation time of row ``n`` of ``total``, evenly spread with jitter, in id order."""
+        return start + timezone.timedelta(seconds=span * (n + rng.random()) / max(total, 1))
+
+    main, _ = User.objects.get_or_create(username=RECRUITER_USERNAME, defaults={'password': password})
+    others = User.objects.bulk_create(
+        User(username=f'recruiter-{seed}-{n}', password=password) for n in range(1, recruiters)
+    )
+    recruiter_ids = [main.pk] + [user.pk for user in others]
+    applicant_ids = []
+    for batch in _batches((
+        User(username=f'applicant-{seed}-{n}', email=f'applicant-{seed}-{n}@example.com', password=password)
+        for n in range(applicants)
+    ), batch_size):
+        applicant_ids += [user.pk for user in User.objects.bulk_create(batch)]
+        report('User', len(applicant_ids))
+    interviewers = Interviewer.objects.bulk_create(
+        Interviewer(name=name, specialization=rng.choice(['Technical', 'Culture', 'General']))
+        for name in INTERVIEWERS
+    )
+
+    # Resume pool: text, its term vector and the ResumeText it is stored under
+    pool = []
+    pool_by_role = {role: [] for role in roles}
+    for n in range(max(resume_pool, 1)):
+        role = roles[n % len(roles)]
+        text = resume_text(rng, role, person_name(rng))
+        pool.append((text, document_vector(text), hashlib.sha256(text.encode('utf-8')).hexdigest()))
+        pool_by_role[role].append(n)
+    for batch in _batches((ResumeText(sha256=sha, text=text, vector=vector) for text, vector, sha in pool), batch_size):
+        ResumeText.objects.bulk_create(batch, ignore_conflicts=True)
+
+    with explicit_created_at(Job, Candidate, Interview, Notification):
+        job_rows = []
+        for n in range(jobs):
+            role = roles[n % len(roles)]
+            job_rows.append(Job(
+                recruiter_id=recruiter_ids[n % len(recruiter_ids)],
+                title=rng.choice(ROLE_TITLES[role]),
+                description=f"We are hiring a {role} specialist to join a growing team. "
+                            + ' '.join(rng.choices(FILLER, k=20)),
+                requirements=requirements_text(rng, role),
+                location=rng.choice(LOCATIONS),
+                created_at=moment(n, jobs),
+            ))
+        job_ids = []
+        for batch in _batches(job_rows, batch_size):
+            job_ids += [job.pk for job in Job.objects.bulk_create(batch)]
+            report('Job', len(job_ids))
+        if not job_rows:
+            candidates = notifications = 0
+
+        # A few jobs draw most of the applications (Zipf-like popularity)
+        cumulative = list(itertools.accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(job_rows))))
+        # job index * pool size + pool index -> candidates, for the term indexes
+        applications = Counter()
+        pdf_texts = {}
+        statuses = list(STATUS_WEIGHTS)
+        weights = list(itertools.accumulate(STATUS_WEIGHTS.values()))
+
+        def candidate_rows():
+            for n in range(candidates):
+                job_index = bisect.bisect(cumulative, rng.random() * cumulative[-1])
+                job = job_rows[job_index]
+                role = roles[job_index % len(roles)]
+                # Resumes mostly fit the job they were sent to
+                entry = rng.choice(pool_by_role[role]) if rng.random() < 0.7 else rng.randrange(len(pool))
+                text, vector, sha256 = pool[entry]
+                status = statuses[bisect.bisect(weights, rng.random() * weights[-1])]
+                if status == 'APPLIED' and rng.random() < interview_rate:
+                    status = 'INTERVIEW_SCHEDULED'
+                applications[job_index * len(pool) + entry] += 1
+                candidate = Candidate(
+                    job=job,
+                    name=person_name(rng),
+                    email=f'candidate-{seed}-{n}@example.com',
+                    experience_years=rng.randint(0, 15),
+                    current_location=rng.choice(LOCATIONS),
+                    work_preference=rng.choice(WORK_PREFERENCES),
+                    status=status,
+                    resume_text_id=sha256,
+                    resume_vector=vector,
+                    created_at=max(moment(n, candidates), job.created_at),
+                )
+                if n < pdfs:
+                    content = make_pdf(text)
+                    candidate.resume_text_id = hashlib.sha256(content).hexdigest()
+                    pdf_texts[candidate.resume_text_id] = (text, vector)
+                    candidate.resume_file = default_storage.save(
+                        f'resumes/{candidate.resume_text_id[:16]}.pdf', ContentFile(content),
+                    )
+                yield candidate
+
+        written = interviews = 0
+        for batch in _batches(candidate_rows(), batch_size):
+            with transaction.atomic():
+                if pdf_texts:
+                    ResumeText.objects.bulk_create(
+                        (ResumeText(sha256=sha, text=text, vector=vector) for sha, (text, vector) in pdf_texts.items()),
+                        ignore_conflicts=True,
+                    )
+                    pdf_texts.clear()
+                batch = Candidate.objects.bulk_create(batch)
+                scheduled = Interview.objects.bulk_create(
+                    Interview(
+                        candidate=candidate, interviewer=rng.choice(interviewers),
+                        date=candidate.created_at + timezone.timedelta(days=rng.randint(3, 21), hours=rng.randint(0, 8)),
+                        created_at=candidate.created_at,
+                    )
+                    for candidate in batch if candidate.status == 'INTERVIEW_SCHEDULED'
+                )
+            written += len(batch)
+            interviews += len(scheduled)
+            report('Candidate', written)
+
+        sent = 0
+        announced = list(STATUS_MESSAGES)
+        notification_rows = (
+            Notification(
+                recipient_id=rng.choice(applicant_ids),
+                message=status_message(rng.choice(announced), rng.choice(job_rows).title),
+                is_read=rng.random() < 0.7,
+                created_at=moment(n, notifications),
+            )
+            for n in range(notifications if applicant_ids else 0)
+        )
+        for batch in _batches(notification_rows, batch_size):
+            sent += len(Notification.objects.bulk_create(batch))
+            report('Notification', sent)
+
+    # What the signal handlers and the indexing task would have done row by row
+    frequencies = [Counter() for _ in job_rows]
+    document_counts = [0] * len(job_rows)
+    for key, number in applications.items():
+        job_index, entry = divmod(key, len(pool))
+        document_counts[job_index] += number
+        for term in pool[entry][1]:
+            frequencies[job_index][term] += number
+    for batch in _batches((
+        JobTermIndex(
+            job=job, requirements_terms=term_counts(job.requirements),
+            document_frequencies=dict(frequencies[n]), document_count=document_counts[n],
+        )
+        for n, job in enumerate(job_rows)
+    ), batch_size):
+        JobTermIndex.objects.bulk_create(batch)
+    for recruiter_id in recruiter_ids:
+        stats.rebuild(recruiter_id)
+    board_cache.bump()
+
+    counts = {
+        'User': len(recruiter_ids) + len(applicant_ids), 'Interviewer': len(interviewers),
+        'ResumeText': len(pool), 'Job': len(job_ids), 'Candidate': written, 'Interview': interviews,
+        'Notification': sent,
+    }
+    return Summary(counts, job_ids, applicant_ids)
+
+
+def populate(recruiters=2, jobs=20, candidates=200, applicants=20, interview_rate=0.2, pdfs=True, seed=0):
+    """A small dataset for the journey benchmarks, as a ``Dataset``, with as many distinct resumes as candidates."""
+    summary = generate(
+        recruiters=recruiters, jobs=jobs, candidates=candidates, applicants=applicants,
+        interview_rate=interview_rate, notifications=0, pdfs=candidates if pdfs else 0,
+        resume_pool=candidates, days=30, seed=seed,
+    )
+    main = User.objects.get(username=RECRUITER_USERNAME)
+    recruiter_jobs = list(Job.objects.filter(pk__in=summary.job_ids, recruiter=main).values_list('pk', flat=True))
+    return Dataset(
+        recruiter=main,
+        jobs=summary.job_ids,
+        recruiter_jobs=recruiter_jobs,
+        applicants=summary.applicant_ids,
+        candidates=list(Candidate.objects.filter(job__in=recruiter_jobs).values_list('pk', flat=True)),
+        interviewers=list(Interviewer.objects.values_list('pk', flat=True)),
+    )
@@ -0,0 +1,133 @@
+"""
+A small pluggable background task queue.
+
+Slow work (mostly upstream Gemini calls) is wrapped in a ``@task`` function
+and handed to ``enqueue``, which records a ``Task`` row and passes it to the
+configured backend::
+
+    TASK_BACKEND = 'recruitment.tasks.DatabaseBackend'
+
+``DatabaseBackend`` leaves the task pending for ``manage.py run_tasks``
+workers to pick up, so it needs nothing beyond the database.
+``ImmediateBackend`` runs the task inline, which is handy in development and
+tests. Views return straight away and poll the ``Task`` row for the result.
+"""
+import logging
+import time
+import traceback
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = 'recruitment.tasks.DatabaseBackend'
+
+_registry = {}
+
+
+def task(func):
+    """Register ``func`` as a task that can be enqueued and run by a worker."""
+    func.task_name = f"{func.__module__}.{func.__qualname__}"
+    _registry[func.task_name] = func
+    return func
+
+
+def get_task_function(name):
+    if name not in _registry:
+        # Importing the module registers its tasks.
+        import_string(name)
+    try:
+        return _registry[name]
+    except KeyError:
+        raise LookupError(f"{name} is not a registered task") from None
+
+
+def run_task(task_obj):
+    """Execute a claimed task and store its result or error."""
+    try:
+        func = get_task_function(task_obj.name)
+        result = func(*task_obj.args, **task_obj.kwargs)
+    except Exception as e:
+        logger.exception("Task %s (%s) failed", task_obj.pk, task_obj.name)
+        task_obj.status = Task.FAILED
+        task_obj.error = f"{e}\n\n{traceback.format_exc()}"
+    else:
+        task_obj.status = Task.DONE
+        task_obj.result = result
+    task_obj.finished_at = timezone.now()
+    task_obj.save(update_fields=['status', 'result', 'error', 'finished_at'])
+    return task_obj
+
+
+class BaseBackend:
+    def enqueue(self, task_obj):
+        raise NotImplementedError
+
+
+class ImmediateBackend(BaseBackend):
+    """Run tasks synchronously in the calling process."""
+
+    def enqueue(self, task_obj):
+        task_obj.status = Task.RUNNING
+        task_obj.started_at = timezone.now()
+        task_obj.attempts += 1
+        task_obj.save(update_fields=['status', 'started_at', 'attempts'])
+        run_task(task_obj)
+
+
+class DatabaseBackend(BaseBackend):
+    """Leave tasks in the database for ``run_tasks`` workers."""
+
+    def enqueue(self, task_obj):
+        pass
+
+    def claim(self):
+        """Atomically claim the oldest pending task, or return None."""
+        for pk in Task.objects.filter(status=Task.PENDING).order_by('id').values_list('pk', flat=True)[:10]:
+            claimed = Task.objects.filter(pk=pk, status=Task.PENDING).update(
+                status=Task.RUNNING, started_at=timezone.now(),
+            )
+            if claimed:
+                task_obj = Task.objects.get(pk=pk)
+                task_obj.attempts += 1
+                task_obj.save(update_fields=['attempts'])
+                return task_obj
+        return None
+
+    def work(self, burst=False, sleep=1.0):
+        """Run pending tasks until interrupted, or until the queue is empty with ``burst``."""
+        processed = 0
+        while True:
+            task_obj = self.claim()
+            if task_obj is None:
+                if burst:
+                    return processed
+                time.sleep(sleep)
+                continue
+            run_task(task_obj)
+            processed += 1
+
+
+def get_backend():
+    return import_string(getattr(settings, 'TASK_BACKEND', DEFAULT_BACKEND))()
+
+
+def enqueue(func, *args, owner=None, **kwargs):
+    """
+    Queue ``func(*args, **kwargs)`` and return its ``Task`` row.
+
+    Arguments and the return value must be JSON serialisable. ``owner`` is the
+    user allowed to poll the task's status.
+    """
+    if getattr(func, 'task_name', None) not in _registry:
+        raise ValueError(f"{func!r} is not a registered task")
+    task_obj = Task.objects.create(name=func.task_name, args=list(args), kwargs=kwargs, owner=owner)
+    backend = get_backend()
+    # Let workers see the row only once the surrounding transaction commits.
+    transaction.on_commit(lambda: backend.enqueue(task_obj))
+    return task_obj
@@ -1,3 +1,1703 @@
-from django.test import TestCase
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import shutil
+import tempfile
+import threading
+import time
 
-# Create your tests here.
+from asgiref.sync import SyncToAsync, iscoroutinefunction, sync_to_async
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.handlers.asgi import ASGIHandler
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import (
+    ai, async_views, board_cache, gemini, instrumentation, journeys, matching, notifications, resumes, scorers,
+    scoring_benchmark, search, similarity, stats, synthetic, tasks, transitions,
+)
+from .pagination import decode_cursor, encode_cursor
+from .models import Candidate, Interview, Interviewer, Job, JobTermIndex, Notification, RecruiterStats, ResumeText, Task
+from .synthetic import make_pdf
+
+
+class MediaRootMixin:
+    """Run the test case against a throwaway MEDIA_ROOT."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls._media_root = tempfile.mkdtemp()
+        cls._media_override = override_settings(MEDIA_ROOT=cls._media_root)
+        cls._media_override.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls._media_override.disable()
+        shutil.rmtree(cls._media_root, ignore_errors=True)
+
+
+PYTHON_RESUME = "Senior Python developer with Django, PostgreSQL and REST API experience.\nLed a team of five."
+DESIGN_RESUME = "Graphic designer skilled in Photoshop, Illustrator and branding for retail clients."
+
+
+class MatchingTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL. REST API design.', location='Remote',
+        )
+
+    def _candidate(self, name, text):
+        candidate = Candidate.objects.create(job=self.job, name=name, email=f'{name}@example.com')
+        matching.index_candidate(candidate, text=text)
+        return candidate
+
+    def test_index_candidate_updates_document_frequencies(self):
+        self._candidate('alice', PYTHON_RESUME)
+        self._candidate('bob', DESIGN_RESUME)
+
+        index = JobTermIndex.objects.get(job=self.job)
+        self.assertEqual(index.document_count, 2)
+        self.assertEqual(index.document_frequencies['python'], 1)
+        self.assertEqual(index.document_frequencies['illustrator'], 1)
+        self.assertNotIn('and', index.document_frequencies)
+
+    def test_remove_candidate_reverses_indexing(self):
+        alice = self._candidate('alice', PYTHON_RESUME)
+        matching.remove_candidate(alice)
+
+        index = JobTermIndex.objects.get(job=self.job)
+        self.assertEqual(index.document_count, 0)
+        self.assertEqual(index.document_frequencies, {})
+
+    def test_matching_resume_scores_higher(self):
+        alice = self._candidate('alice', PYTHON_RESUME)
+        bob = self._candidate('bob', DESIGN_RESUME)
+
+        alice_score, analysis = matching.score_candidate(alice)
+        bob_score, _ = matching.score_candidate(bob)
+
+        self.assertGreater(alice_score, bob_score)
+        self.assertIn('python', analysis)
+
+    def test_short_resume_scores_zero(self):
+        candidate = self._candidate('carol', 'Hello')
+        self.assertEqual(matching.score_candidate(candidate)[0], 0.0)
+
+    def test_requirements_change_is_reflected(self):
+        alice = self._candidate('alice', PYTHON_RESUME)
+        before, _ = matching.score_candidate(alice)
+
+        self.job.requirements = 'Photoshop and Illustrator branding'
+        self.job.save()
+        matching.update_requirements(self.job)
+
+        after, _ = matching.score_candidate(alice)
+        self.assertLess(after, before)
+
+    def test_apply_indexes_uploaded_resume(self):
+        applicant = User.objects.create_user('applicant', password='pw')
+        self.client.force_login(applicant)
+        resume = SimpleUploadedFile('cv.pdf', make_pdf(PYTHON_RESUME), content_type='application/pdf')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('apply_job', args=[self.job.id]), {
+                'name': 'Applicant', 'email': 'applicant@example.com', 'resume': resume,
+                'experience_years': 4, 'current_location': 'Berlin', 'work_preference': 'REMOTE',
+            })
+
+        # Indexing is queued for a worker
+        candidate = Candidate.objects.get(email='applicant@example.com')
+        self.assertEqual(candidate.resume_vector, {})
+        self.assertEqual(tasks.DatabaseBackend().work(burst=True), 1)
+
+        candidate.refresh_from_db()
+        self.assertIn('django', candidate.resume_vector)
+        self.assertEqual(JobTermIndex.objects.get(job=self.job).document_count, 1)
+
+    def test_second_application_to_same_job_is_rejected(self):
+        applicant = User.objects.create_user('applicant', password='pw')
+        self.client.force_login(applicant)
+        for _ in range(2):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(reverse('apply_job', args=[self.job.id]), {
+                    'name': 'Applicant', 'email': 'applicant@example.com',
+                    'resume': SimpleUploadedFile('cv.pdf', make_pdf(PYTHON_RESUME), content_type='application/pdf'),
+                    'experience_years': 4, 'current_location': 'Berlin', 'work_preference': 'REMOTE',
+                })
+        tasks.DatabaseBackend().work(burst=True)
+
+        self.assertEqual(Candidate.objects.filter(job=self.job, email='applicant@example.com').count(), 1)
+        self.assertEqual(JobTermIndex.objects.get(job=self.job).document_count, 1)
+
+    def test_analyze_view_uses_term_index(self):
+        alice = self._candidate('alice', PYTHON_RESUME)
+        self.client.force_login(self.recruiter)
+
+        response = self.client.post(reverse('analyze_candidate', args=[alice.id]))
+
+        self.assertEqual(response.status_code, 200)
+        alice.refresh_from_db()
+        self.assertGreater(alice.match_score, 0)
+
+
+@override_settings(TASK_BACKEND='recruitment.tasks.ImmediateBackend', RESUME_MAX_UPLOAD_SIZE=64 * 1024)
+class ResumeUploadTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL.', location='Remote',
+        )
+        self.client.force_login(User.objects.create_user('applicant', password='pw'))
+
+    def _apply(self, content, email='applicant@example.com'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse('apply_job', args=[self.job.id]), {
+                'name': 'Applicant', 'email': email,
+                'resume': SimpleUploadedFile('cv.pdf', content, content_type='application/pdf'),
+                'experience_years': 4, 'current_location': 'Berlin', 'work_preference': 'REMOTE',
+            })
+
+    def test_pdf_is_stored_hashed_and_indexed(self):
+        content = make_pdf(PYTHON_RESUME)
+        self._apply(content)
+
+        candidate = Candidate.objects.get()
+        self.assertEqual(candidate.resume_text_id, hashlib.sha256(content).hexdigest())
+        self.assertIn('django', candidate.resume_vector)
+        with candidate.resume_file.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+
+    def test_same_resume_for_another_job_reuses_extracted_text(self):
+        content = make_pdf(PYTHON_RESUME)
+        self._apply(content)
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Django Developer', description='d', requirements='Django', location='Remote',
+        )
+        with mock.patch.object(resumes, 'safe_extract_pdf_text') as extract:
+            self._apply(content)
+
+        extract.assert_not_called()
+        self.assertEqual(ResumeText.objects.count(), 1)
+
+    def test_uploaded_resume_is_searchable_once_indexed(self):
+        self._apply(make_pdf(PYTHON_RESUME))
+
+        self.assertEqual(search.ranked_candidate_ids(self.recruiter, 'django'), [Candidate.objects.get().id])
+
+    def test_non_pdf_is_rejected(self):
+        response = self._apply(b'PK\x03\x04 a zipped .docx')
+
+        self.assertContains(response, 'as a PDF file')
+        self.assertFalse(Candidate.objects.exists())
+
+    def test_oversized_upload_is_rejected(self):
+        response = self._apply(b'%PDF-1.4\n' + b'0' * (128 * 1024))
+
+        self.assertContains(response, 'or smaller')
+        self.assertFalse(Candidate.objects.exists())
+
+
+class BulkScoringTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL. REST API design.', location='Remote',
+        )
+        for i, text in enumerate([PYTHON_RESUME, DESIGN_RESUME, PYTHON_RESUME]):
+            candidate = Candidate(job=self.job, name=f'c{i}', email=f'c{i}@example.com')
+            candidate.resume_file.save(f'c{i}.pdf', ContentFile(make_pdf(text)), save=False)
+            candidate.save()
+
+    def test_score_job_in_process(self):
+        self.assertEqual(matching.score_job(self.job, workers=1), 3)
+
+        scores = dict(Candidate.objects.values_list('name', 'match_score'))
+        self.assertGreater(scores['c0'], scores['c1'])
+        self.assertEqual(scores['c0'], scores['c2'])
+        self.assertEqual(JobTermIndex.objects.get(job=self.job).document_count, 3)
+
+    def test_score_job_with_process_pool_matches_serial(self):
+        matching.score_job(self.job, workers=1)
+        serial = dict(Candidate.objects.values_list('name', 'match_score'))
+
+        ResumeText.objects.all().delete()
+        Candidate.objects.update(resume_vector={})
+        matching.score_job(self.job, workers=2)
+        pooled = dict(Candidate.objects.values_list('name', 'match_score'))
+        self.assertEqual(serial, pooled)
+
+    def test_management_command(self):
+        out = io.StringIO()
+        call_command('score_candidates', str(self.job.id), '--workers', '1', stdout=out)
+        self.assertIn('scored 3 candidates', out.getvalue())
+        self.assertFalse(Candidate.objects.filter(ai_analysis__isnull=True).exists())
+
+    def test_job_detail_score_action_queues_a_task(self):
+        self.client.force_login(self.recruiter)
+        response = self.client.post(reverse('job_detail', args=[self.job.id]))
+        self.assertRedirects(response, reverse('job_detail', args=[self.job.id]))
+        # Nothing is scored in the request itself
+        self.assertEqual(Candidate.objects.filter(ai_analysis__isnull=True).count(), 3)
+
+        task_obj = Task.objects.get()
+        with self.settings(RESUME_SCORING_WORKERS=1):
+            result = tasks.get_task_function(task_obj.name)(*task_obj.args)
+        self.assertEqual(result, {'scored': 3})
+        self.assertFalse(Candidate.objects.filter(ai_analysis__isnull=True).exists())
+
+
+class ShortlistTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL. REST API design.', location='Remote',
+        )
+        self.client.force_login(self.recruiter)
+
+    def _candidate(self, name, text, **fields):
+        candidate = Candidate.objects.create(job=self.job, name=name, email=f'{name}@example.com', **fields)
+        matching.index_candidate(candidate, text=text)
+        return candidate
+
+    def _names(self, **params):
+        response = self.client.get(reverse('job_shortlist', args=[self.job.id]), params)
+        return [c.name for c in response.context['candidates']]
+
+    def test_missing_scores_are_filled_in_once(self):
+        self._candidate('python', PYTHON_RESUME)
+        self._candidate('design', DESIGN_RESUME)
+        Candidate.objects.create(job=self.job, name='pending', email='p@example.com', resume_file='resumes/p.pdf')
+
+        # Not indexed yet: listed, but not scored yet
+        self.assertEqual(self._names(), ['python', 'design', 'pending'])
+        self.assertEqual(matching.score_missing(self.job), 0)
+        self.assertTrue(Candidate.objects.get(name='pending').ai_analysis is None)
+
+    def test_unindexed_resumes_are_queued_for_indexing_once(self):
+        pending = Candidate.objects.create(job=self.job, name='legacy', email='l@example.com', resume_file='resumes/l.pdf')
+
+        matching.score_missing(self.job)
+        matching.score_missing(self.job)
+
+        task_obj = Task.objects.get()
+        self.assertEqual((task_obj.name, task_obj.args), (matching.index_application.task_name, [pending.id]))
+
+    @override_settings(TASK_BACKEND='recruitment.tasks.ImmediateBackend')
+    def test_unreadable_resumes_are_scored_instead_of_queued_again(self):
+        Candidate.objects.create(job=self.job, name='lost', email='l@example.com', resume_file='resumes/missing.pdf')
+
+        for _ in range(3):
+            with self.captureOnCommitCallbacks(execute=True):
+                self._names()
+
+        self.assertEqual(Task.objects.count(), 1)
+        candidate = Candidate.objects.get()
+        self.assertIsNotNone(candidate.resume_index_failed_at)
+        self.assertEqual(candidate.match_score, 0.0)
+        self.assertIsNotNone(candidate.ai_analysis)
+
+    def test_filters_and_limit(self):
+        self._candidate('senior', PYTHON_RESUME, experience_years=8, current_location='Berlin')
+        self._candidate('junior', PYTHON_RESUME + ' Junior.', experience_years=1, current_location='Berlin')
+        self._candidate('onsite', PYTHON_RESUME, experience_years=9, work_preference='ONSITE')
+
+        self.assertEqual(self._names(min_experience=5, work_preference='REMOTE'), ['senior'])
+        self.assertEqual(self._names(location='berlin', limit='x'), ['senior', 'junior'])
+        self.assertEqual(len(self._names(limit=1)), 1)
+
+    def test_other_recruiters_jobs_are_hidden(self):
+        self.client.force_login(User.objects.create_user('other'))
+        response = self.client.get(reverse('job_shortlist', args=[self.job.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class SimilarityTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.python_job = self._job('Python Developer', 'Python, Django and PostgreSQL. REST API design.')
+        self.django_job = self._job('Django Engineer', 'Django REST framework and PostgreSQL.')
+        self.design_job = self._job('Designer', 'Photoshop, Illustrator and branding.')
+
+    def _job(self, title, requirements):
+        return Job.objects.create(recruiter=self.recruiter, title=title, description='d', requirements=requirements, location='Remote')
+
+    def test_pure_python_fallback_matches_sparse_product(self):
+        resumes = [matching.document_vector(text) for text in (PYTHON_RESUME, DESIGN_RESUME, '')]
+        jobs = similarity.requirement_vectors(similarity.job_requirement_terms(Job.objects.order_by('id')))
+
+        with mock.patch.object(similarity, 'sparse', None):
+            fallback = similarity.similarity_matrix(resumes, jobs)
+            fallback_top = similarity.top_matches(fallback, 2)
+        if similarity.vectorized():
+            matrix = similarity.similarity_matrix(resumes, jobs)
+            for row, expected in zip(matrix.tolist(), fallback):
+                for value, other in zip(row, expected):
+                    self.assertAlmostEqual(value, other, places=5)
+            self.assertEqual(
+                [[c for c, _ in row] for row in similarity.top_matches(matrix, 2)],
+                [[c for c, _ in row] for row in fallback_top],
+            )
+        self.assertEqual([[c for c, _ in row] for row in fallback_top], [[0, 1], [2], []])
+
+    def test_suggestions_skip_jobs_already_applied_to(self):
+        candidate = Candidate.objects.create(job=self.python_job, name='Dev', email='dev@example.com')
+        matching.index_candidate(candidate, text=PYTHON_RESUME)
+
+        suggestions = similarity.suggest_jobs(candidate)
+        self.assertEqual([job for job, score in suggestions], [self.django_job])
+
+        self.client.force_login(self.recruiter)
+        response = self.client.get(reverse('candidate_detail', args=[candidate.id]))
+        self.assertContains(response, 'Also a Fit For')
+        self.assertContains(response, 'Django Engineer')
+
+    def test_job_matrix_is_reused_until_a_job_changes(self):
+        candidate = Candidate.objects.create(job=self.python_job, name='Dev', email='dev@example.com')
+        matching.index_candidate(candidate, text=PYTHON_RESUME)
+        similarity.suggest_jobs(candidate)
+
+        # Applications and the top jobs only; no pass over every job and its term index
+        with CaptureQueriesContext(connection) as ctx:
+            similarity.suggest_jobs(candidate)
+        self.assertEqual(len(ctx.captured_queries), 2)
+        self.assertFalse(any('recruitment_jobtermindex' in q['sql'] for q in ctx.captured_queries))
+
+        self._job('Backend Developer', 'Python and Django.')
+        self.assertIn('Backend Developer', [job.title for job, _ in similarity.suggest_jobs(candidate)])
+
+
+class ScorerTests(TestCase):
+    def test_registry(self):
+        self.assertEqual(scorers.scorer_names(), ['bm25', 'llm', 'tfidf', 'vsm'])
+        with self.assertRaises(LookupError):
+            scorers.get_scorer('word2vec')
+
+    def test_tfidf_scorer_matches_production_scoring(self):
+        recruiter = User.objects.create_user('recruiter')
+        job = Job.objects.create(recruiter=recruiter, title='Python Developer', description='d',
+                                 requirements='Python, Django and PostgreSQL. REST API design.', location='Remote')
+        texts = [PYTHON_RESUME, DESIGN_RESUME, PYTHON_RESUME + ' Also Kubernetes.']
+        for n, text in enumerate(texts):
+            matching.index_candidate(Candidate.objects.create(job=job, name=f'c{n}', email=f'c{n}@example.com'), text=text)
+        matching.score_job(job, workers=1)
+
+        production = list(Candidate.objects.order_by('name').values_list('match_score', flat=True))
+        self.assertEqual(scorers.get_scorer('tfidf').score(texts, job.requirements), production)
+
+    def test_every_scorer_ranks_the_relevant_resume_first(self):
+        with mock.patch.object(ai, 'generate_content_cached', side_effect=['SCORE: 90\nANALYSIS: ok', 'SCORE: 10']):
+            for name in scorers.scorer_names():
+                scores = scorers.get_scorer(name).score([PYTHON_RESUME, DESIGN_RESUME], 'Python, Django and PostgreSQL.')
+                self.assertGreater(scores[0], scores[1], name)
+
+    def test_benchmark_reports_accuracy_and_agreement(self):
+        corpus = scoring_benchmark.synthetic_corpus(resumes=60, jobs=6, seed=1)
+        results = scoring_benchmark.run(['vsm', 'tfidf'], corpus, top_k=5)
+
+        vsm, tfidf = results
+        self.assertEqual((tfidf.spearman, tfidf.overlap), (1.0, 1.0))
+        self.assertLess(vsm.spearman, 1.0)
+        self.assertGreater(tfidf.precision, 0.5)
+        self.assertGreater(tfidf.throughput, 0)
+
+        out = io.StringIO()
+        call_command('benchmark_scorers', '--resumes', '30', '--jobs', '2', stdout=out)
+        self.assertIn('bm25', out.getvalue())
+        self.assertNotIn('llm', out.getvalue())
+
+
+class ResumeTextCacheTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL.', location='Remote',
+        )
+
+    def _candidate(self, name, text):
+        candidate = Candidate(job=self.job, name=name, email=f'{name}@example.com')
+        candidate.resume_file.save(f'{name}.pdf', ContentFile(make_pdf(text)), save=False)
+        candidate.save()
+        return candidate
+
+    def test_text_is_extracted_once_per_content_hash(self):
+        first = self._candidate('alice', PYTHON_RESUME)
+        second = self._candidate('bob', PYTHON_RESUME)
+
+        with mock.patch.object(resumes, 'extract_pdf_text', wraps=resumes.extract_pdf_text) as extract:
+            self.assertIn('Django', resumes.read_resume_text(first))
+            self.assertIn('Django', resumes.read_resume_text(second))
+            resumes.read_resume_text(first)
+
+        self.assertEqual(extract.call_count, 1)
+        self.assertEqual(ResumeText.objects.count(), 1)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.resume_text_id, second.resume_text_id)
+
+    def test_reanalysis_does_not_touch_pypdf(self):
+        candidate = self._candidate('alice', PYTHON_RESUME)
+        matching.index_candidate(candidate)
+        self.client.force_login(self.recruiter)
+
+        with mock.patch.object(resumes, 'extract_pdf_text') as extract:
+            self.client.post(reverse('analyze_candidate', args=[candidate.id]))
+            matching.score_job(self.job, workers=1, reindex=True)
+
+        extract.assert_not_called()
+        candidate.refresh_from_db()
+        self.assertGreater(candidate.match_score, 0)
+
+
+@override_settings(GEMINI_API_KEY='test-key', TASK_BACKEND='recruitment.tasks.DatabaseBackend')
+class TaskQueueTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL.', location='Remote',
+        )
+        self.candidate = Candidate.objects.create(job=self.job, name='alice', email='alice@example.com')
+        matching.index_candidate(self.candidate, text=PYTHON_RESUME)
+        self.client.force_login(self.recruiter)
+        ai.response_cache().clear()
+
+    def test_analyze_returns_placeholder_and_worker_fills_result(self):
+        with mock.patch.object(ai, 'generate_content') as generate:
+            response = self.client.post(reverse('analyze_candidate', args=[self.candidate.id]))
+            generate.assert_not_called()
+
+            task = Task.objects.get()
+            self.assertEqual(task.status, Task.PENDING)
+            self.assertContains(response, reverse('analysis_status', args=[self.candidate.id, task.id]))
+
+            generate.return_value = "SCORE: 82\nANALYSIS: Strong Django background."
+            self.assertEqual(tasks.get_backend().work(burst=True), 1)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.DONE)
+        self.candidate.refresh_from_db()
+        self.assertEqual(self.candidate.match_score, 82.0)
+
+        response = self.client.get(reverse('analysis_status', args=[self.candidate.id, task.id]))
+        self.assertContains(response, 'Strong Django background.')
+        self.assertNotContains(response, 'hx-trigger="load delay:2s"')
+
+    def test_gemini_failure_falls_back_to_local_matching(self):
+        task = tasks.enqueue(ai.analyze_candidate, self.candidate.id)
+        with mock.patch.object(ai, 'generate_content', side_effect=RuntimeError('quota')):
+            tasks.get_backend().work(burst=True)
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, Task.DONE)
+        self.candidate.refresh_from_db()
+        self.assertIn('AI Semantic Analysis', self.candidate.ai_analysis)
+
+    def test_generate_description_is_queued_and_pollable(self):
+        response = self.client.post(reverse('generate_job_description'), {'title': 'Engineer', 'prompt': 'Go'})
+        self.assertEqual(response.status_code, 202)
+        status_url = response.json()['status_url']
+        self.assertEqual(self.client.get(status_url).json()['status'], Task.PENDING)
+
+        with mock.patch.object(ai, 'generate_content', return_value="Build things ||REQUIREMENTS|| - Go"):
+            tasks.get_backend().work(burst=True)
+
+        data = self.client.get(status_url).json()
+        self.assertEqual(data['status'], Task.DONE)
+        self.assertEqual(data['result'], {'description': 'Build things', 'requirements': '- Go'})
+
+    def test_task_status_is_private_to_owner(self):
+        task = tasks.enqueue(ai.generate_job_description, 'Engineer', '', owner=self.recruiter)
+        other = User.objects.create_user('other', password='pw')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(reverse('task_status', args=[task.id])).status_code, 404)
+
+    @override_settings(TASK_BACKEND='recruitment.tasks.ImmediateBackend')
+    def test_immediate_backend_runs_inline(self):
+        with mock.patch.object(ai, 'generate_content', return_value="Desc ||REQUIREMENTS|| Reqs"):
+            with self.captureOnCommitCallbacks(execute=True):
+                task = tasks.enqueue(ai.generate_job_description, 'Engineer', '')
+        task.refresh_from_db()
+        self.assertEqual(task.result['requirements'], 'Reqs')
+
+
+class FakeModel:
+    """Stands in for ``GenerativeModel``: raises or returns the queued ``replies`` in turn."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return mock.Mock(text=reply)
+
+
+@override_settings(GEMINI_API_KEY='test-key', AI_RETRY_ATTEMPTS=2, AI_RETRY_BACKOFF=0, AI_BREAKER_FAILURES=2)
+class GeminiClientTests(TestCase):
+    def setUp(self):
+        gemini.breaker.reset()
+        gemini.metrics.reset()
+        self.addCleanup(gemini.breaker.reset)
+
+    def _use(self, model):
+        patcher = mock.patch.object(gemini, 'get_model', return_value=model)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return model
+
+    def test_library_is_configured_once_per_process(self):
+        self.addCleanup(setattr, gemini, '_model', None)
+        gemini._model = None
+        with mock.patch('google.generativeai.configure') as configure, \
+                mock.patch('google.generativeai.GenerativeModel') as model_class:
+            model_class.return_value.generate_content.return_value.text = 'hi'
+            ai.generate_content('one')
+            ai.generate_content('two')
+        configure.assert_called_once_with(api_key='test-key')
+        model_class.assert_called_once_with(ai.GEMINI_MODEL)
+
+    def test_transient_errors_are_retried(self):
+        from google.api_core import exceptions
+
+        model = self._use(FakeModel(exceptions.ServiceUnavailable('busy'), TimeoutError(), 'answer'))
+        self.assertEqual(ai.generate_content('prompt'), 'answer')
+        self.assertEqual(model.calls, 3)
+        snapshot = gemini.metrics.snapshot()
+        self.assertEqual((snapshot['calls'], snapshot['retries'], snapshot['failures']), (1, 2, 0))
+        self.assertIsNotNone(snapshot['latency_p99'])
+
+    def test_other_errors_are_not_retried(self):
+        model = self._use(FakeModel(ValueError('bad request'), 'unused'))
+        with self.assertRaises(ValueError):
+            ai.generate_content('prompt')
+        self.assertEqual(model.calls, 1)
+
+    def test_bad_requests_do_not_open_the_breaker(self):
+        model = self._use(FakeModel(ValueError('blocked'), ValueError('blocked'), ValueError('blocked'), 'answer'))
+        for _ in range(3):
+            with self.assertRaises(ValueError):
+                ai.generate_content('prompt')
+
+        self.assertEqual(gemini.breaker.state, gemini.breaker.CLOSED)
+        self.assertEqual(ai.generate_content('prompt'), 'answer')
+        self.assertEqual((model.calls, gemini.metrics.snapshot()['failures']), (4, 3))
+
+    @override_settings(AI_RETRY_ATTEMPTS=0)
+    def test_breaker_opens_and_falls_back_to_local_scoring(self):
+        model = self._use(FakeModel(TimeoutError('down'), TimeoutError('down')))
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                ai.generate_content('prompt')
+
+        with self.assertRaises(gemini.GeminiUnavailable):
+            ai.generate_content('prompt')
+        self.assertEqual(model.calls, 2)
+        self.assertFalse(ai.gemini_enabled())
+
+        recruiter = User.objects.create_user('recruiter', password='pw')
+        job = Job.objects.create(recruiter=recruiter, title='Python Developer', description='d',
+                                 requirements='Python and Django', location='Remote')
+        candidate = Candidate.objects.create(job=job, name='Dev', email='dev@example.com')
+        self.client.force_login(recruiter)
+        self.client.post(reverse('analyze_candidate', args=[candidate.id]))
+        self.assertFalse(Task.objects.exists())
+        self.assertIsNotNone(Candidate.objects.get().ai_analysis)
+
+    @override_settings(AI_RETRY_BACKOFF=10, AI_RETRY_BACKOFF_MAX=10)
+    def test_cancelled_during_backoff_ends_the_half_open_trial(self):
+        from google.api_core import exceptions
+
+        class SlowModel:
+            async def generate_content_async(self, prompt):
+                raise exceptions.ServiceUnavailable('busy')
+
+        self._use(SlowModel())
+        gemini.breaker.opened_at = time.monotonic()
+        with self.settings(AI_BREAKER_RESET=0), mock.patch.object(gemini.random, 'uniform', return_value=10):
+            self.assertEqual(gemini.breaker.state, gemini.breaker.HALF_OPEN)
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(asyncio.wait_for(gemini.agenerate('key', 'model', 'prompt'), 0.05))
+            self.assertFalse(gemini.breaker.trial_running)
+            # The failed trial reopens the breaker, whose reset has passed: the next trial may go
+            self.assertTrue(gemini.breaker.allow())
+        self.assertEqual(gemini.metrics.snapshot()['failures'], 1)
+
+    @override_settings(AI_RETRY_ATTEMPTS=0)
+    def test_half_open_trial_closes_the_breaker(self):
+        model = self._use(FakeModel(TimeoutError('down'), TimeoutError('down'), 'back'))
+        for _ in range(2):
+            with self.assertRaises(TimeoutError):
+                ai.generate_content('prompt')
+
+        with self.settings(AI_BREAKER_RESET=0):
+            self.assertEqual(gemini.breaker.state, gemini.breaker.HALF_OPEN)
+            self.assertEqual(ai.generate_content('prompt'), 'back')
+        self.assertEqual(gemini.breaker.state, gemini.breaker.CLOSED)
+        self.assertEqual(model.calls, 3)
+
+
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        instrumentation.registry.reset()
+        self.recruiter = User.objects.create_user('Thiruverakan6', password='pw')
+        self.client.force_login(self.recruiter)
+
+    def _step_count(self, step):
+        histogram = instrumentation.registry.histograms.get(
+            ('recruitment_step_duration_seconds', (('step', step),))
+        )
+        return histogram.count if histogram else 0
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_sampled_request_is_logged_with_breakdown(self):
+        with self.assertLogs('recruitment.perf', 'INFO') as logs:
+            self.client.get(reverse('job_list'))
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((line['view'], line['status']), ('job_list', 200))
+        self.assertGreater(line['db_queries'], 0)
+        self.assertIn('template', line['timers_ms'])
+        self.assertEqual(instrumentation.registry.counters[
+            ('recruitment_http_requests_total', (('method', 'GET'), ('status', 200), ('view', 'job_list')))
+        ], 1)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_request_is_only_counted(self):
+        with self.assertNoLogs('recruitment.perf'):
+            self.client.get(reverse('job_list'))
+        self.assertIn(
+            ('recruitment_http_request_duration_seconds', (('view', 'job_list'),)),
+            instrumentation.registry.histograms,
+        )
+        self.assertNotIn(
+            ('recruitment_db_queries_total', (('view', 'job_list'),)), instrumentation.registry.counters,
+        )
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    async def test_async_requests_are_instrumented_without_a_thread(self):
+        async def view(request):
+            await Job.objects.acount()
+            return HttpResponse('ok')
+
+        middleware = instrumentation.InstrumentationMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        with self.assertLogs('recruitment.perf', 'INFO') as logs:
+            response = await middleware(AsyncRequestFactory().get('/'))
+
+        self.assertEqual(response.content, b'ok')
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((line['view'], line['db_queries']), ('unresolved', 1))
+
+    def test_hot_path_timers(self):
+        resumes.extract_pdf_text(io.BytesIO(make_pdf('Python developer')))
+        self.assertEqual(self._step_count('pdf_extraction'), 1)
+
+        @instrumentation.timed('step')
+        async def step():
+            return 'done'
+
+        self.assertEqual(asyncio.run(step()), 'done')
+        with instrumentation.timed('step'):
+            pass
+        self.assertEqual(self._step_count('step'), 2)
+
+    def test_metrics_endpoint(self):
+        self.client.get(reverse('job_list'))
+        body = self.client.get('/metrics').content.decode()
+        self.assertIn('# TYPE recruitment_http_requests_total counter', body)
+        self.assertIn('recruitment_http_requests_total{method="GET",status="200",view="job_list"} 1', body)
+        self.assertIn('recruitment_http_request_duration_seconds_bucket{view="job_list",le="+Inf"} 1', body)
+        self.assertIn('recruitment_gemini_breaker_open 0', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer secret'})
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(GEMINI_API_KEY='test-key', TASK_BACKEND='recruitment.tasks.DatabaseBackend')
+class ResponseCacheTests(TestCase):
+    def setUp(self):
+        ai.response_cache().clear()
+
+    def test_identical_prompts_hit_the_cache(self):
+        with mock.patch.object(ai, 'generate_content', return_value='answer') as generate:
+            self.assertEqual(ai.generate_content_cached('prompt'), 'answer')
+            self.assertEqual(ai.generate_content_cached('prompt'), 'answer')
+            ai.generate_content_cached('another prompt')
+        self.assertEqual(generate.call_count, 2)
+
+    def test_concurrent_identical_prompts_share_one_upstream_call(self):
+        def slow_generate(prompt):
+            time.sleep(0.2)
+            return 'answer'
+
+        results = []
+        with mock.patch.object(ai, 'generate_content', side_effect=slow_generate) as generate:
+            threads = [
+                threading.Thread(target=lambda: results.append(ai.generate_content_cached('same')))
+                for _ in range(5)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(results, ['answer'] * 5)
+        self.assertEqual(generate.call_count, 1)
+
+    def test_failed_calls_are_not_cached(self):
+        with mock.patch.object(ai, 'generate_content', side_effect=RuntimeError('down')):
+            with self.assertRaises(RuntimeError):
+                ai.generate_content_cached('prompt')
+        self.assertIsNone(ai.cached_response('prompt'))
+
+    @mock.patch.object(ai, 'INFLIGHT_POLL_INTERVAL', 0.01)
+    def test_lock_released_without_an_answer_is_taken_over(self):
+        lock_key = f"{ai.prompt_cache_key('prompt')}:lock"
+        ai.response_cache().set(lock_key, 'other process', 60)
+        threading.Timer(0.05, ai.response_cache().delete, [lock_key]).start()
+
+        def generate(prompt):
+            self.assertIsNotNone(ai.response_cache().get(lock_key))
+            return 'answer'
+
+        with mock.patch.object(ai, 'generate_content', side_effect=generate) as generate_content:
+            self.assertEqual(ai.generate_content_cached('prompt'), 'answer')
+        self.assertEqual(generate_content.call_count, 1)
+        self.assertIsNone(ai.response_cache().get(lock_key))
+
+    @mock.patch.object(ai, 'INFLIGHT_POLL_INTERVAL', 0.01)
+    @mock.patch.object(ai, 'INFLIGHT_LOCK_TIMEOUT', 0.05)
+    def test_giving_up_on_the_wait_leaves_the_other_lock_alone(self):
+        lock_key = f"{ai.prompt_cache_key('prompt')}:lock"
+        ai.response_cache().set(lock_key, 'other process', 60)
+
+        with mock.patch.object(ai, 'generate_content', return_value='answer'):
+            self.assertEqual(ai.generate_content_cached('prompt'), 'answer')
+        self.assertEqual(ai.response_cache().get(lock_key), 'other process')
+
+    def test_cached_description_is_returned_without_queueing(self):
+        user = User.objects.create_user('recruiter', password='pw')
+        self.client.force_login(user)
+        prompt = ai.job_description_prompt('Engineer', 'Go')
+        ai.response_cache().set(ai.prompt_cache_key(prompt), 'Build things ||REQUIREMENTS|| - Go')
+
+        response = self.client.post(reverse('generate_job_description'), {'title': 'Engineer', 'prompt': 'Go'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['requirements'], '- Go')
+        self.assertFalse(Task.objects.exists())
+
+
+@override_settings(GEMINI_API_KEY='test-key', AI_MAX_CONCURRENCY=1, AI_QUEUE_TIMEOUT=0.05,
+                   AI_REQUEST_TIMEOUT=0.5)
+class AsyncAIViewTests(MediaRootMixin, TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Python Developer', description='Backend role',
+            requirements='Python, Django and PostgreSQL.', location='Remote',
+        )
+        self.candidate = Candidate.objects.create(job=self.job, name='alice', email='alice@example.com')
+        matching.index_candidate(self.candidate, text=PYTHON_RESUME)
+        ai.response_cache().clear()
+        self.factory = AsyncRequestFactory()
+
+    def _request(self, path, data=None):
+        request = self.factory.post(path, data or {})
+        request.user = self.recruiter
+
+        async def auser():
+            return self.recruiter
+        request.auser = auser
+        return request
+
+    async def test_analyze_awaits_gemini(self):
+        async def reply(prompt):
+            return "SCORE: 70\nANALYSIS: Solid."
+
+        with mock.patch.object(ai, 'agenerate_content', side_effect=reply):
+            response = await async_views.analyze_candidate_cv(self._request('/'), self.candidate.id)
+
+        self.assertContains(response, 'Solid.')
+        await self.candidate.arefresh_from_db()
+        self.assertEqual(self.candidate.match_score, 70.0)
+
+    async def test_analyze_falls_back_to_local_scorer_on_timeout(self):
+        async def hang(prompt):
+            await asyncio.sleep(5)
+
+        with mock.patch.object(ai, 'agenerate_content', side_effect=hang):
+            response = await async_views.analyze_candidate_cv(self._request('/'), self.candidate.id)
+
+        self.assertContains(response, 'AI Semantic Analysis')
+
+    async def test_concurrency_limit_falls_back(self):
+        release = asyncio.Event()
+
+        async def slow(prompt):
+            await release.wait()
+            return "Desc ||REQUIREMENTS|| Reqs"
+
+        with mock.patch.object(ai, 'agenerate_content', side_effect=slow):
+            first = asyncio.ensure_future(async_views.generate_job_description(
+                self._request('/', {'title': 'Engineer', 'prompt': 'Go'})))
+            await asyncio.sleep(0.01)
+            # A different prompt needs its own slot, and the only one is taken.
+            second = await async_views.generate_job_description(
+                self._request('/', {'title': 'Designer', 'prompt': ''}))
+            release.set()
+            first = await first
+
+        self.assertIn('We are seeking a talented Designer', second.content.decode())
+        self.assertIn('Desc', first.content.decode())
+
+    async def test_identical_concurrent_prompts_share_one_request(self):
+        calls = []
+
+        async def reply(prompt):
+            calls.append(prompt)
+            await asyncio.sleep(0.05)
+            return "Desc ||REQUIREMENTS|| Reqs"
+
+        with mock.patch.object(ai, 'agenerate_content', side_effect=reply):
+            responses = await asyncio.gather(*[
+                async_views.generate_job_description(self._request('/', {'title': 'Engineer'}))
+                for _ in range(3)
+            ])
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+
+
+class ASGIMiddlewareChainTests(SimpleTestCase):
+    """Under ASGI no middleware may be sync-only, or every request is run on a thread."""
+
+    async def _get(self, handler, path):
+        messages = []
+        incoming = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+
+        async def receive():
+            if incoming:
+                return incoming.pop()
+            # The client stays connected until the handler is done
+            await asyncio.Event().wait()
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'method': 'GET', 'path': path,
+                 'query_string': b'', 'headers': []}
+        await handler(scope, receive, send)
+        body = b''.join(m.get('body', b'') for m in messages if m['type'] == 'http.response.body')
+        return messages[0]['status'], body
+
+    async def test_middleware_chain_is_async(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root, ignore_errors=True)
+        with open(f'{static_root}/app.css', 'w') as f:
+            f.write('body {}')
+
+        with override_settings(STATIC_ROOT=static_root, WHITENOISE_AUTOREFRESH=False):
+            handler = ASGIHandler()
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+        self.assertNotIsInstance(handler._middleware_chain, SyncToAsync)
+
+        self.assertEqual(await self._get(handler, '/static/app.css'), (200, b'body {}'))
+        status, body = await self._get(handler, reverse('metrics'))
+        self.assertEqual(status, 200)
+        self.assertIn(b'recruitment_gemini_breaker_open', body)
+
+
+class QueryBudgetTests(TestCase):
+    """Recruiter pages must issue a fixed number of queries however many rows they show."""
+
+    def setUp(self):
+        # The dashboard is only rendered for the recruiter account.
+        self.recruiter = User.objects.create_user('Thiruverakan6', password='pw')
+        self.interviewer = Interviewer.objects.create(name='Alice Johnson')
+        self.client.force_login(self.recruiter)
+
+    def _add_rows(self, count):
+        for _ in range(count):
+            n = Candidate.objects.count()
+            job = Job.objects.create(
+                recruiter=self.recruiter, title=f'Job {n}', description='d', requirements='r', location='Remote',
+            )
+            candidate = Candidate.objects.create(job=job, name=f'Candidate {n}', email=f'c{n}@example.com')
+            Interview.objects.create(
+                candidate=candidate, interviewer=self.interviewer,
+                date=timezone.now() + timezone.timedelta(days=n + 1),
+            )
+
+    def _queries(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx)
+
+    def assertQueryBudget(self, url_name, budget):
+        self._add_rows(1)
+        few = self._queries(reverse(url_name))
+        self._add_rows(10)
+        many = self._queries(reverse(url_name))
+        self.assertEqual(few, many, f"{url_name} query count grows with rows")
+        self.assertLessEqual(many, budget)
+
+    def test_candidate_list(self):
+        # session, user, total COUNT, page
+        self.assertQueryBudget('candidate_list', 4)
+
+    def test_interview_list(self):
+        self.assertQueryBudget('interview_list', 3)
+
+    def test_job_list(self):
+        self.assertQueryBudget('job_list', 3)
+
+    def test_dashboard(self):
+        # session, user, stats row
+        self.assertQueryBudget('dashboard', 3)
+
+
+class RecruiterStatsTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('Thiruverakan6', password='pw')
+        self.interviewer = Interviewer.objects.create(name='Alice Johnson')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Backend Engineer', description='d', requirements='r', location='Remote',
+        )
+        self.client.force_login(self.recruiter)
+
+    def _candidate(self, name, job=None, status='APPLIED'):
+        return Candidate.objects.create(job=job or self.job, name=name, email=f'{name}@example.com', status=status)
+
+    def _stats(self):
+        return RecruiterStats.objects.get(pk=self.recruiter.pk)
+
+    def assertMatchesRebuild(self):
+        kept = self._stats()
+        rebuilt = stats.rebuild(self.recruiter.pk)
+        self.assertEqual(
+            (kept.job_count, kept.status_counts, kept.next_interview_at, kept.upcoming_interview_count),
+            (rebuilt.job_count, rebuilt.status_counts, rebuilt.next_interview_at, rebuilt.upcoming_interview_count),
+        )
+
+    def test_counters_follow_the_recruiting_workflow(self):
+        alice = self._candidate('alice')
+        bob = self._candidate('bob')
+        self.assertEqual(self._stats().status_counts, {'APPLIED': 2})
+
+        when = timezone.now() + timezone.timedelta(days=2)
+        self.client.post(reverse('schedule_interview', args=[alice.id]), {
+            'interviewer_id': self.interviewer.id, 'date': when.isoformat(), 'notes': '',
+        })
+        self.client.post(reverse('update_candidate_status', args=[bob.id]), {'status': 'REJECTED'})
+
+        recruiter_stats = self._stats()
+        self.assertEqual(recruiter_stats.status_counts, {'INTERVIEW_SCHEDULED': 1, 'REJECTED': 1})
+        self.assertEqual(recruiter_stats.active_candidate_count, 1)
+        self.assertEqual(recruiter_stats.upcoming_interview_count, 1)
+        self.assertMatchesRebuild()
+
+        self.client.post(reverse('delete_candidate', args=[alice.id]))
+        recruiter_stats = self._stats()
+        self.assertEqual(recruiter_stats.status_counts, {'REJECTED': 1})
+        self.assertIsNone(recruiter_stats.next_interview_at)
+        self.assertMatchesRebuild()
+
+    def test_deleting_a_job_removes_its_candidates(self):
+        other = Job.objects.create(
+            recruiter=self.recruiter, title='Designer', description='d', requirements='r', location='Remote',
+        )
+        self._candidate('alice')
+        carol = self._candidate('carol', job=other)
+        Interview.objects.create(candidate=carol, interviewer=self.interviewer,
+                                 date=timezone.now() + timezone.timedelta(days=1))
+        self.assertEqual(self._stats().job_count, 2)
+
+        self.client.post(reverse('job_delete', args=[other.id]))
+
+        recruiter_stats = self._stats()
+        self.assertEqual(recruiter_stats.job_count, 1)
+        self.assertEqual(recruiter_stats.status_counts, {'APPLIED': 1})
+        self.assertEqual(recruiter_stats.upcoming_interview_count, 0)
+        self.assertMatchesRebuild()
+
+    def test_dashboard_refreshes_a_passed_interview(self):
+        alice = self._candidate('alice')
+        Interview.objects.create(candidate=alice, interviewer=self.interviewer,
+                                 date=timezone.now() + timezone.timedelta(days=1))
+        # Time passes: the stored next interview is now in the past
+        passed = timezone.now() - timezone.timedelta(hours=1)
+        Interview.objects.filter(candidate=alice).update(date=passed)
+        RecruiterStats.objects.filter(pk=self.recruiter.pk).update(next_interview_at=passed)
+
+        response = self.client.get(reverse('dashboard'))
+
+        self.assertEqual(response.context['upcoming_interview_count'], 0)
+        self.assertIsNone(response.context['next_interview_at'])
+
+    def test_rebuild_command_repairs_drift(self):
+        self._candidate('alice')
+        # Queryset updates bypass the signal handlers
+        Candidate.objects.update(status='HIRED')
+        call_command('rebuild_stats', stdout=io.StringIO())
+        self.assertEqual(self._stats().status_counts, {'HIRED': 1})
+
+
+class NotificationTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Backend Engineer', description='d', requirements='r', location='Remote',
+        )
+        self.client.force_login(self.recruiter)
+
+    def _candidate(self, n, user=None):
+        return Candidate.objects.create(job=self.job, user=user, name=f'c{n}', email=f'c{n}@example.com')
+
+    def test_status_change_queues_delivery_for_a_worker(self):
+        applicant = User.objects.create_user('applicant', email='c0@example.com')
+        candidate = self._candidate(0, user=applicant)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('update_candidate_status', args=[candidate.id]), {'status': 'SHORTLISTED'})
+
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(tasks.DatabaseBackend().work(burst=True), 1)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.recipient, applicant)
+        self.assertIn('shortlisted for the Backend Engineer', notification.message)
+
+    def test_email_only_candidates_notify_every_matching_account(self):
+        User.objects.create_user('first', email='c1@example.com')
+        User.objects.create_user('second', email='c1@example.com')
+        candidate = self._candidate(1)
+
+        tasks.run_task(notifications.notify_status_change([candidate], 'HIRED'))
+
+        self.assertEqual(Notification.objects.filter(message__startswith='Congratulations').count(), 2)
+
+    def test_mass_rejection_is_one_task_and_constant_queries(self):
+        for n in range(50):
+            # Half are linked to their account, half are only matched by email
+            user = User.objects.create_user(f'u{n}', email=f'c{n}@example.com')
+            self._candidate(n, user=user if n % 2 else None)
+        candidates = list(Candidate.objects.select_related('job'))
+
+        with self.assertNumQueries(1):
+            task_obj = notifications.notify_status_change(candidates, 'REJECTED')
+        # one user lookup by email, one INSERT
+        with self.assertNumQueries(2):
+            result = tasks.get_task_function(task_obj.name)(*task_obj.args)
+
+        self.assertEqual(result, {'delivered': 50})
+        self.assertEqual(Notification.objects.count(), 50)
+
+    def test_unannounced_status_sends_nothing(self):
+        self.assertIsNone(notifications.notify_status_change([self._candidate(0)], 'APPLIED'))
+
+
+class NotificationPushTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('applicant', password='pw', email='a@example.com')
+        self.client.force_login(self.user)
+
+    def _deliver(self, *messages):
+        notifications.deliver([[self.user.id, self.user.email, message] for message in messages])
+
+    def test_poll_hands_out_each_notification_once(self):
+        self._deliver('Shortlisted', 'Interview')
+
+        batch, cursor = notifications.poll(self.user.id, 0)
+
+        self.assertEqual([n['message'] for n in batch], ['Shortlisted', 'Interview'])
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+        # Nothing new: answered from the cached latest id
+        with self.assertNumQueries(0):
+            self.assertEqual(notifications.poll(self.user.id, cursor), ([], cursor))
+
+        self._deliver('Hired')
+        batch, _ = notifications.poll(self.user.id, cursor)
+        self.assertEqual([n['message'] for n in batch], ['Hired'])
+
+    def test_poll_view_answers_at_once(self):
+        self._deliver('Shortlisted')
+
+        data = self.client.get(reverse('notification_poll'), {'after': 'junk'}).json()
+
+        self.assertEqual(data['notifications'][0]['message'], 'Shortlisted')
+        self.assertEqual(data['cursor'], Notification.objects.get().id)
+
+        # Nothing new: an empty answer with the same cursor, without waiting
+        started = time.monotonic()
+        data = self.client.get(reverse('notification_poll'), {'after': data['cursor']}).json()
+        self.assertEqual(data['notifications'], [])
+        self.assertEqual(data['cursor'], Notification.objects.get().id)
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_stream_is_not_served_under_wsgi(self):
+        self.assertEqual(self.client.get(reverse('notification_stream')).status_code, 404)
+
+    def test_job_board_no_longer_queries_notifications(self):
+        self._deliver('Shortlisted')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('candidate_job_list'))
+        self.assertContains(response, reverse('notification_poll'))
+        self.assertFalse(any('recruitment_notification' in q['sql'] for q in ctx.captured_queries))
+
+    @override_settings(NOTIFICATION_POLL_INTERVAL=0.01, NOTIFICATION_STREAM_MAX_AGE=1)
+    async def test_stream_sends_new_notifications_as_events(self):
+        await sync_to_async(self._deliver)('Shortlisted')
+        request = AsyncRequestFactory().get('/', HTTP_LAST_EVENT_ID='0')
+        request.user = self.user
+
+        async def auser():
+            return self.user
+        request.auser = auser
+
+        response = await async_views.notification_stream(request)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        events = []
+        async for chunk in response.streaming_content:
+            events.append(chunk.decode())
+            if 'event: notifications' in events[-1]:
+                break
+
+        self.assertIn('Shortlisted', events[-1])
+        notification = await Notification.objects.aget()
+        self.assertIn(f'id: {notification.id}\n', events[-1])
+        self.assertTrue(notification.is_read)
+
+
+class BulkStatusTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.interviewer = Interviewer.objects.create(name='Alice Johnson')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Backend Engineer', description='d', requirements='r', location='Remote',
+        )
+        self.client.force_login(self.recruiter)
+
+    def _candidates(self, count, job=None):
+        start = Candidate.objects.count()
+        candidates = [
+            Candidate.objects.create(job=job or self.job, name=f'c{n}', email=f'c{n}@example.com')
+            for n in range(start, start + count)
+        ]
+        for candidate in candidates[::2]:
+            Interview.objects.create(candidate=candidate, interviewer=self.interviewer,
+                                     date=timezone.now() + timezone.timedelta(days=1))
+        return candidates
+
+    def test_bulk_reject_from_candidate_list(self):
+        selected = self._candidates(4)
+        kept = self._candidates(1)[0]
+        other_recruiter = User.objects.create_user('other')
+        foreign = self._candidates(1, job=Job.objects.create(
+            recruiter=other_recruiter, title='Designer', description='d', requirements='r', location='Remote',
+        ))[0]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('candidate_list'), {
+                'candidate_ids': [c.id for c in selected] + [foreign.id], 'status': 'REJECTED',
+            })
+
+        self.assertRedirects(response, reverse('candidate_list'))
+        self.assertEqual(Candidate.objects.filter(status='REJECTED').count(), 4)
+        self.assertEqual(Candidate.objects.get(pk=kept.pk).status, 'APPLIED')
+        self.assertEqual(Candidate.objects.get(pk=foreign.pk).status, 'APPLIED')
+        self.assertFalse(Interview.objects.filter(candidate__in=selected).exists())
+        self.assertEqual(Task.objects.filter(name='recruitment.notifications.deliver').count(), 1)
+
+        recruiter_stats = RecruiterStats.objects.get(pk=self.recruiter.pk)
+        self.assertEqual(recruiter_stats.status_counts, {'REJECTED': 4, 'APPLIED': 1})
+        self.assertEqual(recruiter_stats.upcoming_interview_count, 1)
+
+    def test_query_count_does_not_grow_with_selection(self):
+        def queries_for(count):
+            ids = [c.id for c in self._candidates(count)]
+            with CaptureQueriesContext(connection) as ctx:
+                transitions.change_status(Candidate.objects.filter(id__in=ids), 'SHORTLISTED')
+            return len(ctx)
+
+        self.assertEqual(queries_for(3), queries_for(40))
+
+    def test_unknown_status_is_rejected(self):
+        candidate = self._candidates(1)[0]
+        self.client.post(reverse('candidate_list'), {'candidate_ids': [candidate.id], 'status': 'BOGUS'})
+        self.assertEqual(Candidate.objects.get(pk=candidate.pk).status, 'APPLIED')
+
+
+class JobBoardCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.recruiter, title='Backend Engineer', description='d', requirements='r', location='Remote',
+        )
+
+    def test_anonymous_pages_are_cached_per_query(self):
+        url = reverse('candidate_job_list')
+        first = self.client.get(url, {'role': 'Backend Engineer'})
+        self.assertContains(first, 'Backend Engineer')
+        self.assertNotContains(first, 'csrfmiddlewaretoken')
+
+        with self.assertNumQueries(0):
+            second = self.client.get(url, {'role': 'Backend Engineer'})
+        self.assertEqual(second.content, first.content)
+
+        self.assertContains(self.client.get(url, {'role': 'Designer'}), 'No jobs match your search.')
+
+    def test_per_process_cache_bounds_staleness(self):
+        # LocMemCache: other workers never see the version bump, so entries must expire soon
+        self.assertFalse(board_cache.shared_cache())
+        self.assertEqual(board_cache.cache_timeout(), 30)
+
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location, ignore_errors=True)
+        with override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location,
+        }}):
+            self.assertTrue(board_cache.shared_cache())
+            self.assertEqual(board_cache.cache_timeout(), 600)
+
+    def test_job_changes_invalidate_the_board(self):
+        url = reverse('candidate_job_list')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Platform Engineer'
+            self.job.save()
+        self.assertContains(self.client.get(url), 'Platform Engineer')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.delete()
+        self.assertContains(self.client.get(url), 'No jobs available')
+
+    def test_signed_in_candidates_share_the_job_list_fragment(self):
+        url = reverse('candidate_job_list')
+        self.client.force_login(User.objects.create_user('first', password='pw'))
+        self.client.get(url)
+
+        self.client.force_login(User.objects.create_user('second', password='pw'))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertContains(response, 'Backend Engineer')
+        self.assertContains(response, 'Logout')
+        self.assertEqual(response.context['notification_poll_url'], reverse('notification_poll'))
+        self.assertFalse(any('recruitment_job' in query['sql'] for query in ctx.captured_queries))
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.client.force_login(User.objects.create_user('applicant', password='pw'))
+
+    def _job(self, title, description='d', requirements='r', location='Remote'):
+        return Job.objects.create(
+            recruiter=self.recruiter, title=title, description=description,
+            requirements=requirements, location=location,
+        )
+
+    def _search(self, **params):
+        return [job.title for job in self.client.get(reverse('candidate_job_list'), params).context['jobs']]
+
+    def test_title_matches_rank_above_body_matches(self):
+        self._job('Office Manager', description='Keep our Python developers happy.')
+        self._job('Python Developer')
+        self._job('Graphic Designer')
+
+        self.assertEqual(self._search(q='python'), ['Python Developer', 'Office Manager'])
+
+    def test_prefix_words_and_syntax_characters(self):
+        self._job('Kubernetes Engineer', requirements='Operate clusters in Berlin.')
+
+        self.assertEqual(self._search(q='kube berl'), ['Kubernetes Engineer'])
+        self.assertEqual(self._search(q='kube* -("berl'), ['Kubernetes Engineer'])
+        self.assertEqual(self._search(q='kube london'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        job = self._job('Data Analyst')
+        job.title = 'Data Scientist'
+        job.save()
+        self.assertEqual(self._search(q='scientist'), ['Data Scientist'])
+        self.assertEqual(self._search(q='analyst'), [])
+
+        job.delete()
+        self.assertEqual(self._search(q='scientist'), [])
+
+    def test_ranked_results_page_without_gaps(self):
+        for n in range(30):
+            self._job(f'Engineer {n}', description='engineer ' * (n % 4))
+
+        first = self.client.get(reverse('candidate_job_list'), {'q': 'engineer'})
+        second = self.client.get(first.context['next_page_url'], HTTP_HX_REQUEST='true')
+
+        titles = [job.title for job in first.context['jobs']] + [job.title for job in second.context['jobs']]
+        self.assertEqual(sorted(titles), sorted(f'Engineer {n}' for n in range(30)))
+
+    def test_facets_are_cached_until_a_job_changes(self):
+        self._job('Python Developer', location='Berlin')
+        self._job('Python Developer', location='Remote')
+
+        self.assertEqual(search.job_facets()['titles'], [('Python Developer', 2)])
+        with self.assertNumQueries(0):
+            search.job_facets()
+
+        self._job('Designer', location='Berlin')
+        self.assertEqual(search.job_facets()['locations'], [('Berlin', 2), ('Remote', 1)])
+
+    def test_facets_expire_soon_with_a_per_process_cache(self):
+        with mock.patch.object(search.cache, 'set') as cache_set:
+            search.job_facets()
+        self.assertEqual(cache_set.call_args.args[2], 30)
+
+
+class ResumeSearchTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        self.job = self._job(self.recruiter)
+        self.client.force_login(self.recruiter)
+
+    def _job(self, recruiter):
+        return Job.objects.create(recruiter=recruiter, title='Engineer', description='d', requirements='r', location='Remote')
+
+    def _candidate(self, name, text, job=None):
+        entry = resumes.store_resume_text(hashlib.sha256(text.encode()).hexdigest(), text)
+        return Candidate.objects.create(job=job or self.job, name=name, email=f'{name}@example.com', resume_text=entry)
+
+    def _names(self, query):
+        ids = search.ranked_candidate_ids(self.recruiter, query)
+        names = dict(Candidate.objects.values_list('id', 'name'))
+        return [names[i] for i in ids]
+
+    def test_boolean_and_phrase_queries(self):
+        self._candidate('ml', 'Machine learning engineer with Python and PyTorch.')
+        self._candidate('web', 'Python web developer. Learning machine shop skills on weekends.')
+        self._candidate('ops', 'Kubernetes and Terraform operator.')
+
+        self.assertEqual(sorted(self._names('python')), ['ml', 'web'])
+        self.assertEqual(sorted(self._names('"machine learning"')), ['ml'])
+        self.assertEqual(sorted(self._names('python -pytorch')), ['web'])
+        self.assertEqual(sorted(self._names('NOT python')), ['ops'])
+        self.assertEqual(sorted(self._names('pytorch OR terraform')), ['ml', 'ops'])
+        self.assertEqual(sorted(self._names('kube* "python')), [])
+        self.assertEqual(self._names('"'), ['ops', 'web', 'ml'])
+
+    def test_more_relevant_resumes_rank_first(self):
+        self._candidate('once', 'Java developer who once wrote some Go. ' + 'Spring Hibernate Maven. ' * 5)
+        self._candidate('mostly', 'Go developer. Go services, Go tooling, Go everywhere.')
+
+        self.assertEqual(self._names('go'), ['mostly', 'once'])
+
+    def test_results_are_scoped_to_the_recruiter(self):
+        mine = self._candidate('mine', 'Rust systems programmer.')
+        self._candidate('theirs', 'Rust systems programmer.', job=self._job(User.objects.create_user('other')))
+
+        self.assertEqual(search.ranked_candidate_ids(self.recruiter, 'rust'), [mine.id])
+        response = self.client.get(reverse('candidate_list'), {'q': 'rust'})
+        self.assertEqual([c.name for c in response.context['candidates']], ['mine'])
+
+    def test_index_follows_relinks_and_deletes(self):
+        candidate = self._candidate('dev', 'Elixir developer.')
+        candidate.resume_text = resumes.store_resume_text('b' * 64, 'Haskell developer.')
+        candidate.save(update_fields=['resume_text'])
+        self.assertEqual(self._names('haskell'), ['dev'])
+        self.assertEqual(self._names('elixir'), [])
+
+        candidate.delete()
+        self.assertEqual(self._names('haskell'), [])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.recruiter = User.objects.create_user('recruiter', password='pw')
+        now = timezone.now()
+        for i in range(30):
+            job = Job.objects.create(
+                recruiter=self.recruiter, title=f'Job {i:02d}', description='d', requirements='r', location='Remote',
+            )
+            # Pairs of jobs share a timestamp so the id tie-breaker matters.
+            Job.objects.filter(pk=job.pk).update(created_at=now - timezone.timedelta(hours=i // 2))
+        self.client.force_login(self.recruiter)
+
+    def _titles(self, response):
+        return [job.title for job in response.context['jobs']]
+
+    def test_cursor_round_trip(self):
+        stamp = timezone.now()
+        value, pk = decode_cursor(encode_cursor(stamp, 42))
+        self.assertEqual(pk, 42)
+        self.assertIsNone(decode_cursor('not a cursor!'))
+
+    def test_cursor_with_a_bad_value_starts_from_the_top(self):
+        for value in ('abc', None, [1]):
+            cursor = base64.urlsafe_b64encode(json.dumps([value, 1]).encode()).decode()
+            response = self.client.get(reverse('job_list'), {'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.context['jobs']), 25)
+
+        cursor = base64.urlsafe_b64encode(json.dumps(['abc', 1]).encode()).decode()
+        response = self.client.get(reverse('candidate_job_list'), {'q': 'job', 'cursor': cursor})
+        self.assertEqual(response.status_code, 200)
+
+    def test_pages_cover_every_row_once(self):
+        first = self.client.get(reverse('candidate_job_list'))
+        self.assertEqual(len(first.context['jobs']), 25)
+        next_url = first.context['next_page_url']
+        self.assertIsNotNone(next_url)
+
+        second = self.client.get(next_url, HTTP_HX_REQUEST='true')
+        self.assertTemplateUsed(second, 'recruitment/partials/candidate_job_list_rows.html')
+        self.assertTemplateNotUsed(second, 'recruitment/candidate_dashboard.html')
+        self.assertIsNone(second.context['next_page_url'])
+
+        titles = self._titles(first) + self._titles(second)
+        self.assertEqual(sorted(titles), sorted(f'Job {i:02d}' for i in range(30)))
+        self.assertEqual(titles[:2], ['Job 01', 'Job 00'])
+
+    def test_oldest_sort_and_filters_are_kept_across_pages(self):
+        first = self.client.get(reverse('candidate_job_list'), {'sort': 'oldest'})
+        self.assertIn('sort=oldest', first.context['next_page_url'])
+        second = self.client.get(first.context['next_page_url'], HTTP_HX_REQUEST='true')
+        titles = self._titles(first) + self._titles(second)
+        self.assertEqual(titles[0], 'Job 28')
+        self.assertEqual(titles[-1], 'Job 01')
+        self.assertEqual(len(set(titles)), 30)
+
+    def test_recruiter_job_list_is_paginated(self):
+        response = self.client.get(reverse('job_list'))
+        self.assertEqual(len(response.context['jobs']), 25)
+        self.assertContains(response, 'hx-trigger="intersect once"')
+
+
+@skipUnless(connection.vendor == 'sqlite', "Query plans are checked against SQLite")
+class IndexUsageTests(TestCase):
+    """The hot list/filter queries should be served by an index, not a table scan."""
+
+    def setUp(self):
+        self.user = User.objects.create_user('recruiter', password='pw')
+        self.job = Job.objects.create(
+            recruiter=self.user, title='Backend Engineer', description='d', requirements='r', location='Remote',
+        )
+
+    def assertUsesIndex(self, queryset, table, index=None):
+        plan = queryset.explain()
+        searches = [line for line in plan.splitlines() if f'SEARCH {table} ' in line]
+        self.assertTrue(searches, f"{table} is scanned:\n{plan}")
+        if index:
+            self.assertTrue(any(index in line for line in searches), plan)
+
+    def test_job_board_filters_and_ordering(self):
+        self.assertUsesIndex(
+            Job.objects.filter(title='Backend Engineer').order_by('-created_at'),
+            'recruitment_job', 'job_title_created_idx',
+        )
+        self.assertUsesIndex(Job.objects.filter(recruiter=self.user), 'recruitment_job')
+
+    def test_duplicate_application_lookup(self):
+        self.assertUsesIndex(
+            Candidate.objects.filter(job=self.job, email='a@example.com'), 'recruitment_candidate',
+        )
+
+    def test_dashboard_counts_by_status(self):
+        self.assertUsesIndex(
+            Candidate.objects.filter(job__recruiter=self.user, status='APPLIED'), 'recruitment_candidate',
+        )
+
+    def test_upcoming_interviews(self):
+        self.assertUsesIndex(
+            Interview.objects.filter(date__gte=timezone.now()).order_by('date'),
+            'recruitment_interview', 'interview_date_idx',
+        )
+
+    def test_job_shortlist(self):
+        plan = (
+            Candidate.objects.filter(job=self.job, experience_years__gte=3)
+            .order_by('-match_score', 'id')[:20].explain()
+        )
+        self.assertIn('candidate_job_score_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_notification_inbox(self):
+        plan = Notification.objects.filter(recipient=self.user, is_read=False).order_by('-created_at').explain()
+        self.assertIn('notification_inbox_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class JourneyBenchmarkTests(MediaRootMixin, TestCase):
+    def test_synthetic_data_is_reproducible_and_indexed(self):
+        dataset = synthetic.populate(recruiters=2, jobs=6, candidates=30, applicants=3, seed=4)
+        self.assertEqual(Job.objects.count(), 6)
+        self.assertEqual(Candidate.objects.count(), 30)
+        self.assertEqual(len(dataset.recruiter_jobs), 3)
+        candidate = Candidate.objects.get(pk=dataset.candidates[0])
+        self.assertTrue(resumes.read_resume_text(candidate))
+        self.assertTrue(candidate.resume_vector)
+        self.assertEqual(JobTermIndex.objects.count(), 6)
+        recruiter_stats = RecruiterStats.objects.get(recruiter=dataset.recruiter)
+        self.assertEqual(recruiter_stats.job_count, 3)
+        self.assertEqual(sum(recruiter_stats.status_counts.values()), len(dataset.candidates))
+
+        names = list(Candidate.objects.order_by('email').values_list('email', 'name', 'status'))
+        Candidate.objects.all().delete()
+        Job.objects.all().delete()
+        User.objects.exclude(pk=dataset.recruiter.pk).delete()
+        synthetic.populate(recruiters=2, jobs=6, candidates=30, applicants=3, seed=4, pdfs=False)
+        self.assertEqual(list(Candidate.objects.order_by('email').values_list('email', 'name', 'status')), names)
+
+    def test_every_journey_runs_without_errors(self):
+        dataset = synthetic.populate(recruiters=1, jobs=4, candidates=12, applicants=2)
+        with self.settings(GEMINI_API_KEY='', INSTRUMENTATION_SAMPLE_RATE=0):
+            samples, elapsed = journeys.run(dataset, clients=1, requests=2)
+        report = journeys.summarize(samples, elapsed)
+
+        self.assertEqual(set(report), set(journeys.journey_names()))
+        for name, row in report.items():
+            self.assertEqual((row['requests'], row['errors']), (2, 0), name)
+            self.assertGreater(row['p99_ms'], 0)
+        self.assertGreater(report['candidate_list']['queries_mean'], 0)
+        self.assertEqual(Candidate.objects.filter(user__isnull=False).count(), 2)
+
+
+class SeedCommandTests(TestCase):
+    def _seed(self, *args):
+        out = io.StringIO()
+        call_command(
+            'seed', '--recruiters', '2', '--applicants', '5', '--jobs', '8', '--candidates', '120',
+            '--notifications', '40', '--resume-pool', '12', '--batch-size', '50', *args, stdout=out,
+        )
+        return out.getvalue()
+
+    def test_seeds_backdated_rows_in_batches(self):
+        output = self._seed('--days', '90')
+        self.assertIn('120 Candidate', output)
+        self.assertEqual(Job.objects.count(), 8)
+        self.assertEqual(Candidate.objects.count(), 120)
+        self.assertEqual(Notification.objects.count(), 40)
+        self.assertEqual(
+            Interview.objects.count(), Candidate.objects.filter(status='INTERVIEW_SCHEDULED').count(),
+        )
+        self.assertEqual(ResumeText.objects.count(), 12)
+
+        oldest = Candidate.objects.order_by('created_at').first().created_at
+        self.assertLess(oldest, timezone.now() - timezone.timedelta(days=60))
+        # Ids follow creation time, as for real traffic
+        ids = list(Notification.objects.order_by('created_at').values_list('id', flat=True))
+        self.assertEqual(ids, sorted(ids))
+
+        self.assertEqual(
+            sum(JobTermIndex.objects.values_list('document_count', flat=True)), Candidate.objects.count(),
+        )
+        recruiter = User.objects.get(username=synthetic.RECRUITER_USERNAME)
+        self.assertEqual(
+            sum(stats.for_recruiter(recruiter).status_counts.values()),
+            Candidate.objects.filter(job__recruiter=recruiter).count(),
+        )
+
+    def test_same_seed_gives_same_data(self):
+        self._seed('--seed', '3')
+        first = list(Candidate.objects.order_by('email').values_list('email', 'name', 'job__title', 'status'))
+        with self.assertRaises(CommandError):
+            self._seed('--seed', '3')
+
+        Job.objects.all().delete()
+        User.objects.all().delete()
+        self._seed('--seed', '3')
+        self.assertEqual(
+            list(Candidate.objects.order_by('email').values_list('email', 'name', 'job__title', 'status')), first,
+        )
+
+
+class DatabaseLoadTests(TransactionTestCase):
+    def test_sqlite_is_tuned_for_concurrent_writers(self):
+        options = connection.settings_dict['OPTIONS']
+        self.assertEqual(options['transaction_mode'], 'IMMEDIATE')
+        self.assertIn('synchronous=NORMAL', options['init_command'])
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_load_test_command(self):
+        out = io.StringIO()
+        call_command('loadtest_db', '--clients', '2', '--applications', '3', stdout=out)
+        self.assertIn('apps/s', out.getvalue())
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+
+class DuplicateApplicationMigrationTests(TransactionTestCase):
+    """Migration 0010 adds the unique (job, email) constraint; duplicates must be merged first, not dropped."""
+
+    before = [('recruitment', '0009_task')]
+
+    def setUp(self):
+        apps = self._migrate(self.before)
+        self.addCleanup(self._migrate_to_latest)
+        Job, Candidate = apps.get_model('recruitment', 'Job'), apps.get_model('recruitment', 'Candidate')
+        Interviewer, Interview = apps.get_model('recruitment', 'Interviewer'), apps.get_model('recruitment', 'Interview')
+        recruiter = apps.get_model('auth', 'User').objects.create(username='recruiter')
+        self.job = Job.objects.create(recruiter_id=recruiter.pk, title='Python Developer', description='d',
+                                      requirements='Python', location='Remote')
+        self.first = Candidate.objects.create(job=self.job, name='Dev', email='dev@example.com',
+                                              resume_vector={'python': 1.0})
+        second = Candidate.objects.create(job=self.job, name='Dev', email='dev@example.com', status='SHORTLISTED',
+                                          resume_vector={'django': 1.0})
+        interviewer = Interviewer.objects.create(name='Ann')
+        Interview.objects.create(candidate=second, interviewer=interviewer, date=timezone.now())
+        apps.get_model('recruitment', 'JobTermIndex').objects.create(
+            job=self.job, document_frequencies={'python': 1, 'django': 1}, document_count=2,
+        )
+
+    def _migrate(self, targets=None):
+        executor = MigrationExecutor(connection)
+        targets = targets or executor.loader.graph.leaf_nodes()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def _migrate_to_latest(self):
+        # Also after a failed test, so the rest of the suite runs on the latest schema
+        call_command('merge_duplicate_applications', stdout=io.StringIO())
+        self._migrate()
+
+    def test_migration_stops_at_duplicates_until_they_are_merged(self):
+        with self.assertRaisesMessage(RuntimeError, f'job {self.job.pk}, dev@example.com: 2 applications'):
+            self._migrate([('recruitment', '0010_indexes')])
+
+        out = io.StringIO()
+        call_command('merge_duplicate_applications', stdout=out)
+        self.assertIn('Merged 1 duplicate application(s) into 1', out.getvalue())
+
+        self._migrate_to_latest()
+        candidate = Candidate.objects.get()
+        self.assertEqual((candidate.pk, candidate.status), (self.first.pk, 'SHORTLISTED'))
+        self.assertEqual(Interview.objects.get().candidate, candidate)
+        index = JobTermIndex.objects.get()
+        self.assertEqual((index.document_frequencies, index.document_count), ({'python': 1}, 1))
@@ -0,0 +1,57 @@
+"""
+Candidate status transitions in bulk.
+
+Recruiters triage hundreds of applicants at a time, so ``change_status``
+moves a whole selection with a constant number of queries: one SELECT for
+the rows that actually change, one ``UPDATE ... WHERE id IN``, one batched
+DELETE of the interviews a rejection cancels, one ``Task`` insert for the
+notifications (see recruitment.notifications) and one counter adjustment per
+recruiter (see recruitment.stats). Everything commits together.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+
+from . import notifications, stats
+from .models import Candidate, Interview
+
+# Statuses whose transition cancels a scheduled interview
+CANCELS_INTERVIEW = {'REJECTED'}
+
+
+def change_status(candidates, status, owner=None):
+    """
+    Move every candidate in the ``candidates`` queryset to ``status``.
+
+    Candidates already in ``status`` are left alone. Returns the number of
+    candidates changed.
+    """
+    if status not in dict(Candidate.STATUS_CHOICES):
+        raise ValueError(f"Unknown candidate status {status!r}")
+
+    with transaction.atomic():
+        changed = list(
+            candidates.exclude(status=status)
+            .select_related('job')
+            .only('id', 'status', 'email', 'user_id', 'job__title', 'job__recruiter_id')
+            .select_for_update(of=('self',))
+        )
+        if not changed:
+            return 0
+        ids = [candidate.id for candidate in changed]
+
+        with stats.suspended():
+            Candidate.objects.filter(id__in=ids).update(status=status)
+            cancelled = 0
+            if status in CANCELS_INTERVIEW:
+                cancelled, _ = Interview.objects.filter(candidate_id__in=ids).delete()
+
+        deltas = defaultdict(Counter)
+        for candidate in changed:
+            deltas[candidate.job.recruiter_id][candidate.status] -= 1
+            deltas[candidate.job.recruiter_id][status] += 1
+        for recruiter_id, status_deltas in deltas.items():
+            stats.adjust(recruiter_id, status_deltas=status_deltas, interviews=bool(cancelled))
+
+        notifications.notify_status_change(changed, status, owner=owner)
+    return len(changed)
@@ -0,0 +1,77 @@
+"""
+Streaming handler for resume uploads.
+
+Django's default handlers keep uploads under 2.5 MB in memory, so a burst of
+applications with multi-MB PDFs inflates every worker. ``ResumeUploadHandler``
+streams the ``resume`` field chunk by chunk into a temporary file, which
+``FileSystemStorage`` then moves into ``MEDIA_ROOT`` rather than copying it.
+While streaming it:
+
+* rejects anything that doesn't start with the PDF signature, on the first chunk;
+* stops reading once the file passes ``RESUME_MAX_UPLOAD_SIZE``;
+* computes the SHA-256 used as the resume text cache key (see recruitment.resumes).
+
+A rejected file is skipped and the reason left on ``request.resume_upload_error``.
+The handler must be installed before anything reads ``request.POST``, so
+views using it are ``csrf_exempt`` and apply ``csrf_protect`` themselves.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.files.uploadedfile import TemporaryUploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, SkipFile
+
+PDF_SIGNATURE = b'%PDF-'
+
+DEFAULT_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+
+
+def max_upload_size():
+    return getattr(settings, 'RESUME_MAX_UPLOAD_SIZE', DEFAULT_MAX_UPLOAD_SIZE)
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """Stream, validate and hash the ``resume`` file field; other fields pass through."""
+    field_name = 'resume'
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.active = False
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.active = field_name == self.field_name
+        if not self.active:
+            return
+        self.file = TemporaryUploadedFile(self.file_name, self.content_type, 0, self.charset, self.content_type_extra)
+        self.digest = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        if not self.active:
+            return raw_data
+        if start == 0 and not raw_data.startswith(PDF_SIGNATURE):
+            self._reject("Please upload your resume as a PDF file.")
+        self.received += len(raw_data)
+        if self.received > max_upload_size():
+            self._reject(f"Resumes must be {max_upload_size() // (1024 * 1024)} MB or smaller.")
+        self.digest.update(raw_data)
+        self.file.write(raw_data)
+        # Handled here; later handlers never see the resume bytes
+        return None
+
+    def file_complete(self, file_size):
+        if not self.active:
+            return None
+        self.active = False
+        self.file.seek(0)
+        self.file.size = file_size
+        self.file.sha256 = self.digest.hexdigest()
+        return self.file
+
+    def _reject(self, reason):
+        # The parser closes (and so deletes) self.file when the file is skipped
+        self.active = False
+        if self.request is not None:
+            self.request.resume_upload_error = reason
+        raise SkipFile(reason)
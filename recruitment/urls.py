@@ -1,5 +1,9 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
+
+# Under ASGI the AI endpoints can await Gemini natively instead of using the task queue
+ai_views = async_views if settings.AI_ASYNC_VIEWS else views
 
 urlpatterns = [
     path('', views.dashboard_view, name='dashboard'),
@@ -8,13 +12,15 @@ urlpatterns = [
     path('recruiter/jobs/', views.JobListView.as_view(), name='job_list'),
     path('recruiter/jobs/create/', views.JobCreateView.as_view(), name='job_create'),
     path('recruiter/jobs/<int:pk>/', views.JobDetailView.as_view(), name='job_detail'),
+    path('recruiter/jobs/<int:pk>/shortlist/', views.job_shortlist, name='job_shortlist'),
     path('recruiter/jobs/<int:pk>/update/', views.JobUpdateView.as_view(), name='job_update'),
     path('recruiter/jobs/<int:pk>/delete/', views.JobDeleteView.as_view(), name='job_delete'),
     
     # Recruiter Candidates
     path('candidates/', views.CandidateListView.as_view(), name='candidate_list'),
     path('candidates/<int:pk>/', views.CandidateDetailView.as_view(), name='candidate_detail'),
-    path('candidates/<int:candidate_id>/analyze/', views.analyze_candidate_cv, name='analyze_candidate'),
+    path('candidates/<int:candidate_id>/analyze/', ai_views.analyze_candidate_cv, name='analyze_candidate'),
+    path('candidates/<int:candidate_id>/analyze/<int:task_id>/', views.analysis_status, name='analysis_status'),
     path('candidates/<int:candidate_id>/status/', views.update_candidate_status, name='update_candidate_status'),
     path('candidates/<int:candidate_id>/interview/', views.schedule_interview, name='schedule_interview'),
     path('interviews/', views.InterviewListView.as_view(), name='interview_list'),
@@ -26,5 +32,8 @@ urlpatterns = [
     path('jobs/', views.CandidateJobListView.as_view(), name='candidate_job_list'),
     path('jobs/<int:job_id>/apply/', views.apply_to_job, name='apply_job'),
 
-    path('api/generate-description/', views.generate_job_description, name='generate_job_description'),
+    path('api/generate-description/', ai_views.generate_job_description, name='generate_job_description'),
+    path('api/tasks/<int:task_id>/', views.task_status, name='task_status'),
+    path('notifications/poll/', views.notification_poll, name='notification_poll'),
+    path('notifications/stream/', async_views.notification_stream, name='notification_stream'),
 ]
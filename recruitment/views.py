@@ -1,65 +1,55 @@
-import google.generativeai as genai
+import functools
+import logging
 from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.http import JsonResponse
-from django.utils import timezone
-from .models import Job, Candidate, Interview, Interviewer, Notification
-
-# Configure Gemini (Mock or Real)
-# Assuming User provides API key or we instruct them. 
-# For this code, I'll attempt to use an env var or a placeholder prompt if missing.
-# Note: For the purpose of this task, I will expect the user to set GEMINI_API_KEY in settings or env.
-# If not present, I'll return a mock response or error.
-
-def configure_gemini():
-    api_key = getattr(settings, 'GEMINI_API_KEY', os.environ.get('GEMINI_API_KEY'))
-    if api_key:
-        genai.configure(api_key=api_key)
-        return True
-    return False
+from django.db import IntegrityError, transaction
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
+from .models import Job, Candidate, Interview, Interviewer, Task
+from .pagination import KeysetPaginationMixin
+from .uploads import ResumeUploadHandler
+from . import ai, board_cache, matching, notifications, search, similarity, stats, tasks, transitions
+
+logger = logging.getLogger(__name__)
 
 @login_required
 def dashboard_view(request):
-    print(f"DEBUG: Dashboard accessed by {request.user.username} (Is Auth: {request.user.is_authenticated})")
-    print(f"DEBUG: Dashboard accessed by {request.user.username}")
+    logger.debug("Dashboard accessed by %s", request.user.username)
     
     # Basic logic: If username starts with 'user' or is NOT 'Thiruverakan6', treat as candidate
     # Ideally we'd use Groups, but for this quick fix:
     if request.user.username != 'Thiruverakan6':
-        print(f"DEBUG: Redirecting {request.user.username} to candidate_job_list")
+        logger.debug("Redirecting %s to candidate_job_list", request.user.username)
         return redirect('candidate_job_list')
         
     # Recruiter Dashboard Logic
-    job_count = Job.objects.filter(recruiter=request.user).count()
-    candidate_count = Candidate.objects.filter(job__recruiter=request.user).exclude(status='REJECTED').count()
-    
-    # Get upcoming interviews
-    upcoming_interviews = Interview.objects.filter(
-        candidate__job__recruiter=request.user,
-        date__gte=timezone.now()
-    ).order_by('date')[:5]
+    # Counters are kept up to date by recruitment.stats, one primary-key lookup here
+    recruiter_stats = stats.for_recruiter(request.user)
 
     context = {
-        'jobs_count': job_count,
-        'candidate_count': candidate_count,
-        'upcoming_interviews': upcoming_interviews
+        'jobs_count': recruiter_stats.job_count,
+        'candidate_count': recruiter_stats.active_candidate_count,
+        'upcoming_interview_count': recruiter_stats.upcoming_interview_count,
+        'next_interview_at': recruiter_stats.next_interview_at,
     }
     return render(request, 'recruitment/dashboard.html', context)
 
 @method_decorator(login_required, name='dispatch')
-class JobListView(ListView):
+class JobListView(KeysetPaginationMixin, ListView):
     model = Job
     template_name = 'recruitment/job_list.html'
+    partial_template_name = 'recruitment/partials/job_list_rows.html'
     context_object_name = 'jobs'
 
     def get_queryset(self):
-        return Job.objects.filter(recruiter=self.request.user).order_by('-created_at')
+        return Job.objects.filter(recruiter=self.request.user)
 
 @method_decorator(login_required, name='dispatch')
 class JobDetailView(DetailView):
@@ -70,6 +60,42 @@ class JobDetailView(DetailView):
     def get_queryset(self):
         return Job.objects.filter(recruiter=self.request.user)
 
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['work_preferences'] = Candidate._meta.get_field('work_preference').choices
+        context['shortlist_size'] = matching.SHORTLIST_SIZE
+        context['shortlist_sizes'] = (10, matching.SHORTLIST_SIZE, 50, matching.SHORTLIST_MAX)
+        return context
+
+    def post(self, request, *args, **kwargs):
+        # "Score all applicants" action; the whole applicant pool is scored by a task worker
+        self.object = self.get_object()
+        tasks.enqueue(matching.score_applicants, self.object.pk, owner=request.user)
+        messages.success(request, f"Scoring all candidates for {self.object.title}; refresh in a moment to see the scores.")
+        return redirect('job_detail', pk=self.object.pk)
+
+@login_required
+def job_shortlist(request, pk):
+    # Top-k applicants by match score, loaded into the job detail page
+    job = get_object_or_404(Job, pk=pk, recruiter=request.user)
+    params = request.GET
+
+    def number(name, default=None):
+        try:
+            return max(int(params.get(name, '')), 0)
+        except ValueError:
+            return default
+
+    limit = min(number('limit') or matching.SHORTLIST_SIZE, matching.SHORTLIST_MAX)
+    candidates = matching.shortlist(
+        job,
+        limit=limit,
+        min_experience=number('min_experience'),
+        work_preference=params.get('work_preference', '').strip(),
+        location=params.get('location', '').strip(),
+    )
+    return render(request, 'recruitment/partials/job_shortlist.html', {'job': job, 'candidates': candidates})
+
 @method_decorator(login_required, name='dispatch')
 class JobCreateView(CreateView):
     model = Job
@@ -79,7 +105,11 @@ class JobCreateView(CreateView):
 
     def form_valid(self, form):
         form.instance.recruiter = self.request.user
-        return super().form_valid(form)
+        # Commit the job together with the recruiter's dashboard counters
+        with transaction.atomic():
+            response = super().form_valid(form)
+        matching.update_requirements(self.object)
+        return response
 
 @method_decorator(login_required, name='dispatch')
 class JobUpdateView(UpdateView):
@@ -91,6 +121,12 @@ class JobUpdateView(UpdateView):
     def get_queryset(self):
         return Job.objects.filter(recruiter=self.request.user)
 
+    def form_valid(self, form):
+        response = super().form_valid(form)
+        if 'requirements' in form.changed_data:
+            matching.update_requirements(self.object)
+        return response
+
 @method_decorator(login_required, name='dispatch')
 class JobDeleteView(DeleteView):
     model = Job
@@ -105,101 +141,121 @@ def generate_job_description(request):
     if request.method == 'POST':
         title = request.POST.get('title')
         user_prompt = request.POST.get('prompt', '').strip()
-        
-        if not title:
-            # Title is still nice to have context, but if prompt is strong we could be flexible.
-            # But the UI sends title, so we keep this check or relax it.
-            # Let's keep it for context.
-            pass
             
         try:
-             import os
-             api_key = os.environ.get('GEMINI_API_KEY')
-             if api_key:
-                 genai.configure(api_key=api_key)
-                 model = genai.GenerativeModel('gemini-pro')
-                 
-                 context_prompt = f"Role Title: {title}\n"
-                 if user_prompt:
-                     context_prompt += f"Context/Details: {user_prompt}\n"
-                 
-                 final_prompt = f"{context_prompt}\nWrite a professional job description (just the body) and then a separate section for Requirements for this role. Use the provided context details to tailor the content. Separator: ||REQUIREMENTS||"
-                 
-                 response = model.generate_content(final_prompt)
-                 text = response.text
-                 parts = text.split("||REQUIREMENTS||")
-                 desc = parts[0].strip()
-                 reqs = parts[1].strip() if len(parts) > 1 else "Requirements not generated automatically."
-                 return JsonResponse({'description': desc, 'requirements': reqs})
-             else:
-                 # Realistic Mock Data
-                 mock_desc = f"We are seeking a talented {title} to join our dynamic team."
-                 if user_prompt:
-                     mock_desc += f" As per your requirements: {user_prompt}."
-                 mock_desc += " The ideal candidate will be responsible for designing, developing, and deploying high-quality solutions. You will work closely with cross-functional teams to define, design, and ship new features. This is an exciting opportunity to work on cutting-edge technologies and grow your career in a fast-paced environment."
-                 
-                 mock_reqs = "- Bachelor's degree in Computer Science or related field.\n- 3+ years of experience in a similar role.\n- Strong proficiency in modern technologies and best practices.\n- Excellent problem-solving and communication skills.\n- Ability to work independently and as part of a team."
-                 if user_prompt:
-                    mock_reqs = f"- {user_prompt} (Key Requirement)\n" + mock_reqs
-                 
+             if ai.gemini_enabled():
+                 # Standard titles are regenerated constantly; serve repeats from the response cache
+                 cached = ai.cached_response(ai.job_description_prompt(title, user_prompt))
+                 if cached is not None:
+                     return JsonResponse(ai.parse_job_description(cached))
+
+                 # The Gemini call is slow; hand it to the task queue and let the form poll for it
+                 task = tasks.enqueue(ai.generate_job_description, title, user_prompt, owner=request.user)
                  return JsonResponse({
-                     'description': mock_desc,
-                     'requirements': mock_reqs
-                 })
+                     'task_id': task.id,
+                     'status_url': reverse('task_status', args=[task.id]),
+                 }, status=202)
+             else:
+                 return JsonResponse(ai.mock_job_description(title, user_prompt))
         except Exception as e:
             return JsonResponse({'error': str(e)}, status=500)
     return JsonResponse({'error': 'Invalid method'}, status=405)
 
+@login_required
+def task_status(request, task_id):
+    task = get_object_or_404(Task, id=task_id, owner=request.user)
+    data = {'status': task.status, 'result': task.result}
+    if task.status == Task.FAILED:
+        data['error'] = task.error.splitlines()[0] if task.error else 'Task failed'
+    return JsonResponse(data)
+
 # ... (existing imports)
 
-class CandidateJobListView(ListView):
+class CandidateJobListView(KeysetPaginationMixin, ListView):
     model = Job
     template_name = 'recruitment/candidate_dashboard.html'
+    partial_template_name = 'recruitment/partials/candidate_job_list_rows.html'
+    board_template_name = 'recruitment/partials/candidate_job_board.html'
     context_object_name = 'jobs'
     
+    def get_keyset_field(self):
+        # Keyword searches are ranked by relevance unless a date sort is picked
+        if self.search_text and self.request.GET.get('sort') not in ('newest', 'oldest'):
+            return 'search_rank'
+        return 'created_at'
+
+    def get_keyset_descending(self):
+        # Sorting: latest (or most relevant) first by default
+        return self.request.GET.get('sort') != 'oldest'
+
+    @property
+    def search_text(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get(self, request, *args, **kwargs):
+        # Anonymous visitors all see the same page, served whole from the cache (see board_cache)
+        if not request.user.is_authenticated:
+            return board_cache.cached_page(request, functools.partial(super().get, request, *args, **kwargs))
+        return super().get(request, *args, **kwargs)
+
     def get_context_data(self, **kwargs):
+        if self.cursor or not self.request.user.is_authenticated:
+            # Infinite-scroll pages only need the next rows; anonymous pages are cached whole
+            context = self.get_board_context(**kwargs)
+        else:
+            # The job list is the same for every candidate, only the notifications are theirs
+            context = {'view': self, 'board': board_cache.cached_fragment(self.request, self.render_board)}
+
+        # New notifications are pushed to the page, see notification_stream/notification_poll
+        if not self.cursor and self.request.user.is_authenticated:
+            context['notification_poll_url'] = reverse('notification_poll')
+            context['notification_poll_interval'] = settings.NOTIFICATION_POLL_INTERVAL
+            if settings.NOTIFICATION_SSE:
+                context['notification_stream_url'] = reverse('notification_stream')
+
+        return context
+
+    def get_board_context(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        # Get unique job titles for filter dropdown
-        context['job_roles'] = Job.objects.values_list('title', flat=True).distinct()
-        
-        # Get Notifications for logged in user (if they are a candidate/user)
-        if self.request.user.is_authenticated:
-            # Fetch UNREAD notifications
-            unread_notifs = Notification.objects.filter(recipient=self.request.user, is_read=False).order_by('-created_at')
-            
-            if unread_notifs.exists():
-                # Challenge: User gets multiple conflicting popups (e.g. "Interview" then "Rejected").
-                # Solution: Only show the LATEST notification as a popup.
-                latest_notif = unread_notifs.first()
-                messages.info(self.request, latest_notif.message)
-                
-                # Mark ALL as read so they don't pile up or appear next time
-                unread_notifs.update(is_read=True)
-            
-            context['notifications'] = Notification.objects.filter(recipient=self.request.user).order_by('-created_at')[:5]
-            
+        if context['is_first_page']:
+            # Title/location filter options, cached until a job changes
+            facets = search.job_facets()
+            context['job_roles'] = facets['titles']
+            context['job_locations'] = facets['locations']
         return context
 
+    def render_board(self):
+        return render_to_string(self.board_template_name, self.get_board_context(), self.request)
+
     def get_queryset(self):
         queryset = Job.objects.all()
         
-        # Filtering by Job Role
+        # Filtering by Job Role and location
         role = self.request.GET.get('role')
         if role:
             queryset = queryset.filter(title=role)
+        location = self.request.GET.get('location')
+        if location:
+            queryset = queryset.filter(location=location)
+
+        # Keyword search over title, description, requirements and location
+        if self.search_text:
+            queryset = search.search_jobs(queryset, self.search_text)
             
-        # Sorting
-        sort_by = self.request.GET.get('sort')
-        if sort_by == 'oldest':
-            queryset = queryset.order_by('created_at')
-        else:
-            # Default to latest
-            queryset = queryset.order_by('-created_at')
-            
+        # Sorting is applied by the keyset pagination, see get_keyset_field
         return queryset
 
+@csrf_exempt
 @login_required
 def apply_to_job(request, job_id):
+    # The resume is streamed to disk, size-checked and hashed as it arrives (see
+    # recruitment.uploads); the handler must be in place before CSRF reads the POST.
+    request.upload_handlers = [ResumeUploadHandler(request)]
+    return _apply_to_job(request, job_id)
+
+
+@csrf_protect
+def _apply_to_job(request, job_id):
     job = get_object_or_404(Job, id=job_id)
     if request.method == 'POST':
         resume = request.FILES.get('resume')
@@ -211,39 +267,85 @@ def apply_to_job(request, job_id):
         
         # Ensure resume is uploaded
         if not resume:
-             messages.error(request, "Please upload your resume.")
+             messages.error(request, getattr(request, 'resume_upload_error', "Please upload your resume."))
              return render(request, 'recruitment/apply_job.html', {'job': job})
 
-        # Check if already applied
-        if Candidate.objects.filter(job=job, email=email).exists():
-             messages.warning(request, "You have already applied for this job.")
-             return redirect('candidate_job_list')
-        else:
-            Candidate.objects.create(
-                job=job,
-                user=request.user,  # Link to the logged-in user
-                name=name,
-                email=email,
-                resume_file=resume,
-                experience_years=experience_years,
-                current_location=current_location,
-                work_preference=work_preference,
-                status='APPLIED'
-            )
-            messages.success(request, "Application sent successfully!")
+        candidate = Candidate(
+            job=job,
+            user=request.user,  # Link to the logged-in user
+            name=name,
+            email=email,
+            resume_file=resume,
+            experience_years=experience_years,
+            current_location=current_location,
+            work_preference=work_preference,
+            status='APPLIED'
+        )
+        # The (job, email) unique constraint rejects duplicate applications atomically
+        try:
+            with transaction.atomic():
+                candidate.save()
+                # Text extraction and indexing run in the background
+                tasks.enqueue(matching.index_application, candidate.id, resume.sha256)
+        except IntegrityError:
+            candidate.resume_file.delete(save=False)
+            messages.warning(request, "You have already applied for this job.")
+            return redirect('candidate_job_list')
+
+        messages.success(request, "Application sent successfully!")
         return redirect('candidate_job_list')
 
     return render(request, 'recruitment/apply_job.html', {'job': job})
 
 @method_decorator(login_required, name='dispatch')
-class CandidateListView(ListView):
+class CandidateListView(KeysetPaginationMixin, ListView):
     model = Candidate
     template_name = 'recruitment/candidate_list.html'
+    partial_template_name = 'recruitment/partials/candidate_list_rows.html'
     context_object_name = 'candidates'
 
+    def get_keyset_field(self):
+        # Resume searches list the best matches first
+        return 'search_rank' if self.search_text else 'created_at'
+
+    @property
+    def search_text(self):
+        return self.request.GET.get('q', '').strip()
+
     def get_queryset(self):
         # Only show candidates for jobs owned by the logged-in recruiter
-        return Candidate.objects.filter(job__recruiter=self.request.user).order_by('-created_at')
+        queryset = (
+            Candidate.objects.filter(job__recruiter=self.request.user)
+            .select_related('job')
+            .defer('resume_vector', 'ai_analysis')
+        )
+        if self.search_text:
+            queryset = search.search_candidates(queryset, self.search_text)
+        return queryset
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        if context['is_first_page']:
+            context['total_candidates'] = self.object_list.count()
+            context['status_choices'] = Candidate.STATUS_CHOICES
+        return context
+
+    def post(self, request, *args, **kwargs):
+        # Bulk status change for the selected candidates
+        ids = request.POST.getlist('candidate_ids')
+        new_status = request.POST.get('status', '').strip()
+        if not ids:
+            messages.warning(request, "Select at least one candidate.")
+            return redirect('candidate_list')
+        try:
+            changed = transitions.change_status(
+                Candidate.objects.filter(job__recruiter=request.user, id__in=ids), new_status, owner=request.user,
+            )
+        except ValueError as e:
+            messages.error(request, str(e))
+            return redirect('candidate_list')
+        messages.success(request, f"Updated {changed} candidate(s) to {new_status}")
+        return redirect('candidate_list')
 
 from .models import Interviewer
 import random
@@ -257,139 +359,24 @@ class CandidateDetailView(DetailView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['interviewers'] = Interviewer.objects.all()
+        context['suggested_jobs'] = similarity.suggest_jobs(self.object)
         return context
 
 @login_required
 def analyze_candidate_cv(request, candidate_id):
-    print(f"DEBUG: Analyzing candidate {candidate_id}")
+    logger.debug("Analyzing candidate %s", candidate_id)
     candidate = get_object_or_404(Candidate, id=candidate_id)
-    
-    # Text Extraction
-    resume_text = "Resume content not available"
-    try:
-        import pypdf
-        if candidate.resume_file and hasattr(candidate.resume_file, 'path'):
-            try:
-                reader = pypdf.PdfReader(candidate.resume_file.open())
-                text_parts = []
-                for page in reader.pages:
-                    text_parts.append(page.extract_text())
-                resume_text = "\n".join(text_parts)
-            except Exception as e:
-                 print(f"PDF Read Error: {e}")
-                 resume_text = "Error reading PDF file."
-    except ImportError:
-        print("pypdf not installed")
-        resume_text = "PDF processing library missing."
-
-    # Requirements
-    requirements = candidate.job.requirements or "General Job Requirements"
-    
-    analysis = "Analysis Pending"
-    score = 0.0
 
     try:
-        # Import os strictly inside here to avoid top-level issues if I can't reach there, 
-        # but ideally it should be at top. I will add it here to be safe.
-        import os 
-        import re
-        import math
-        from collections import Counter
-
-        # AI Scan Logic (Mocking if no API key or real call)
-        api_key = getattr(settings, 'GEMINI_API_KEY', os.environ.get('GEMINI_API_KEY'))
-        
-        # NOTE: For this "Good Free AI" request, we stick to VSM algorithm 
-        # because it IS the industry standard for free keyword matching.
-        # We will refine the output text to look more "AI-like".
-        
-        if api_key:
-            try:
-                genai.configure(api_key=api_key)
-                model = genai.GenerativeModel('gemini-pro')
-                prompt = f"""
-                You are a helpful ATS scanner.
-                Job Requirements: {requirements}
-                Candidate Resume: {resume_text}
-                
-                Task:
-                1. Calculate a match percentage (0-100) based on how well the candidate fits the requirements.
-                2. Write a brief analysis/reasoning.
-                
-                Output format:
-                SCORE: <number>
-                ANALYSIS: <text>
-                """
-                response = model.generate_content(prompt)
-                text = response.text
-                
-                score_match = re.search(r'SCORE:\s*(\d+)', text)
-                score = float(score_match.group(1)) if score_match else 0.0
-                analysis = text.replace(score_match.group(0), '').replace('ANALYSIS:', '').strip() if score_match else text
-                
-            except Exception as e:
-                # If API fails, fallback to VSM quietly
-                print(f"Gemini API Error: {e}")
-                api_key = None # Trigger fallback
-
-        if not api_key:
-            # Fallback Local VSM - High Quality "Free AI"
-            def text_to_vector(text):
-                words = re.compile(r'\w+').findall(text.lower())
-                return Counter(words)
-
-            def get_cosine(vec1, vec2):
-                intersection = set(vec1.keys()) & set(vec2.keys())
-                numerator = sum([vec1[x] * vec2[x] for x in intersection])
-                sum1 = sum([vec1[x]**2 for x in vec1.keys()])
-                sum2 = sum([vec2[x]**2 for x in vec2.keys()])
-                denominator = math.sqrt(sum1) * math.sqrt(sum2)
-                return float(numerator) / denominator if denominator else 0.0
-
-            req_vector = text_to_vector(requirements)
-            resume_vector = text_to_vector(resume_text)
-            
-            # If resume is empty or too short, score is 0
-            if len(resume_vector) < 5:
-                score = 0.0
-                analysis = "Resume text could not be extracted or is too short."
-            else:
-                similarity = get_cosine(req_vector, resume_vector)
-                
-                # Boost score logic: 
-                # A cosine sim of 0.3 is decent for resume vs job.
-                # We map 0.0-0.5 to roughly 0-100% with a curve.
-                score = min((similarity * 100) * 2.5, 95.0) 
-                score = round(score, 1)
-
-                # Keywords analysis
-                stopwords = {'and', 'the', 'to', 'of', 'in', 'for', 'with', 'a', 'an', 'is', 'it', 'on', 'as', 'be', 'are'}
-                req_words = set(req_vector.keys()) - stopwords
-                resume_words = set(resume_vector.keys())
-                
-                # Find important words (must appear more than once in requirements/desc if possible, or just all non-stopwords)
-                # Simple intersection
-                matched = list(req_words & resume_words)
-                missing = list(req_words - resume_words)
-                
-                # Sort by potential importance (length of word is a cheap proxy for importance if IDF not available)
-                matched.sort(key=lambda x: len(x), reverse=True)
-                missing.sort(key=lambda x: len(x), reverse=True)
-
-                analysis = f"**AI Semantic Analysis**\n\n"
-                if score > 75:
-                     analysis += "✅ **Excellent Fit**: The candidate's profile strongly aligns with the job requirements.\n"
-                elif score > 50:
-                     analysis += "⚠️ **Potential Match**: Good alignment found, though some specific skills may be implicit or missing.\n"
-                else:
-                     analysis += "❌ **Low Compatibility**: The resume content diverges significantly from the target role.\n"
-                
-                if matched:
-                    analysis += f"\n**Matched Keywords**: {', '.join(matched[:8])}"
-                
-                if missing:
-                    analysis += f"\n**Missing/Unmatched Terms**: {', '.join(missing[:8])}"
-
+        if ai.gemini_enabled():
+            cached = ai.cached_response(ai.candidate_analysis_prompt(candidate))
+            if cached is None:
+                # Gemini can take seconds: queue it and return a polling placeholder right away
+                task = tasks.enqueue(ai.analyze_candidate, candidate.id, owner=request.user)
+                return render(request, 'recruitment/partials/ai_analysis_result.html', {'candidate': candidate, 'task': task})
+            score, analysis = ai.parse_analysis(cached)
+        else:
+            score, analysis = ai.local_analysis(candidate)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -399,37 +386,48 @@ def analyze_candidate_cv(request, candidate_id):
     # Save to model
     candidate.match_score = score
     candidate.ai_analysis = analysis
-    candidate.save()
+    candidate.save(update_fields=['match_score', 'ai_analysis'])
     
     # Return partial HTML for HTMX update
     return render(request, 'recruitment/partials/ai_analysis_result.html', {'candidate': candidate})
 
+@login_required
+def analysis_status(request, candidate_id, task_id):
+    # Polled by the placeholder partial until the queued analysis finishes
+    candidate = get_object_or_404(Candidate, id=candidate_id)
+    task = get_object_or_404(Task, id=task_id, owner=request.user)
+    return render(request, 'recruitment/partials/ai_analysis_result.html', {'candidate': candidate, 'task': task})
+
 @method_decorator(login_required, name='dispatch')
-class InterviewListView(ListView):
+class InterviewListView(KeysetPaginationMixin, ListView):
     model = Interview
     template_name = 'recruitment/interview_list.html'
+    partial_template_name = 'recruitment/partials/interview_list_rows.html'
     context_object_name = 'interviews'
+    keyset_field = 'date'
+    keyset_descending = False
 
     def get_queryset(self):
         # Show interviews for candidates applied to jobs owned by this recruiter
-        return Interview.objects.filter(candidate__job__recruiter=self.request.user).order_by('date')
+        return (
+            Interview.objects.filter(candidate__job__recruiter=self.request.user)
+            .select_related('candidate__job', 'interviewer')
+            .defer('candidate__resume_vector', 'candidate__ai_analysis')
+        )
 
 
-def create_notification(email, message):
-    try:
-        # Check if a User exists with this email
-        users = User.objects.filter(email=email)
-        if users.exists():
-            for user in users:
-                # Create notification for all users with this email (handles duplicates or test cases)
-                Notification.objects.create(recipient=user, message=message)
-                print(f"DEBUG: Notification allocated to user {user.username}")
-        else:
-             print(f"DEBUG: No user found for notification email {email}")
-    except Exception as e:
-        print(f"DEBUG: Failed to create notification: {e}")
-
 @login_required
+def notification_poll(request):
+    """
+    New notifications after the ``after`` cursor, answered at once.
+
+    The page asks again every ``NOTIFICATION_POLL_INTERVAL`` seconds; with
+    nothing new this is a single cache read, so no worker is held waiting.
+    """
+    batch, cursor = notifications.poll(request.user.id, notifications.parse_cursor(request.GET.get('after')))
+    return JsonResponse({'notifications': batch, 'cursor': cursor})
+
+
 @login_required
 def schedule_interview(request, candidate_id):
     if request.method == 'POST':
@@ -439,38 +437,34 @@ def schedule_interview(request, candidate_id):
             date = request.POST.get('date')
             notes = request.POST.get('notes')
             
-            print(f"DEBUG: Scheduling interview for {candidate.name} with IntID: {interviewer_id} on {date}")
+            logger.debug("Scheduling interview for candidate %s with interviewer %s on %s", candidate.pk, interviewer_id, date)
             
             interviewer = get_object_or_404(Interviewer, id=interviewer_id)
             
-            # Use update_or_create to handle the OneToOneField constraint
-            Interview.objects.update_or_create(
-                candidate=candidate,
-                defaults={
-                    'interviewer': interviewer,
-                    'date': date,
-                    'notes': notes
-                }
-            )
-            
-            candidate.status = 'INTERVIEW_SCHEDULED'
-            candidate.save()
-            
-            # Create Notification
-            try:
-                msg = f"Great news! An interview has been scheduled for {candidate.job.title} on {date}. Check details."
-                if candidate.user:
-                    Notification.objects.create(recipient=candidate.user, message=msg)
-                else:
-                    create_notification(candidate.email, msg)
-            except Exception as e:
-                print(f"DEBUG: Notification error in schedule: {e}")
+            # Interview, status and dashboard counters change together
+            with transaction.atomic():
+                # Use update_or_create to handle the OneToOneField constraint
+                Interview.objects.update_or_create(
+                    candidate=candidate,
+                    defaults={
+                        'interviewer': interviewer,
+                        'date': date,
+                        'notes': notes
+                    }
+                )
+
+                candidate.status = 'INTERVIEW_SCHEDULED'
+                candidate.save()
+
+                # Delivered by a background task once this commits
+                notifications.send(
+                    [(candidate, notifications.interview_message(candidate.job.title, date))], owner=request.user,
+                )
 
             messages.success(request, f"Interview scheduled with {interviewer.name}")
-            print("DEBUG: Redirecting to interview_list")
             return redirect('interview_list')
         except Exception as e:
-            print(f"DEBUG: Error in schedule_interview: {e}")
+            logger.exception("Error scheduling interview for candidate %s", candidate_id)
             messages.error(request, f"Error scheduling interview: {e}")
             return redirect('candidate_detail', pk=candidate_id)
             
@@ -482,52 +476,24 @@ def update_candidate_status(request, candidate_id):
         try:
             candidate = get_object_or_404(Candidate, id=candidate_id)
             new_status = request.POST.get('status', '').strip()
-            print(f"DEBUG: Processing status update for {candidate.name} to {new_status}")
-            
-            candidate.status = new_status
-            candidate.save()
+            logger.debug("Updating candidate %s status to %s", candidate.pk, new_status)
             
-            # Create Notification logic wrapped to prevent crash
-            try:
-                # Determine recipient
-                recipient = candidate.user if candidate.user else None
-                
-                if new_status == 'REJECTED':
-                     if hasattr(candidate, 'interview'):
-                         candidate.interview.delete()
-                     
-                     msg = f"Update on your application for {candidate.job.title}: Unfortunately, we have decided not to proceed at this time."
-                     if recipient:
-                         Notification.objects.create(recipient=recipient, message=msg)
-                     else:
-                         create_notification(candidate.email, msg)
-                         
-                elif new_status == 'HIRED':
-                     msg = f"Congratulations! You have been selected for the {candidate.job.title} position!"
-                     if recipient:
-                         Notification.objects.create(recipient=recipient, message=msg)
-                     else:
-                         create_notification(candidate.email, msg)
-
-                elif new_status == 'SHORTLISTED':
-                     msg = f"You have been shortlisted for the {candidate.job.title} position."
-                     if recipient:
-                         Notification.objects.create(recipient=recipient, message=msg)
-                     else:
-                         create_notification(candidate.email, msg)
-                         
-            except Exception as e:
-                print(f"DEBUG: Notification error: {e}")
+            with transaction.atomic():
+                candidate.status = new_status
+                candidate.save()
+                if new_status == 'REJECTED' and hasattr(candidate, 'interview'):
+                    candidate.interview.delete()
+                # Delivered by a background task once this commits
+                notifications.notify_status_change([candidate], new_status, owner=request.user)
 
             messages.success(request, f"Candidate status updated to {new_status}")
             
             # Explicit redirection logic
             if new_status == 'REJECTED':
-                print("DEBUG: Redirecting to candidate_list")
                 return redirect('candidate_list')
                 
         except Exception as e:
-            print(f"DEBUG: Error in update_candidate_status: {e}")
+            logger.exception("Error updating status of candidate %s", candidate_id)
             messages.error(request, "An error occurred while updating status.")
             
     return redirect('candidate_detail', pk=candidate_id)
@@ -541,7 +507,9 @@ def delete_candidate(request, candidate_id):
         return redirect('candidate_list')
         
     if request.method == 'POST':
-        candidate.delete()
+        matching.remove_candidate(candidate)
+        with transaction.atomic():
+            candidate.delete()
         messages.success(request, "Candidate deleted successfully.")
         
     return redirect('candidate_list')
@@ -574,10 +542,11 @@ def delete_interview(request, interview_id):
         # Update candidate status back to shortlisted or applied? 
         # Or just leave it? Let's optionally set it back to SHORTLISTED.
         candidate = interview.candidate
-        candidate.status = 'SHORTLISTED'
-        candidate.save()
-        
-        interview.delete()
+        with transaction.atomic():
+            candidate.status = 'SHORTLISTED'
+            candidate.save()
+
+            interview.delete()
         messages.success(request, "Interview cancelled successfully.")
         
     return redirect('interview_list')